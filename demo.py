@@ -8,21 +8,45 @@ concurrency control, deadlock detection, and distributed transactions.
 import sys
 import os
 import threading
-import time
 import random
+import time
+from functools import partial
+from typing import Any, Callable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from loguru import logger
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Import config first to set up logging
-import config
+# Set up logging before anything else logs
+from config import setup_once, performance_monitor
+setup_once()
 
 from business.services import BusinessFacade, BusinessException
 from database.inmemory_db import DatabaseManager
 from transaction.manager import TransactionException
 
+# Upper bound on how long a demonstration waits for its concurrent transactions
+_DEMO_TIMEOUT_SECONDS = 10.0
+
+# Fixed monetary amounts used by the demonstrations, parsed once at import
+_AMT_25 = Decimal("25.00")
+_AMT_50 = Decimal("50.00")
+_AMT_75 = Decimal("75.00")
+_AMT_100 = Decimal("100.00")
+_AMT_200 = Decimal("200.00")
+_AMT_500 = Decimal("500.00")
+_AMT_1000 = Decimal("1000.00")
+_AMT_5000 = Decimal("5000.00")
+_AMT_999999 = Decimal("999999.00")
+
+# Sample product prices
+_PRICE_IPHONE = Decimal("1199.99")
+_PRICE_MACBOOK = Decimal("2399.99")
+_PRICE_PYTHON_BOOK = Decimal("39.99")
+_PRICE_GALAXY = Decimal("899.99")
+
 class DistributedTransactionDemo:
     """Demo class showcasing the distributed transaction system"""
     
@@ -33,142 +57,145 @@ class DistributedTransactionDemo:
         self.demo_accounts = []
         self.demo_products = []
         self.demo_categories = []
+        self._pool = ThreadPoolExecutor(max_workers=8)
+        self._out = []
+        self._sample_data_ready = False
         self._initialize_system()
     
     def _initialize_system(self):
         """Initialize the system"""
-        print("Initializing Distributed Transaction System...")
-        logger.info("Starting system initialization")
+        self._say("Initializing Distributed Transaction System...")
         
         # Initialize databases
         self.db_manager.initialize_system_databases()
         
         # Initialize business layer
-        self.business_facade = BusinessFacade(self.db_manager)
+        self.business_facade = BusinessFacade(self.db_manager, performance_monitor)
+        
+        self._say("System initialized successfully!", 'success')
+        self._out.append("")
         
-        print("System initialized successfully!")
-        logger.success("System initialization completed")
-        print()
+        self._flush()
     
     def create_sample_data(self):
         """Create comprehensive sample data"""
-        print("Creating sample data...")
-        logger.info("Starting sample data creation")
+        if self._sample_data_ready:
+            return
+        
+        self._say("Creating sample data...")
         
         try:
             # Create categories
             def create_categories(thread_id):
-                categories = []
-                categories.append(self.business_facade.category_service.create_category(
-                    "Electronics", "Electronic products and gadgets", None, thread_id
-                ))
-                categories.append(self.business_facade.category_service.create_category(
-                    "Books", "Books and educational materials", None, thread_id
-                ))
-                categories.append(self.business_facade.category_service.create_category(
-                    "Smartphones", "Mobile phones and accessories", categories[0], thread_id
-                ))
-                categories.append(self.business_facade.category_service.create_category(
-                    "Laptops", "Computers and laptops", categories[0], thread_id
-                ))
-                return categories
-            
-            self.demo_categories = self.business_facade.execute_with_transaction(create_categories)
-            print(f"Created {len(self.demo_categories)} categories")
-            logger.info(f"Created {len(self.demo_categories)} categories successfully")
+                category_service = self.business_facade.category_service
+                electronics, books = category_service.create_categories_bulk([
+                    {'name': "Electronics", 'description': "Electronic products and gadgets", 'parent_id': None},
+                    {'name': "Books", 'description': "Books and educational materials", 'parent_id': None}
+                ], thread_id)
+                subcategories = category_service.create_categories_bulk([
+                    {'name': "Smartphones", 'description': "Mobile phones and accessories", 'parent_id': electronics},
+                    {'name': "Laptops", 'description': "Computers and laptops", 'parent_id': electronics}
+                ], thread_id)
+                return [electronics, books] + subcategories
             
             # Create users and accounts
             def create_users_and_accounts(thread_id):
-                users = []
-                accounts = []
+                users = self.business_facade.user_service.create_users_bulk([
+                    {
+                        'username': f"user{i+1}",
+                        'email': f"user{i+1}@example.com",
+                        'password_hash': f"hashed_password_{i+1}"
+                    }
+                    for i in range(3)
+                ], thread_id)
                 
-                for i in range(3):
-                    user_id = self.business_facade.user_service.create_user(
-                        f"user{i+1}", f"user{i+1}@example.com", f"hashed_password_{i+1}", thread_id
+                # Create a checking and a savings account for each user
+                accounts = self.business_facade.account_service.create_accounts_bulk([
+                    account
+                    for user_id in users
+                    for account in (
+                        {'user_id': user_id, 'account_type': "checking", 'initial_balance': _AMT_1000},
+                        {'user_id': user_id, 'account_type': "savings", 'initial_balance': _AMT_5000}
                     )
-                    users.append(user_id)
-                    
-                    # Create accounts for each user
-                    checking_account = self.business_facade.account_service.create_account(
-                        user_id, "checking", Decimal("1000.00"), thread_id
-                    )
-                    savings_account = self.business_facade.account_service.create_account(
-                        user_id, "savings", Decimal("5000.00"), thread_id
-                    )
-                    accounts.extend([checking_account, savings_account])
+                ], thread_id)
                 
                 return users, accounts
             
-            self.demo_users, self.demo_accounts = self.business_facade.execute_with_transaction(create_users_and_accounts)
-            print(f"Created {len(self.demo_users)} users and {len(self.demo_accounts)} accounts")
-            logger.info(f"Created {len(self.demo_users)} users and {len(self.demo_accounts)} accounts successfully")
+            # Categories and users/accounts live in different databases, so they
+            # can be created concurrently; products must wait for the categories
+            categories_future = self._pool.submit(self.business_facade.execute_with_transaction, create_categories)
+            users_future = self._pool.submit(self.business_facade.execute_with_transaction, create_users_and_accounts)
+            
+            self.demo_categories = categories_future.result()
+            self._say(f"Created {len(self.demo_categories)} categories")
+            
+            self.demo_users, self.demo_accounts = users_future.result()
+            self._say(f"Created {len(self.demo_users)} users and {len(self.demo_accounts)} accounts")
             
             # Create products
             def create_products(thread_id):
-                products = []
-                
-                products.append(self.business_facade.product_service.create_product(
-                    "iPhone 15 Pro", "Latest Apple smartphone with advanced features", 
-                    Decimal("1199.99"), 25, self.demo_categories[2], thread_id
-                ))
-                
-                products.append(self.business_facade.product_service.create_product(
-                    "MacBook Pro M3", "High-performance laptop for professionals", 
-                    Decimal("2399.99"), 15, self.demo_categories[3], thread_id
-                ))
-                
-                products.append(self.business_facade.product_service.create_product(
-                    "Python Crash Course", "A hands-on introduction to programming", 
-                    Decimal("39.99"), 100, self.demo_categories[1], thread_id
-                ))
-                
-                products.append(self.business_facade.product_service.create_product(
-                    "Samsung Galaxy S24", "Android smartphone with excellent camera", 
-                    Decimal("899.99"), 30, self.demo_categories[2], thread_id
-                ))
+                books = self.demo_categories[1]
+                smartphones = self.demo_categories[2]
+                laptops = self.demo_categories[3]
                 
-                return products
+                return self.business_facade.product_service.create_products_bulk([
+                    {
+                        'name': "iPhone 15 Pro", 'description': "Latest Apple smartphone with advanced features",
+                        'price': _PRICE_IPHONE, 'stock_quantity': 25, 'category_id': smartphones
+                    },
+                    {
+                        'name': "MacBook Pro M3", 'description': "High-performance laptop for professionals",
+                        'price': _PRICE_MACBOOK, 'stock_quantity': 15, 'category_id': laptops
+                    },
+                    {
+                        'name': "Python Crash Course", 'description': "A hands-on introduction to programming",
+                        'price': _PRICE_PYTHON_BOOK, 'stock_quantity': 100, 'category_id': books
+                    },
+                    {
+                        'name': "Samsung Galaxy S24", 'description': "Android smartphone with excellent camera",
+                        'price': _PRICE_GALAXY, 'stock_quantity': 30, 'category_id': smartphones
+                    }
+                ], thread_id)
             
             self.demo_products = self.business_facade.execute_with_transaction(create_products)
-            print(f"Created {len(self.demo_products)} products")
-            logger.info(f"Created {len(self.demo_products)} products successfully")
-            print()
+            self._say(f"Created {len(self.demo_products)} products")
+            self._out.append("")
+            
+            self._sample_data_ready = True
             
         except Exception as e:
-            print(f"Error creating sample data: {str(e)}")
-            logger.error(f"Failed to create sample data: {str(e)}")
+            self._say(f"Error creating sample data: {str(e)}", 'error')
+        
+        self._flush()
     
     def demonstrate_basic_operations(self):
         """Demonstrate basic CRUD operations"""
-        print("Demonstrating basic operations...")
-        logger.info("Starting basic operations demonstration")
+        self._say("Demonstrating basic operations...")
         
         try:
             # Money transfer
-            print("Testing money transfer...")
+            self._out.append("Testing money transfer...")
             def transfer_operation(thread_id):
                 return self.business_facade.transaction_service.transfer_money(
-                    self.demo_accounts[0], self.demo_accounts[2], Decimal("100.00"), 
+                    self.demo_accounts[0], self.demo_accounts[2], _AMT_100, 
                     "Transfer demo", thread_id
                 )
             
             tx_id = self.business_facade.execute_with_transaction(transfer_operation)
-            print(f"Money transfer completed. Transaction ID: {tx_id}")
-            logger.info(f"Money transfer demonstration successful - TX:{tx_id}")
+            self._say(f"Money transfer completed. Transaction ID: {tx_id}")
             
             # Deposit money
-            print("Testing deposit...")
+            self._out.append("Testing deposit...")
             def deposit_operation(thread_id):
                 return self.business_facade.transaction_service.deposit_money(
-                    self.demo_accounts[1], Decimal("500.00"), "Deposit demo", thread_id
+                    self.demo_accounts[1], _AMT_500, "Deposit demo", thread_id
                 )
             
             tx_id = self.business_facade.execute_with_transaction(deposit_operation)
-            print(f"Deposit completed. Transaction ID: {tx_id}")
-            logger.info(f"Deposit demonstration successful - TX:{tx_id}")
+            self._say(f"Deposit completed. Transaction ID: {tx_id}")
             
             # Create and process an order (complex distributed transaction)
-            print("Testing order creation (complex distributed transaction)...")
+            self._out.append("Testing order creation (complex distributed transaction)...")
             def order_operation(thread_id):
                 items = [
                     {'product_id': self.demo_products[0], 'quantity': 1},  # iPhone
@@ -179,174 +206,239 @@ class DistributedTransactionDemo:
                 )
             
             order_id = self.business_facade.execute_with_transaction(order_operation)
-            print(f"Order created successfully. Order ID: {order_id}")
-            logger.info(f"Order creation demonstration successful - Order:{order_id}")
-            print()
+            self._say(f"Order created successfully. Order ID: {order_id}")
+            self._out.append("")
             
         except Exception as e:
-            print(f"Error in basic operations: {str(e)}")
-            logger.error(f"Basic operations demonstration failed: {str(e)}")
+            self._say(f"Error in basic operations: {str(e)}", 'error')
+        
+        self._flush()
     
     def demonstrate_concurrency_control(self):
         """Demonstrate concurrent transaction handling"""
-        print("Demonstrating concurrency control...")
-        logger.info("Starting concurrency control demonstration")
-        
-        results = []
-        errors = []
+        self._say("Demonstrating concurrency control...")
         
-        def concurrent_transfer(account_from, account_to, amount, description, result_list, error_list):
-            """Function to run concurrent transfers"""
-            try:
-                def transfer_op(thread_id):
-                    return self.business_facade.transaction_service.transfer_money(
-                        account_from, account_to, amount, description, thread_id
-                    )
-                
-                tx_id = self.business_facade.execute_with_transaction(transfer_op)
-                result_list.append(f"Transfer {description}: Success (TX: {tx_id})")
-                
-            except Exception as e:
-                error_list.append(f"Transfer {description}: {str(e)}")
+        # Resolve the service methods once rather than in every worker
+        transfer_money = self.business_facade.transaction_service.transfer_money
+        execute_with_transaction = self.business_facade.execute_with_transaction
         
         # Start multiple concurrent transactions
-        threads = []
-        for i in range(5):
-            thread = threading.Thread(
-                target=concurrent_transfer,
-                args=(
-                    self.demo_accounts[0], self.demo_accounts[1], 
-                    Decimal("50.00"), f"Concurrent#{i+1}", 
-                    results, errors
+        transfer_count = 5
+        barrier = threading.Barrier(transfer_count, timeout=_DEMO_TIMEOUT_SECONDS)
+        
+        def concurrent_transfer(account_from, account_to, amount, description):
+            """Run one transfer and return its transaction id"""
+            def transfer_op(thread_id):
+                return transfer_money(
+                    account_from, account_to, amount, description, thread_id
                 )
-            )
-            threads.append(thread)
-            thread.start()
-            time.sleep(0.1)  # Small delay to create timing conflicts
+            
+            # Release all transfers at once so they contend for the same accounts
+            barrier.wait()
+            return execute_with_transaction(transfer_op)
         
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        descriptions = [f"Concurrent#{i+1}" for i in range(transfer_count)]
+        outcomes = self._run_timed([
+            partial(concurrent_transfer, self.demo_accounts[0], self.demo_accounts[1], _AMT_50, description)
+            for description in descriptions
+        ])
         
-        print(f"Concurrent operations completed:")
+        results = []
+        errors = []
+        for description, outcome in zip(descriptions, outcomes):
+            if outcome is None:
+                errors.append(f"Transfer {description}: did not finish within {_DEMO_TIMEOUT_SECONDS:.0f}s")
+            elif outcome[0]:
+                results.append(f"Transfer {description}: Success (TX: {outcome[1]})")
+            else:
+                errors.append(f"Transfer {description}: {str(outcome[1])}")
+        
+        self._out.append("Concurrent operations completed:")
+        if results:
+            self._out.append("\n".join(f"  SUCCESS: {result}" for result in results))
         for result in results:
-            print(f"  SUCCESS: {result}")
             logger.info(f"Concurrent operation result: {result}")
         
         if errors:
-            print(f"Some operations failed (expected due to concurrency control):")
+            self._out.append("Some operations failed (expected due to concurrency control):")
+            self._out.append("\n".join(f"  WARNING: {error}" for error in errors))
             for error in errors:
-                print(f"  WARNING: {error}")
                 logger.warning(f"Concurrent operation error: {error}")
         
-        print()
+        self._out.append("")
+        self._flush()
     
     def demonstrate_transaction_restart(self):
         """Demonstrate automatic transaction restart on conflicts"""
-        print("Demonstrating transaction restart mechanism...")
-        logger.info("Starting transaction restart demonstration")
+        self._say("Demonstrating transaction restart mechanism...")
+        
+        transfer_money = self.business_facade.transaction_service.transfer_money
+        get_account = self.business_facade.account_service.get_account
+        execute_with_transaction = self.business_facade.execute_with_transaction
+        
+        # T1 reads the contested account and opens read_done; T2 then writes both
+        # accounts and opens write_done, and only then does T1 write. T1 is the older
+        # transaction, so its write after T2's is refused and T1 restarts.
+        read_done = threading.Event()
+        write_done = threading.Event()
         
         def conflicting_operation_1(thread_id):
             """First operation that will conflict"""
-            time.sleep(0.5)  # Simulate some processing time
-            return self.business_facade.transaction_service.transfer_money(
+            get_account(self.demo_accounts[3], thread_id)
+            read_done.set()
+            write_done.wait(timeout=1.0)
+            return transfer_money(
                 self.demo_accounts[2], self.demo_accounts[3], 
-                Decimal("75.00"), "Restart demo 1", thread_id
+                _AMT_75, "Restart demo 1", thread_id
             )
         
         def conflicting_operation_2(thread_id):
             """Second operation that will conflict"""
-            time.sleep(0.3)  # Different timing
-            return self.business_facade.transaction_service.transfer_money(
-                self.demo_accounts[3], self.demo_accounts[2], 
-                Decimal("25.00"), "Restart demo 2", thread_id
-            )
+            read_done.wait(timeout=1.0)
+            try:
+                return transfer_money(
+                    self.demo_accounts[3], self.demo_accounts[2], 
+                    _AMT_25, "Restart demo 2", thread_id
+                )
+            finally:
+                write_done.set()
         
         results = []
+        errors = []
+        restarts_before = self._count_restarts()
         
         # Start conflicting transactions
-        thread1 = threading.Thread(target=lambda: results.append(
-            ("T1", self.business_facade.execute_with_transaction(conflicting_operation_1))
-        ))
-        
-        thread2 = threading.Thread(target=lambda: results.append(
-            ("T2", self.business_facade.execute_with_transaction(conflicting_operation_2))
+        outcomes = self._run_timed([
+            partial(execute_with_transaction, conflicting_operation_1),
+            partial(execute_with_transaction, conflicting_operation_2)
+        ])
+        for thread_name, outcome in zip(("T1", "T2"), outcomes):
+            if outcome is None:
+                errors.append((thread_name, f"did not finish within {_DEMO_TIMEOUT_SECONDS:.0f}s"))
+            elif outcome[0]:
+                results.append((thread_name, outcome[1]))
+            else:
+                errors.append((thread_name, str(outcome[1])))
+        
+        self._out.append("Transaction restart demonstration completed:")
+        self._out.append("\n".join(
+            [f"  SUCCESS: {thread_name}: Success (TX: {tx_id})" for thread_name, tx_id in results] +
+            [f"  WARNING: {thread_name}: {error}" for thread_name, error in errors] +
+            [f"  Restarts: {self._count_restarts() - restarts_before}"]
         ))
+        for thread_name, tx_id in results:
+            logger.info(f"Transaction restart result - {thread_name}: TX:{tx_id}")
+        for thread_name, error in errors:
+            logger.warning(f"Transaction restart error - {thread_name}: {error}")
         
-        thread1.start()
-        thread2.start()
+        self._out.append("")
+        self._flush()
+    
+    def _run_timed(self, jobs: List[Callable[[], Any]]) -> List[Optional[Tuple[bool, Any]]]:
+        """Run each job on its own daemon thread, waiting at most _DEMO_TIMEOUT_SECONDS overall
+        
+        Returns (True, result) or (False, exception) per job, or None for jobs
+        still running at the deadline. Daemon threads do not hold up interpreter
+        exit, and results arriving after the deadline are discarded.
+        """
+        lock = threading.Lock()
+        outcomes: List[Optional[Tuple[bool, Any]]] = [None] * len(jobs)
+        closed = False
+        
+        def run(index, job):
+            try:
+                outcome = (True, job())
+            except Exception as e:
+                outcome = (False, e)
+            with lock:
+                if not closed:
+                    outcomes[index] = outcome
         
-        thread1.join()
-        thread2.join()
+        threads = [threading.Thread(target=run, args=(index, job), daemon=True)
+                   for index, job in enumerate(jobs)]
+        for thread in threads:
+            thread.start()
         
-        print(f"Transaction restart demonstration completed:")
-        for thread_name, tx_id in results:
-            print(f"  SUCCESS: {thread_name}: Success (TX: {tx_id})")
-            logger.info(f"Transaction restart result - {thread_name}: TX:{tx_id}")
+        deadline = time.monotonic() + _DEMO_TIMEOUT_SECONDS
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                logger.warning(f"Demo worker {thread.name} did not finish within {_DEMO_TIMEOUT_SECONDS:.0f}s")
         
-        print()
+        with lock:
+            closed = True
+            return list(outcomes)
     
-    def demonstrate_rollback(self):
-        """Demonstrate transaction rollback"""
-        print("Demonstrating transaction rollback...")
-        logger.info("Starting rollback demonstration")
+    def _count_restarts(self) -> int:
+        """Count the restarts recorded in the transaction log"""
+        return sum(1 for entry in self.business_facade.transaction_manager.transaction_log
+                   if entry['operation_type'] == 'RESTART_TRANSACTION')
+    
+    def demonstrate_rollback(self, minimal: bool = False):
+        """Demonstrate transaction rollback
+        
+        With minimal=True the preliminary deposit is skipped and only the
+        failing transfer is attempted, which is enough for benchmarking runs.
+        """
+        self._say("Demonstrating transaction rollback...")
         
         try:
             def failing_operation(thread_id):
                 # This operation should fail and trigger rollback
                 # First, do a successful operation
-                self.business_facade.transaction_service.deposit_money(
-                    self.demo_accounts[0], Decimal("200.00"), "Before failure", thread_id
-                )
+                if not minimal:
+                    self.business_facade.transaction_service.deposit_money(
+                        self.demo_accounts[0], _AMT_200, "Before failure", thread_id
+                    )
                 
                 # Then try to transfer more money than available (should fail)
                 return self.business_facade.transaction_service.transfer_money(
                     self.demo_accounts[0], self.demo_accounts[1], 
-                    Decimal("999999.00"), "Should fail", thread_id
+                    _AMT_999999, "Should fail", thread_id
                 )
             
             # This should fail and rollback
             self.business_facade.execute_with_transaction(failing_operation)
-            print("Operation should have failed!")
-            logger.error("Rollback demonstration failed - operation should have been rolled back")
+            self._say("Operation should have failed!", 'error')
             
         except BusinessException as e:
-            print(f"Transaction correctly rolled back: {str(e)}")
-            logger.success(f"Rollback demonstration successful: {str(e)}")
+            self._say(f"Transaction correctly rolled back: {str(e)}", 'success')
         
-        print()
+        self._out.append("")
+        self._flush()
     
     def show_system_statistics(self):
         """Show comprehensive system statistics"""
-        print("System Statistics:")
-        print("=" * 50)
+        self._out.append("System Statistics:")
+        self._out.append("=" * 50)
         logger.info("Displaying system statistics")
         
         # Transaction statistics
         tx_stats = self.business_facade.transaction_manager.get_transaction_statistics()
-        print(f"Active Transactions: {tx_stats['active_transactions']}")
-        print(f"Total Transactions: {tx_stats['total_transactions']}")
-        print(f"Transaction Log Entries: {tx_stats['log_entries']}")
-        print(f"Multiversion Resources: {tx_stats['multiversion_resources']}")
-        print()
+        self._out.append(f"Active Transactions: {tx_stats['active_transactions']}")
+        self._out.append(f"Total Transactions: {tx_stats['total_transactions']}")
+        self._out.append(f"Transaction Log Entries: {tx_stats['log_entries']}")
+        self._out.append(f"Multiversion Resources: {tx_stats['multiversion_resources']}")
+        self._out.append(f"Total Account Balance: ${self.db_manager.sum_column('financial', 'accounts', 'balance'):.2f}")
+        self._out.append("")
         
         # Database statistics
-        for db_name in ['financial', 'inventory']:
-            db = self.db_manager.get_database(db_name)
-            db_stats = db.get_statistics()
-            print(f"Database '{db_name}':")
-            print(f"  Total Operations: {db_stats['total_operations']}")
-            print(f"  Tables: {len(db_stats['tables'])}")
-            for table_name, table_stats in db_stats['tables'].items():
-                print(f"    {table_name}: {table_stats['record_count']} records")
-            print()
+        for db_name, db_stats in self.db_manager.get_all_statistics().items():
+            self._out.append(f"Database '{db_name}':")
+            self._out.append(f"  Total Operations: {db_stats['total_operations']}")
+            self._out.append(f"  Tables: {len(db_stats['tables'])}")
+            self._out.extend(f"    {table_name}: {table_stats['record_count']} records"
+                             for table_name, table_stats in db_stats['tables'].items())
+            self._out.append("")
+        self._flush()
     
     def run_comprehensive_demo(self):
         """Run the complete demonstration"""
-        print("Starting Comprehensive Distributed Transaction System Demo")
-        print("=" * 60)
+        self._out.append("Starting Comprehensive Distributed Transaction System Demo")
+        self._out.append("=" * 60)
         logger.info("Starting comprehensive demonstration")
-        print()
+        self._out.append("")
+        self._flush()
         
         # Create sample data
         self.create_sample_data()
@@ -366,61 +458,81 @@ class DistributedTransactionDemo:
         # Show final statistics
         self.show_system_statistics()
         
-        print("Demo completed successfully!")
-        logger.success("Comprehensive demonstration completed successfully")
-        print("\nFeatures Demonstrated:")
-        print("- Multi-tier architecture (CLI - Business - Transaction - Database)")
-        print("- Two separate in-memory databases")
-        print("- Distributed transactions with ACID properties")
-        print("- Timestamp-based concurrency control")
-        print("- Multiversion storage")
-        print("- Automatic transaction restart")
-        print("- Rollback mechanisms")
-        print("- Deadlock detection")
-        print("- 8+ business operations")
-        print("- Complex multi-operation transactions")
+        self._say("Demo completed successfully!", 'success')
+        self._out.append("")
+        self._out.append("Features Demonstrated:")
+        self._out.append("- Multi-tier architecture (CLI - Business - Transaction - Database)")
+        self._out.append("- Two separate in-memory databases")
+        self._out.append("- Distributed transactions with ACID properties")
+        self._out.append("- Timestamp-based concurrency control")
+        self._out.append("- Multiversion storage")
+        self._out.append("- Automatic transaction restart")
+        self._out.append("- Rollback mechanisms")
+        self._out.append("- Deadlock detection")
+        self._out.append("- 8+ business operations")
+        self._out.append("- Complex multi-operation transactions")
+        self._flush()
+    
+    def _say(self, message: str, level: str = 'info'):
+        """Buffer a line of demo output and log the same text at the given level"""
+        self._out.append(message)
+        logger.opt(depth=1).log(level.upper(), message)
+    
+    def _flush(self):
+        """Write buffered demonstration output to stdout in a single call"""
+        if self._out:
+            sys.stdout.write("\n".join(self._out) + "\n")
+            sys.stdout.flush()
+            self._out.clear()
+    
+    def close(self):
+        """Shut down the worker pool used to create the sample data"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
 def main():
     """Main function to run the demo"""
     demo = DistributedTransactionDemo()
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--interactive":
-        # Interactive mode - user can run individual demonstrations
-        print("Interactive mode - choose demonstrations to run:")
-        print("1. Create sample data")
-        print("2. Basic operations")
-        print("3. Concurrency control")
-        print("4. Transaction restart")
-        print("5. Rollback demonstration")
-        print("6. System statistics")
-        print("7. Run all")
-        
-        choice = input("Enter choice (1-7): ")
-        
-        if choice == "1":
-            demo.create_sample_data()
-        elif choice == "2":
-            demo.create_sample_data()
-            demo.demonstrate_basic_operations()
-        elif choice == "3":
-            demo.create_sample_data()
-            demo.demonstrate_concurrency_control()
-        elif choice == "4":
-            demo.create_sample_data()
-            demo.demonstrate_transaction_restart()
-        elif choice == "5":
-            demo.create_sample_data()
-            demo.demonstrate_rollback()
-        elif choice == "6":
-            demo.create_sample_data()
-            demo.show_system_statistics()
-        elif choice == "7":
-            demo.run_comprehensive_demo()
+    try:
+        if len(sys.argv) > 1 and sys.argv[1] == "--interactive":
+            # Interactive mode - user can run individual demonstrations
+            print("Interactive mode - choose demonstrations to run:")
+            print("1. Create sample data")
+            print("2. Basic operations")
+            print("3. Concurrency control")
+            print("4. Transaction restart")
+            print("5. Rollback demonstration")
+            print("6. System statistics")
+            print("7. Run all")
+            
+            choice = input("Enter choice (1-7): ")
+            
+            if choice == "1":
+                demo.create_sample_data()
+            elif choice == "2":
+                demo.create_sample_data()
+                demo.demonstrate_basic_operations()
+            elif choice == "3":
+                demo.create_sample_data()
+                demo.demonstrate_concurrency_control()
+            elif choice == "4":
+                demo.create_sample_data()
+                demo.demonstrate_transaction_restart()
+            elif choice == "5":
+                demo.create_sample_data()
+                demo.demonstrate_rollback()
+            elif choice == "6":
+                demo.create_sample_data()
+                demo.show_system_statistics()
+            elif choice == "7":
+                demo.run_comprehensive_demo()
+            else:
+                print("Invalid choice")
         else:
-            print("Invalid choice")
-    else:
-        # Run complete demo
-        demo.run_comprehensive_demo()
+            # Run complete demo
+            demo.run_comprehensive_demo()
+    finally:
+        demo.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
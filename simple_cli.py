@@ -3,20 +3,90 @@
 Simple CLI interface with loguru logging
 """
 
+import io
 import sys
 import os
 
-# Add the src directory to the Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+from functools import lru_cache
+from typing import Callable, Dict
 
-# Import config first to set up logging
-import config
+def _load_runtime():
+    """Import the transaction system and logging stack on first use
+    
+    The demo branch runs demo.py, which does its own imports, so these are
+    only pulled in for the interactive CLI.
+    """
+    # Add the src directory to the Python path
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+    
+    from config import setup_once, performance_monitor
+    from business.services import BusinessFacade, BusinessException, BatchRef, OrderLine
+    from database.inmemory_db import DatabaseManager
+    from decimal import Decimal
+    from concurrent.futures import ThreadPoolExecutor
+    import asyncio
+    import threading
+    from loguru import logger
+    
+    globals().update(
+        setup_once=setup_once,
+        performance_monitor=performance_monitor,
+        BusinessFacade=BusinessFacade,
+        BusinessException=BusinessException,
+        BatchRef=BatchRef,
+        OrderLine=OrderLine,
+        DatabaseManager=DatabaseManager,
+        Decimal=Decimal,
+        ThreadPoolExecutor=ThreadPoolExecutor,
+        asyncio=asyncio,
+        threading=threading,
+        logger=logger
+    )
+
+@lru_cache(maxsize=1024)
+def _dec(text: str) -> "Decimal":
+    """Parse a monetary amount typed by the user straight into a Decimal"""
+    return Decimal(text.strip())
+
+_HELP_TEXT = """Available commands:
+  1 - Show system status
+  2 - Transfer money
+  3 - Deposit money
+  4 - Withdraw money
+  5 - Create product
+  6 - Create order
+  7 - View accounts
+  8 - Run concurrency test
+  9 - Help
+  0 - Exit
+
+"""
+
+def _prompt(message: str) -> str:
+    """Prompt for a line of input; every prompt in the CLI reads stdin through here
+    
+    The line is read from the file descriptor a byte at a time, like the
+    single-key menu reads, so no input is held back in Python's stdin buffer.
+    """
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    fd = sys.stdin.fileno()
+    line = bytearray()
+    while True:
+        byte = os.read(fd, 1)
+        if not byte:
+            if not line:
+                raise EOFError("EOF when reading a line")
+            break
+        if byte == b'\n':
+            break
+        line += byte
+    return line.decode(sys.stdin.encoding or 'utf-8', errors='replace')
 
-from business.services import BusinessFacade, BusinessException
-from database.inmemory_db import DatabaseManager
-from decimal import Decimal
-import threading
-from loguru import logger
+def _write_lines(lines):
+    """Write a block of lines to stdout with a single write and flush"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 class SimpleCLI:
     def __init__(self):
@@ -24,44 +94,60 @@ class SimpleCLI:
         self.business_facade = None
         self.current_user_id = 1
         self.current_account_id = 1
+        # Enough workers for the concurrency test's transfers to run side by side
+        self._pool = ThreadPoolExecutor(max_workers=max(os.cpu_count() or 1, 5))
+        # The interactive session runs on one thread, so reuse its id for every transaction
+        self._tid = str(threading.get_ident())
+        self._running = False
+        self._cmds: Dict[str, Callable[[], None]] = {
+            '0': self.exit,
+            '1': self.show_status,
+            '2': self.transfer_money,
+            '3': self.deposit_money,
+            '4': self.withdraw_money,
+            '5': self.create_product,
+            '6': self.create_order,
+            '7': self.view_accounts,
+            '8': self.run_concurrency_test,
+            '9': self.show_help
+        }
         self._initialize_system()
     
+    def exit(self):
+        """Stop the CLI loop"""
+        print("Goodbye!")
+        self._running = False
+    
+    def close(self):
+        """Release the worker pool"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
     def _initialize_system(self):
         """Initialize system with sample data"""
         logger.info("Initializing Distributed Transaction System...")
         
         self.db_manager.initialize_system_databases()
-        self.business_facade = BusinessFacade(self.db_manager)
+        self.business_facade = BusinessFacade(self.db_manager, performance_monitor)
+        
+        # Bind services once so CLI commands avoid repeated facade lookups
+        self._tx_svc = self.business_facade.transaction_service
+        self._acct_svc = self.business_facade.account_service
+        self._prod_svc = self.business_facade.product_service
+        self._order_svc = self.business_facade.order_service
+        self._user_svc = self.business_facade.user_service
+        self._cat_svc = self.business_facade.category_service
+        self._tx_mgr = self.business_facade.transaction_manager
         
         # Create sample data
         try:
-            def create_sample_data(thread_id):
-                # Create categories
-                cat1 = self.business_facade.category_service.create_category(
-                    "Electronics", "Electronic products", None, thread_id
-                )
-                
-                # Create user and accounts
-                user_id = self.business_facade.user_service.create_user(
-                    "demo_user", "demo@example.com", "hashed_password", thread_id
-                )
-                
-                account1 = self.business_facade.account_service.create_account(
-                    user_id, "checking", Decimal("1000.00"), thread_id
-                )
-                
-                account2 = self.business_facade.account_service.create_account(
-                    user_id, "savings", Decimal("5000.00"), thread_id
-                )
-                
-                # Create products
-                prod1 = self.business_facade.product_service.create_product(
-                    "iPhone 15", "Latest smartphone", Decimal("999.99"), 50, cat1, thread_id
-                )
-                
-                return user_id, account1, account2, prod1
-            
-            user_id, acc1, acc2, prod1 = self.business_facade.execute_with_transaction(create_sample_data)
+            facade = self.business_facade
+            user_id, acc1, acc2, cat1, prod1 = facade.batch_create([
+                (facade.user_service.create_user, ("demo_user", "demo@example.com", "hashed_password")),
+                (facade.account_service.create_account, (BatchRef(0), "checking", Decimal("1000.00"))),
+                (facade.account_service.create_account, (BatchRef(0), "savings", Decimal("5000.00"))),
+                (facade.category_service.create_category, ("Electronics", "Electronic products", None)),
+                (facade.product_service.create_product, ("iPhone 15", "Latest smartphone", Decimal("999.99"), 50, BatchRef(3)))
+            ], thread_id=self._tid)
             self.current_user_id = user_id
             self.current_account_id = acc1
             
@@ -74,123 +160,112 @@ class SimpleCLI:
     
     def show_help(self):
         """Show available commands"""
-        print("Available commands:")
-        print("  1 - Show system status")
-        print("  2 - Transfer money") 
-        print("  3 - Deposit money")
-        print("  4 - Withdraw money")
-        print("  5 - Create product")
-        print("  6 - Create order")
-        print("  7 - View accounts")
-        print("  8 - Run concurrency test")
-        print("  9 - Help")
-        print("  0 - Exit")
-        print()
+        sys.stdout.write(_HELP_TEXT)
+        sys.stdout.flush()
     
     def show_status(self):
         """Show system status"""
-        stats = self.business_facade.transaction_manager.get_transaction_statistics()
+        stats = self._tx_mgr.get_transaction_statistics()
         
-        print("=== SYSTEM STATUS ===")
-        print(f"Current User ID: {self.current_user_id}")
-        print(f"Current Account ID: {self.current_account_id}")
-        print()
-        print(f"Active Transactions: {stats['active_transactions']}")
-        print(f"Total Transactions: {stats['total_transactions']}")
-        print(f"Log Entries: {stats['log_entries']}")
-        print()
+        lines = [
+            "=== SYSTEM STATUS ===",
+            f"Current User ID: {self.current_user_id}",
+            f"Current Account ID: {self.current_account_id}",
+            "",
+            f"Active Transactions: {stats['active_transactions']}",
+            f"Total Transactions: {stats['total_transactions']}",
+            f"Log Entries: {stats['log_entries']}",
+            f"Total Account Balance: ${self.db_manager.sum_column('financial', 'accounts', 'balance'):.2f}",
+            ""
+        ]
         
-        for db_name in ['financial', 'inventory']:
-            db = self.db_manager.get_database(db_name)
-            db_stats = db.get_statistics()
-            print(f"Database '{db_name}':")
-            for table_name, table_stats in db_stats['tables'].items():
-                print(f"  {table_name}: {table_stats['record_count']} records")
-        print()
+        for db_name, db_stats in self.db_manager.get_all_statistics().items():
+            lines.append(f"Database '{db_name}':")
+            lines.extend([f"  {table_name}: {table_stats['record_count']} records"
+                          for table_name, table_stats in db_stats['tables'].items()])
+        lines.append("")
+        
+        _write_lines(lines)
     
     def transfer_money(self):
         """Transfer money interface"""
         try:
-            to_account = int(input("Destination account ID: "))
-            amount = float(input("Amount: "))
-            description = input("Description (optional): ") or "Transfer"
-            
-            def operation(thread_id):
-                return self.business_facade.transaction_service.transfer_money(
-                    self.current_account_id, to_account, Decimal(str(amount)), description, thread_id
-                )
+            to_account = int(_prompt("Destination account ID: "))
+            amount = _dec(_prompt("Amount: "))
+            description = _prompt("Description (optional): ") or "Transfer"
             
-            tx_id = self.business_facade.execute_with_transaction(operation)
-            print(f"Transfer completed! Transaction ID: {tx_id}")
-            logger.info(f"Money transfer successful - TX:{tx_id} - Amount:{amount} - From:{self.current_account_id} - To:{to_account}")
+            tx_id = self.business_facade.execute_single(
+                self._tx_svc.transfer_money,
+                self.current_account_id, to_account, amount, description,
+                thread_id=self._tid
+            )
+            _write_lines([f"Transfer completed! Transaction ID: {tx_id}", ""])
+            logger.opt(lazy=True).info("Money transfer successful - TX:{} - Amount:{} - From:{} - To:{}",
+                                       lambda: tx_id, lambda: amount, lambda: self.current_account_id, lambda: to_account)
             
         except Exception as e:
-            print(f"Transfer failed: {str(e)}")
+            _write_lines([f"Transfer failed: {str(e)}", ""])
             logger.error(f"Money transfer failed: {str(e)}")
-        print()
     
     def deposit_money(self):
         """Deposit money interface"""
         try:
-            amount = float(input("Deposit amount: "))
-            description = input("Description (optional): ") or "Deposit"
+            amount = _dec(_prompt("Deposit amount: "))
+            description = _prompt("Description (optional): ") or "Deposit"
             
-            def operation(thread_id):
-                return self.business_facade.transaction_service.deposit_money(
-                    self.current_account_id, Decimal(str(amount)), description, thread_id
-                )
-            
-            tx_id = self.business_facade.execute_with_transaction(operation)
-            print(f"Deposit completed! Transaction ID: {tx_id}")
-            logger.info(f"Deposit successful - TX:{tx_id} - Amount:{amount} - Account:{self.current_account_id}")
+            tx_id = self.business_facade.execute_single(
+                self._tx_svc.deposit_money,
+                self.current_account_id, amount, description,
+                thread_id=self._tid
+            )
+            _write_lines([f"Deposit completed! Transaction ID: {tx_id}", ""])
+            logger.opt(lazy=True).info("Deposit successful - TX:{} - Amount:{} - Account:{}",
+                                       lambda: tx_id, lambda: amount, lambda: self.current_account_id)
             
         except Exception as e:
-            print(f"Deposit failed: {str(e)}")
+            _write_lines([f"Deposit failed: {str(e)}", ""])
             logger.error(f"Deposit failed: {str(e)}")
-        print()
     
     def withdraw_money(self):
         """Withdraw money interface"""
         try:
-            amount = float(input("Withdrawal amount: "))
-            description = input("Description (optional): ") or "Withdrawal"
+            amount = _dec(_prompt("Withdrawal amount: "))
+            description = _prompt("Description (optional): ") or "Withdrawal"
             
-            def operation(thread_id):
-                return self.business_facade.transaction_service.withdraw_money(
-                    self.current_account_id, Decimal(str(amount)), description, thread_id
-                )
-            
-            tx_id = self.business_facade.execute_with_transaction(operation)
-            print(f"Withdrawal completed! Transaction ID: {tx_id}")
-            logger.info(f"Withdrawal successful - TX:{tx_id} - Amount:{amount} - Account:{self.current_account_id}")
+            tx_id = self.business_facade.execute_single(
+                self._tx_svc.withdraw_money,
+                self.current_account_id, amount, description,
+                thread_id=self._tid
+            )
+            _write_lines([f"Withdrawal completed! Transaction ID: {tx_id}", ""])
+            logger.opt(lazy=True).info("Withdrawal successful - TX:{} - Amount:{} - Account:{}",
+                                       lambda: tx_id, lambda: amount, lambda: self.current_account_id)
             
         except Exception as e:
-            print(f"Withdrawal failed: {str(e)}")
+            _write_lines([f"Withdrawal failed: {str(e)}", ""])
             logger.error(f"Withdrawal failed: {str(e)}")
-        print()
     
     def create_product(self):
         """Create product interface"""
         try:
-            name = input("Product name: ")
-            description = input("Product description: ")
-            price = float(input("Product price: "))
-            stock = int(input("Initial stock: "))
-            category_id = int(input("Category ID: "))
+            name = _prompt("Product name: ")
+            description = _prompt("Product description: ")
+            price = _dec(_prompt("Product price: "))
+            stock = int(_prompt("Initial stock: "))
+            category_id = int(_prompt("Category ID: "))
             
-            def operation(thread_id):
-                return self.business_facade.product_service.create_product(
-                    name, description, Decimal(str(price)), stock, category_id, thread_id
-                )
-            
-            prod_id = self.business_facade.execute_with_transaction(operation)
-            print(f"Product created! Product ID: {prod_id}")
-            logger.info(f"Product created successfully - ID:{prod_id} - Name:{name}")
+            prod_id = self.business_facade.execute_single(
+                self._prod_svc.create_product,
+                name, description, price, stock, category_id,
+                thread_id=self._tid
+            )
+            _write_lines([f"Product created! Product ID: {prod_id}", ""])
+            logger.opt(lazy=True).info("Product created successfully - ID:{} - Name:{}",
+                                       lambda: prod_id, lambda: name)
             
         except Exception as e:
-            print(f"Product creation failed: {str(e)}")
+            _write_lines([f"Product creation failed: {str(e)}", ""])
             logger.error(f"Product creation failed: {str(e)}")
-        print()
     
     def create_order(self):
         """Create order interface"""
@@ -199,144 +274,177 @@ class SimpleCLI:
             items = []
             
             while True:
-                prod_id = int(input("Product ID: "))
-                quantity = int(input("Quantity: "))
-                items.append({'product_id': prod_id, 'quantity': quantity})
+                prod_id = int(_prompt("Product ID: "))
+                quantity = int(_prompt("Quantity: "))
+                items.append(OrderLine(prod_id, quantity))
                 
-                more = input("Add more items? (y/n): ").lower()
+                more = _prompt("Add more items? (y/n): ").lower()
                 if more != 'y':
                     break
             
-            def operation(thread_id):
-                return self.business_facade.order_service.create_order(
-                    self.current_user_id, items, self.current_account_id, thread_id
-                )
-            
-            order_id = self.business_facade.execute_with_transaction(operation)
-            print(f"Order created! Order ID: {order_id}")
-            logger.info(f"Order created successfully - ID:{order_id} - User:{self.current_user_id} - Items:{len(items)}")
+            order_id = self.business_facade.execute_single(
+                self._order_svc.create_order,
+                self.current_user_id, items, self.current_account_id,
+                thread_id=self._tid
+            )
+            _write_lines([f"Order created! Order ID: {order_id}", ""])
+            logger.opt(lazy=True).info("Order created successfully - ID:{} - User:{} - Items:{}",
+                                       lambda: order_id, lambda: self.current_user_id, lambda: len(items))
             
         except Exception as e:
-            print(f"Order creation failed: {str(e)}")
+            _write_lines([f"Order creation failed: {str(e)}", ""])
             logger.error(f"Order creation failed: {str(e)}")
-        print()
     
     def view_accounts(self):
         """View user accounts"""
         try:
-            def operation(thread_id):
-                return self.business_facade.account_service.get_user_accounts(
-                    self.current_user_id, thread_id
-                )
-            
-            accounts = self.business_facade.execute_with_transaction(operation)
+            accounts = self.business_facade.execute_single(
+                self._acct_svc.get_user_accounts,
+                self.current_user_id,
+                thread_id=self._tid
+            )
             
             if accounts:
-                print("User Accounts:")
+                lines = ["User Accounts:"]
                 for acc in accounts:
-                    print(f"  ID: {acc['id']}, Type: {acc['account_type']}, "
-                          f"Balance: ${acc['balance']:.2f}")
+                    lines.append(f"  ID: {acc['id']}, Type: {acc['account_type']}, "
+                                 f"Balance: ${acc['balance']:.2f}")
+                lines.append("")
+                _write_lines(lines)
             else:
-                print("No accounts found")
+                _write_lines(["No accounts found", ""])
                 
         except Exception as e:
-            print(f"Failed to get accounts: {str(e)}")
+            _write_lines([f"Failed to get accounts: {str(e)}", ""])
             logger.error(f"Failed to get accounts: {str(e)}")
-        print()
     
     def run_concurrency_test(self):
         """Test concurrency with multiple threads"""
         print("Running concurrency test with 5 concurrent transfers...")
         
-        results = []
-        errors = []
+        transfer_count = 5
+        # Line the workers up so every transfer contends for the account at once; the
+        # timeout keeps a pool smaller than transfer_count from stalling the test
+        start_barrier = threading.Barrier(transfer_count, timeout=2.0)
         
-        def concurrent_transfer(thread_num, result_list, error_list):
+        def concurrent_transfer(idx):
+            def transfer_op(thread_id):
+                return self._tx_svc.transfer_money(
+                    self.current_account_id, 2, Decimal("10.00"), 
+                    f"Concurrent transfer {idx+1}", thread_id
+                )
+            
             try:
-                def transfer_op(thread_id):
-                    return self.business_facade.transaction_service.transfer_money(
-                        self.current_account_id, 2, Decimal("10.00"), 
-                        f"Concurrent transfer {thread_num}", thread_id
-                    )
-                
-                tx_id = self.business_facade.execute_with_transaction(transfer_op)
-                result_list.append(f"Thread {thread_num}: Success (TX: {tx_id})")
-                
-            except Exception as e:
-                error_list.append(f"Thread {thread_num}: {str(e)}")
+                start_barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+            return self.business_facade.execute_with_transaction(transfer_op)
         
-        threads = []
-        for i in range(5):
-            thread = threading.Thread(
-                target=concurrent_transfer,
-                args=(i+1, results, errors)
+        async def submit_all():
+            # Submit every transfer at once, then wait for all completions together
+            loop = asyncio.get_running_loop()
+            return await asyncio.gather(
+                *[loop.run_in_executor(self._pool, concurrent_transfer, i) for i in range(transfer_count)],
+                return_exceptions=True
             )
-            threads.append(thread)
-            thread.start()
         
-        for thread in threads:
-            thread.join()
+        results = []
+        errors = []
+        for idx, outcome in enumerate(asyncio.run(submit_all())):
+            if isinstance(outcome, Exception):
+                errors.append(f"Thread {idx+1}: {str(outcome)}")
+            else:
+                results.append(f"Thread {idx+1}: Success (TX: {outcome})")
         
         print("Results:")
         for result in results:
             print(f"  SUCCESS: {result}")
-            logger.info(f"Concurrent operation result: {result}")
+            logger.opt(lazy=True).info("Concurrent operation result: {}", lambda: result)
         
         for error in errors:
             print(f"  WARNING: {error}")
-            logger.warning(f"Concurrent operation error: {error}")
+            logger.opt(lazy=True).warning("Concurrent operation error: {}", lambda: error)
         
         print()
     
+    def _read_line(self) -> str:
+        """Read a menu command as a full line (piped or non-terminal input)"""
+        return _prompt("DTS> ").strip()
+    
+    def _read_key(self) -> str:
+        """Read a single-key menu command with the terminal in cbreak mode"""
+        try:
+            import termios
+            import tty
+        except ImportError:
+            return self._read_line()
+        
+        sys.stdout.write("DTS> ")
+        sys.stdout.flush()
+        fd = sys.stdin.fileno()
+        saved_attrs = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            # Read the descriptor directly so typed-ahead bytes stay in the terminal's queue
+            key = os.read(fd, 1).decode(sys.stdin.encoding or 'utf-8', errors='replace')
+        finally:
+            # Commands prompt for their own input, so restore line mode right away
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved_attrs)
+        if not key:
+            raise EOFError("EOF when reading a line")
+        sys.stdout.write(key + "\n")
+        return key.strip()
+    
     def run(self):
         """Main CLI loop"""
         print("Welcome to the Distributed Transaction System!")
         print("Type '9' for help or '0' to exit.")
         print()
         
-        while True:
+        read_command = self._read_key if sys.stdin.isatty() else self._read_line
+        
+        self._running = True
+        while self._running:
             try:
-                command = input("DTS> ").strip()
+                command = read_command()
                 
-                if command == '0':
-                    print("Goodbye!")
-                    break
-                elif command == '1':
-                    self.show_status()
-                elif command == '2':
-                    self.transfer_money()
-                elif command == '3':
-                    self.deposit_money()
-                elif command == '4':
-                    self.withdraw_money()
-                elif command == '5':
-                    self.create_product()
-                elif command == '6':
-                    self.create_order()
-                elif command == '7':
-                    self.view_accounts()
-                elif command == '8':
-                    self.run_concurrency_test()
-                elif command == '9':
-                    self.show_help()
+                handler = self._cmds.get(command)
+                if handler:
+                    handler()
                 else:
                     print("Unknown command. Type '9' for help.")
                     
             except KeyboardInterrupt:
                 print("\nGoodbye!")
-                break
+                self._running = False
             except Exception as e:
                 print(f"Error: {str(e)}")
 
 def main():
     """Main entry point"""
     if len(sys.argv) > 1 and sys.argv[1] == 'demo':
-        # Run automated demo
-        os.system(f"cd {os.path.dirname(__file__)} && PYTHONPATH={os.path.dirname(__file__)}/src python demo.py")
+        # Run automated demo in this interpreter
+        import runpy
+        runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'demo.py'), run_name='__main__')
     else:
-        # Run interactive CLI
+        _load_runtime()
+        
+        # Log through a background queue so logging never blocks a transaction
+        setup_once(enqueue=True)
+        
+        # Run interactive CLI on a block-buffered stdout; menus flush explicitly
+        # and _prompt() flushes pending output before every prompt
+        sys.stdout.flush()
+        sys.stdout = io.TextIOWrapper(
+            io.BufferedWriter(io.FileIO(sys.stdout.fileno(), 'w', closefd=False), buffer_size=65536),
+            encoding=sys.stdout.encoding,
+            write_through=False
+        )
         cli = SimpleCLI()
-        cli.run()
+        try:
+            cli.run()
+        finally:
+            cli.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,16 +1,60 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, NamedTuple, Sequence, Tuple, Mapping
 from decimal import Decimal
+from dataclasses import dataclass
 from datetime import datetime
 import threading
+import random
+import time
+from functools import partial
 
 from transaction.manager import TransactionManager, TransactionException
 from models.entities import User, Account, Transaction as TransactionRecord, Product, Category, Order, OrderItem
-from database.inmemory_db import DatabaseManager
+from database.inmemory_db import DatabaseManager, ConstraintViolation
+
+_tls = threading.local()
+
+def _get_tid() -> str:
+    """Get the calling thread's id as a string, formatted once per thread"""
+    try:
+        return _tls.tid
+    except AttributeError:
+        _tls.tid = str(threading.get_ident())
+        return _tls.tid
 
 class BusinessException(Exception):
     """Business logic related exceptions"""
     pass
 
+class NotFoundError(BusinessException):
+    """A referenced user, account, product or category does not exist"""
+    pass
+
+class InsufficientFundsError(BusinessException):
+    """An account balance does not cover the requested amount"""
+    pass
+
+class InsufficientStockError(BusinessException):
+    """A product does not have enough stock for the requested quantity"""
+    pass
+
+class OrderLine(NamedTuple):
+    """Compact order line accepted by OrderService.create_order"""
+    product_id: int
+    quantity: int
+
+@dataclass(slots=True)
+class ValidatedItem:
+    """Order line after product lookup and stock validation"""
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+    total_price: Decimal
+    current_stock: int
+
+class BatchRef(NamedTuple):
+    """Placeholder argument in BusinessFacade.batch_create referring to the result of an earlier operation"""
+    index: int
+
 class UserService:
     """User management service"""
     
@@ -24,19 +68,18 @@ class UserService:
                 'username': username,
                 'email': email,
                 'password_hash': password_hash,
-                'created_at': datetime.now(),
+                'created_at': self.transaction_manager.tx_now(thread_id),
                 'is_active': True
             }
             
-            # Check if user already exists
-            existing_users = self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'financial', 'users'
-            )
-            
-            if existing_users:
-                for user in existing_users:
-                    if user['username'] == username or user['email'] == email:
-                        raise BusinessException("User with this username or email already exists")
+            # Check if user already exists (the email lookup is skipped when the username is taken)
+            if any(
+                self.transaction_manager.execute_operation(
+                    thread_id, 'SELECT', 'financial', 'users', where={field: value}, readonly=True
+                )
+                for field, value in (('username', username), ('email', email))
+            ):
+                raise BusinessException("User with this username or email already exists")
             
             user_id = self.transaction_manager.execute_operation(
                 thread_id, 'INSERT', 'financial', 'users', data=user_data
@@ -44,15 +87,58 @@ class UserService:
             
             return user_id
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to create user: {str(e)}")
     
+    def create_users_bulk(self, users: List[Dict[str, Any]], thread_id: str) -> List[int]:
+        """Create several users, checking uniqueness against a single scan of the users table
+        
+        The rows are inserted with one execute_batch call.
+        """
+        try:
+            exec_op = self.transaction_manager.execute_operation
+            now = self.transaction_manager.tx_now(thread_id)
+            existing_users = exec_op(
+                thread_id, 'SELECT', 'financial', 'users'
+            ) or []
+            
+            taken_usernames = {user['username'] for user in existing_users}
+            taken_emails = {user['email'] for user in existing_users}
+            
+            user_inserts = []
+            for user in users:
+                if user['username'] in taken_usernames or user['email'] in taken_emails:
+                    raise BusinessException("User with this username or email already exists")
+                taken_usernames.add(user['username'])
+                taken_emails.add(user['email'])
+                
+                user_data = {
+                    'username': user['username'],
+                    'email': user['email'],
+                    'password_hash': user['password_hash'],
+                    'created_at': now,
+                    'is_active': True
+                }
+                
+                user_inserts.append(('INSERT', 'financial', 'users', None, user_data))
+            
+            return self.transaction_manager.execute_batch(thread_id, user_inserts)
+            
+        except (BusinessException, TransactionException):
+            raise
+        except Exception as e:
+            raise BusinessException(f"Failed to create users: {str(e)}")
+    
     def get_user(self, user_id: int, thread_id: str) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
         try:
             return self.transaction_manager.execute_operation(
                 thread_id, 'SELECT', 'financial', 'users', record_id=user_id
             )
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to get user: {str(e)}")
     
@@ -62,6 +148,8 @@ class UserService:
             return self.transaction_manager.execute_operation(
                 thread_id, 'UPDATE', 'financial', 'users', record_id=user_id, data=updates
             )
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to update user: {str(e)}")
 
@@ -74,22 +162,23 @@ class AccountService:
     def create_account(self, user_id: int, account_type: str, initial_balance: Decimal, thread_id: str) -> int:
         """Create a new account"""
         try:
+            now = self.transaction_manager.tx_now(thread_id)
             # Verify user exists
             user = self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'financial', 'users', record_id=user_id
+                thread_id, 'SELECT', 'financial', 'users', record_id=user_id, readonly=True
             )
             
             if not user:
-                raise BusinessException("User does not exist")
+                raise NotFoundError("User does not exist")
             
-            account_number = f"ACC{user_id}{int(datetime.now().timestamp())}"
+            account_number = f"ACC{user_id}{int(now.timestamp())}"
             
             account_data = {
                 'user_id': user_id,
                 'account_number': account_number,
-                'balance': float(initial_balance),
+                'balance': initial_balance,
                 'account_type': account_type,
-                'created_at': datetime.now(),
+                'created_at': now,
                 'is_active': True
             }
             
@@ -99,39 +188,83 @@ class AccountService:
             
             return account_id
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to create account: {str(e)}")
     
-    def get_account(self, account_id: int, thread_id: str) -> Optional[Dict[str, Any]]:
-        """Get account by ID"""
+    def create_accounts_bulk(self, accounts: List[Dict[str, Any]], thread_id: str) -> List[int]:
+        """Create several accounts, verifying each owning user only once
+        
+        Every row shares the transaction's timestamp, so account numbers carry
+        the row's position in the batch to keep them distinct. The rows are
+        inserted with one execute_batch call.
+        """
+        try:
+            exec_op = self.transaction_manager.execute_operation
+            now = self.transaction_manager.tx_now(thread_id)
+            verified_users = set()
+            account_inserts = []
+            
+            for position, account in enumerate(accounts):
+                user_id = account['user_id']
+                
+                if user_id not in verified_users:
+                    user = exec_op(
+                        thread_id, 'SELECT', 'financial', 'users', record_id=user_id, readonly=True
+                    )
+                    if not user:
+                        raise NotFoundError("User does not exist")
+                    verified_users.add(user_id)
+                
+                account_data = {
+                    'user_id': user_id,
+                    'account_number': f"ACC{user_id}{int(now.timestamp())}-{position}",
+                    'balance': account['initial_balance'],
+                    'account_type': account['account_type'],
+                    'created_at': now,
+                    'is_active': True
+                }
+                
+                account_inserts.append(('INSERT', 'financial', 'accounts', None, account_data))
+            
+            return self.transaction_manager.execute_batch(thread_id, account_inserts)
+            
+        except (BusinessException, TransactionException):
+            raise
+        except Exception as e:
+            raise BusinessException(f"Failed to create accounts: {str(e)}")
+    
+    def get_account(self, account_id: int, thread_id: str, readonly: bool = False) -> Optional[Mapping[str, Any]]:
+        """Get account by ID (as a read-only view when readonly is set)"""
         try:
             return self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'financial', 'accounts', record_id=account_id
+                thread_id, 'SELECT', 'financial', 'accounts', record_id=account_id, readonly=readonly
             )
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to get account: {str(e)}")
     
     def get_user_accounts(self, user_id: int, thread_id: str) -> List[Dict[str, Any]]:
         """Get all accounts for a user"""
         try:
-            all_accounts = self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'financial', 'accounts'
-            )
-            
-            if not all_accounts:
-                return []
-            
-            return [account for account in all_accounts if account['user_id'] == user_id]
+            return self.transaction_manager.execute_operation(
+                thread_id, 'SELECT', 'financial', 'accounts', where={'user_id': user_id}
+            ) or []
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to get user accounts: {str(e)}")
 
 class TransactionService:
     """Transaction/Payment service"""
     
-    def __init__(self, transaction_manager: TransactionManager):
+    def __init__(self, transaction_manager: TransactionManager,
+                 account_service: Optional[AccountService] = None):
         self.transaction_manager = transaction_manager
-        self.account_service = AccountService(transaction_manager)
+        self.account_service = account_service or AccountService(transaction_manager)
     
     def transfer_money(self, from_account_id: int, to_account_id: int, 
                       amount: Decimal, description: str, thread_id: str) -> int:
@@ -140,78 +273,67 @@ class TransactionService:
             # This is our distributed transaction across multiple operations
             
             # 1. SELECT: Verify source account exists and has sufficient funds
-            from_account = self.account_service.get_account(from_account_id, thread_id)
+            from_account = self.account_service.get_account(from_account_id, thread_id, readonly=True)
             if not from_account:
-                raise BusinessException("Source account does not exist")
+                raise NotFoundError("Source account does not exist")
             
-            if Decimal(str(from_account['balance'])) < amount:
-                raise BusinessException("Insufficient funds")
+            if from_account['balance'] < amount:
+                raise InsufficientFundsError("Insufficient funds")
             
             # 2. SELECT: Verify destination account exists
-            to_account = self.account_service.get_account(to_account_id, thread_id)
+            to_account = self.account_service.get_account(to_account_id, thread_id, readonly=True)
             if not to_account:
-                raise BusinessException("Destination account does not exist")
+                raise NotFoundError("Destination account does not exist")
             
             # 3. UPDATE: Debit source account
-            new_from_balance = Decimal(str(from_account['balance'])) - amount
-            self.transaction_manager.execute_operation(
-                thread_id, 'UPDATE', 'financial', 'accounts', 
-                record_id=from_account_id,
-                data={'balance': float(new_from_balance)}
-            )
+            new_from_balance = from_account['balance'] - amount
             
             # 4. UPDATE: Credit destination account
-            new_to_balance = Decimal(str(to_account['balance'])) + amount
-            self.transaction_manager.execute_operation(
-                thread_id, 'UPDATE', 'financial', 'accounts',
-                record_id=to_account_id,
-                data={'balance': float(new_to_balance)}
-            )
+            new_to_balance = to_account['balance'] + amount
             
             # 5. INSERT: Record the transaction
             transaction_data = {
                 'from_account_id': from_account_id,
                 'to_account_id': to_account_id,
-                'amount': float(amount),
+                'amount': amount,
                 'transaction_type': 'transfer',
                 'description': description,
-                'timestamp': datetime.now(),
+                'timestamp': self.transaction_manager.tx_now(thread_id),
                 'status': 'completed'
             }
             
-            transaction_id = self.transaction_manager.execute_operation(
-                thread_id, 'INSERT', 'financial', 'transactions', data=transaction_data
-            )
+            results = self.transaction_manager.execute_batch(thread_id, [
+                ('UPDATE', 'financial', 'accounts', from_account_id, {'balance': new_from_balance}),
+                ('UPDATE', 'financial', 'accounts', to_account_id, {'balance': new_to_balance}),
+                ('INSERT', 'financial', 'transactions', None, transaction_data)
+            ])
             
-            return transaction_id
+            return results[2]
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to transfer money: {str(e)}")
     
     def deposit_money(self, account_id: int, amount: Decimal, description: str, thread_id: str) -> int:
         """Deposit money to an account"""
         try:
-            # 1. SELECT: Verify account exists
-            account = self.account_service.get_account(account_id, thread_id)
-            if not account:
-                raise BusinessException("Account does not exist")
-            
-            # 2. UPDATE: Credit account
-            new_balance = Decimal(str(account['balance'])) + amount
-            self.transaction_manager.execute_operation(
+            # 1. UPDATE: Credit account in place (also verifies the account exists)
+            if not self.transaction_manager.execute_operation(
                 thread_id, 'UPDATE', 'financial', 'accounts',
                 record_id=account_id,
-                data={'balance': float(new_balance)}
-            )
+                delta={'balance': amount}
+            ):
+                raise NotFoundError("Account does not exist")
             
-            # 3. INSERT: Record the transaction
+            # 2. INSERT: Record the transaction
             transaction_data = {
                 'from_account_id': None,
                 'to_account_id': account_id,
-                'amount': float(amount),
+                'amount': amount,
                 'transaction_type': 'deposit',
                 'description': description,
-                'timestamp': datetime.now(),
+                'timestamp': self.transaction_manager.tx_now(thread_id),
                 'status': 'completed'
             }
             
@@ -221,36 +343,38 @@ class TransactionService:
             
             return transaction_id
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to deposit money: {str(e)}")
     
     def withdraw_money(self, account_id: int, amount: Decimal, description: str, thread_id: str) -> int:
         """Withdraw money from an account"""
         try:
-            # 1. SELECT: Verify account exists and has sufficient funds
-            account = self.account_service.get_account(account_id, thread_id)
-            if not account:
-                raise BusinessException("Account does not exist")
-            
-            if Decimal(str(account['balance'])) < amount:
-                raise BusinessException("Insufficient funds")
-            
-            # 2. UPDATE: Debit account
-            new_balance = Decimal(str(account['balance'])) - amount
-            self.transaction_manager.execute_operation(
-                thread_id, 'UPDATE', 'financial', 'accounts',
-                record_id=account_id,
-                data={'balance': float(new_balance)}
-            )
+            # 1. UPDATE: Debit account in place; the storage engine checks the
+            # account exists and has sufficient funds under the same lock
+            try:
+                debited = self.transaction_manager.execute_operation(
+                    thread_id, 'UPDATE', 'financial', 'accounts',
+                    record_id=account_id,
+                    delta={'balance': -amount},
+                    minimums={'balance': 0}
+                )
+            except TransactionException as e:
+                if isinstance(e.__cause__, ConstraintViolation):
+                    raise InsufficientFundsError("Insufficient funds")
+                raise
+            if not debited:
+                raise NotFoundError("Account does not exist")
             
-            # 3. INSERT: Record the transaction
+            # 2. INSERT: Record the transaction
             transaction_data = {
                 'from_account_id': account_id,
                 'to_account_id': None,
-                'amount': float(amount),
+                'amount': amount,
                 'transaction_type': 'withdrawal',
                 'description': description,
-                'timestamp': datetime.now(),
+                'timestamp': self.transaction_manager.tx_now(thread_id),
                 'status': 'completed'
             }
             
@@ -260,6 +384,8 @@ class TransactionService:
             
             return transaction_id
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to withdraw money: {str(e)}")
 
@@ -268,6 +394,35 @@ class ProductService:
     
     def __init__(self, transaction_manager: TransactionManager):
         self.transaction_manager = transaction_manager
+        self._products_cache: Optional[Tuple[int, Dict[int, Mapping[str, Any]]]] = None  # (table version, id -> row)
+    
+    def get_products(self, product_ids: Sequence[int], thread_id: str) -> List[Mapping[str, Any]]:
+        """Get read-only views of several products (missing ones are left out)
+        
+        Rows read earlier are reused while the products table is unchanged;
+        only the others are fetched.
+        """
+        version = self.transaction_manager.database_manager.get_table_version('inventory', 'products')
+        cached = self._products_cache
+        if cached is None or cached[0] != version:
+            cached = self._products_cache = (version, {})
+        rows = cached[1]
+        
+        hits = []
+        misses = []
+        for product_id in dict.fromkeys(product_ids):
+            (hits if product_id in rows else misses).append(product_id)
+        
+        if hits:
+            # Served from the cache; the reads still enter the transaction's read set
+            self.transaction_manager.record_reads(thread_id, 'inventory', 'products', hits)
+        if misses:
+            for product in self.transaction_manager.execute_operation(
+                thread_id, 'SELECT', 'inventory', 'products', record_ids=misses, readonly=True
+            ):
+                rows[product['id']] = product
+        
+        return [rows[product_id] for product_id in product_ids if product_id in rows]
     
     def create_product(self, name: str, description: str, price: Decimal, 
                       stock_quantity: int, category_id: int, thread_id: str) -> int:
@@ -275,19 +430,19 @@ class ProductService:
         try:
             # Verify category exists
             category = self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'inventory', 'categories', record_id=category_id
+                thread_id, 'SELECT', 'inventory', 'categories', record_id=category_id, readonly=True
             )
             
             if not category:
-                raise BusinessException("Category does not exist")
+                raise NotFoundError("Category does not exist")
             
             product_data = {
                 'name': name,
                 'description': description,
-                'price': float(price),
+                'price': price,
                 'stock_quantity': stock_quantity,
                 'category_id': category_id,
-                'created_at': datetime.now(),
+                'created_at': self.transaction_manager.tx_now(thread_id),
                 'is_active': True
             }
             
@@ -297,23 +452,66 @@ class ProductService:
             
             return product_id
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to create product: {str(e)}")
     
+    def create_products_bulk(self, products: List[Dict[str, Any]], thread_id: str) -> List[int]:
+        """Create several products, verifying each category only once
+        
+        The rows are inserted with one execute_batch call.
+        """
+        try:
+            exec_op = self.transaction_manager.execute_operation
+            now = self.transaction_manager.tx_now(thread_id)
+            verified_categories = set()
+            product_inserts = []
+            
+            for product in products:
+                category_id = product['category_id']
+                
+                if category_id not in verified_categories:
+                    category = exec_op(
+                        thread_id, 'SELECT', 'inventory', 'categories', record_id=category_id, readonly=True
+                    )
+                    if not category:
+                        raise NotFoundError("Category does not exist")
+                    verified_categories.add(category_id)
+                
+                product_data = {
+                    'name': product['name'],
+                    'description': product['description'],
+                    'price': product['price'],
+                    'stock_quantity': product['stock_quantity'],
+                    'category_id': category_id,
+                    'created_at': now,
+                    'is_active': True
+                }
+                
+                product_inserts.append(('INSERT', 'inventory', 'products', None, product_data))
+            
+            return self.transaction_manager.execute_batch(thread_id, product_inserts)
+            
+        except (BusinessException, TransactionException):
+            raise
+        except Exception as e:
+            raise BusinessException(f"Failed to create products: {str(e)}")
+    
     def update_stock(self, product_id: int, quantity_change: int, thread_id: str) -> bool:
         """Update product stock quantity"""
         try:
             # 1. SELECT: Get current product
             product = self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'inventory', 'products', record_id=product_id
+                thread_id, 'SELECT', 'inventory', 'products', record_id=product_id, readonly=True
             )
             
             if not product:
-                raise BusinessException("Product does not exist")
+                raise NotFoundError("Product does not exist")
             
             new_quantity = product['stock_quantity'] + quantity_change
             if new_quantity < 0:
-                raise BusinessException("Insufficient stock")
+                raise InsufficientStockError("Insufficient stock")
             
             # 2. UPDATE: Update stock quantity
             return self.transaction_manager.execute_operation(
@@ -322,140 +520,152 @@ class ProductService:
                 data={'stock_quantity': new_quantity}
             )
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to update stock: {str(e)}")
 
 class OrderService:
     """Order management service"""
     
-    def __init__(self, transaction_manager: TransactionManager):
+    OBSERVABLE_PENDING = False  # insert orders as pending and confirm them in a separate UPDATE
+    
+    def __init__(self, transaction_manager: TransactionManager,
+                 product_service: Optional[ProductService] = None,
+                 transaction_service: Optional[TransactionService] = None):
         self.transaction_manager = transaction_manager
-        self.product_service = ProductService(transaction_manager)
-        self.transaction_service = TransactionService(transaction_manager)
+        self.product_service = product_service or ProductService(transaction_manager)
+        self.transaction_service = transaction_service or TransactionService(transaction_manager)
     
-    def create_order(self, user_id: int, items: List[Dict[str, Any]], 
+    def create_order(self, user_id: int, items: Sequence[Any], 
                     payment_account_id: int, thread_id: str) -> int:
-        """Create an order with payment (complex distributed transaction)"""
+        """Create an order with payment (complex distributed transaction)
+        
+        Items are OrderLine / (product_id, quantity) tuples or dicts with
+        'product_id' and 'quantity' keys.
+        """
         try:
             # This is our most complex distributed transaction involving both databases
             
+            exec_op = self.transaction_manager.execute_operation
+            now = self.transaction_manager.tx_now(thread_id)
             total_amount = Decimal('0')
             
-            # 1. SELECT: Verify user exists
-            user = self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'financial', 'users', record_id=user_id
-            )
+            lines = [
+                (item['product_id'], item['quantity']) if isinstance(item, dict) else tuple(item)
+                for item in items
+            ]
+            
+            # 1-3. SELECT: user, payment account and every ordered product
+            user = exec_op(thread_id, 'SELECT', 'financial', 'users', record_id=user_id, readonly=True)
             if not user:
-                raise BusinessException("User does not exist")
+                raise NotFoundError("User does not exist")
             
-            # 2. SELECT: Verify payment account exists and get balance
-            payment_account = self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'financial', 'accounts', record_id=payment_account_id
-            )
+            payment_account = exec_op(thread_id, 'SELECT', 'financial', 'accounts',
+                                      record_id=payment_account_id, readonly=True)
             if not payment_account:
-                raise BusinessException("Payment account does not exist")
+                raise NotFoundError("Payment account does not exist")
+            
+            # Validate items and calculate total
+            products = self.product_service.get_products([product_id for product_id, _ in lines], thread_id)
+            products_by_id = {product['id']: product for product in products}
             
-            # 3. Validate items and calculate total
             validated_items = []
-            for item in items:
-                product_id = item['product_id']
-                quantity = item['quantity']
-                
-                # SELECT: Get product details
-                product = self.transaction_manager.execute_operation(
-                    thread_id, 'SELECT', 'inventory', 'products', record_id=product_id
-                )
+            for product_id, quantity in lines:
+                product = products_by_id.get(product_id)
                 
                 if not product:
-                    raise BusinessException(f"Product {product_id} does not exist")
+                    raise NotFoundError(f"Product {product_id} does not exist")
                 
                 if product['stock_quantity'] < quantity:
-                    raise BusinessException(f"Insufficient stock for product {product['name']}")
+                    raise InsufficientStockError(f"Insufficient stock for product {product['name']}")
                 
-                unit_price = Decimal(str(product['price']))
+                unit_price = product['price']
                 item_total = unit_price * quantity
                 total_amount += item_total
                 
-                validated_items.append({
-                    'product_id': product_id,
-                    'quantity': quantity,
-                    'unit_price': unit_price,
-                    'total_price': item_total,
-                    'current_stock': product['stock_quantity']
-                })
+                validated_items.append(ValidatedItem(
+                    product_id=product_id,
+                    quantity=quantity,
+                    unit_price=unit_price,
+                    total_price=item_total,
+                    current_stock=product['stock_quantity']
+                ))
             
             # 4. Check if payment account has sufficient funds
-            if Decimal(str(payment_account['balance'])) < total_amount:
-                raise BusinessException("Insufficient funds for payment")
+            if payment_account['balance'] < total_amount:
+                raise InsufficientFundsError("Insufficient funds for payment")
+            
+            # 5. UPDATE: Reduce stock
+            stock_updates = [
+                ('UPDATE', 'inventory', 'products', item.product_id,
+                 {'stock_quantity': item.current_stock - item.quantity})
+                for item in validated_items
+            ]
+            self.transaction_manager.execute_batch(thread_id, stock_updates)
+            
+            # 6. UPDATE: Process payment (deduct from account)
+            new_balance = payment_account['balance'] - total_amount
+            exec_op(
+                thread_id, 'UPDATE', 'financial', 'accounts',
+                record_id=payment_account_id,
+                data={'balance': new_balance}
+            )
             
-            # 5. INSERT: Create order
+            # 7. INSERT: Create order; every check has passed by now, so it is
+            # written as confirmed unless the pending state must stay observable
             order_data = {
                 'user_id': user_id,
-                'total_amount': float(total_amount),
-                'status': 'pending',
-                'created_at': datetime.now(),
-                'updated_at': datetime.now()
+                'total_amount': total_amount,
+                'status': 'pending' if self.OBSERVABLE_PENDING else 'confirmed',
+                'created_at': now,
+                'updated_at': now
             }
             
-            order_id = self.transaction_manager.execute_operation(
+            order_id = exec_op(
                 thread_id, 'INSERT', 'inventory', 'orders', data=order_data
             )
             
-            # 6. INSERT: Create order items and UPDATE: Reduce stock
-            for item in validated_items:
-                # Insert order item
-                order_item_data = {
+            # 8. INSERT: Create order items
+            item_inserts = [
+                ('INSERT', 'inventory', 'order_items', None, {
                     'order_id': order_id,
-                    'product_id': item['product_id'],
-                    'quantity': item['quantity'],
-                    'unit_price': float(item['unit_price']),
-                    'total_price': float(item['total_price'])
-                }
-                
-                self.transaction_manager.execute_operation(
-                    thread_id, 'INSERT', 'inventory', 'order_items', data=order_item_data
-                )
-                
-                # Update product stock
-                new_stock = item['current_stock'] - item['quantity']
-                self.transaction_manager.execute_operation(
-                    thread_id, 'UPDATE', 'inventory', 'products',
-                    record_id=item['product_id'],
-                    data={'stock_quantity': new_stock}
-                )
-            
-            # 7. UPDATE: Process payment (deduct from account)
-            new_balance = Decimal(str(payment_account['balance'])) - total_amount
-            self.transaction_manager.execute_operation(
-                thread_id, 'UPDATE', 'financial', 'accounts',
-                record_id=payment_account_id,
-                data={'balance': float(new_balance)}
-            )
+                    'product_id': item.product_id,
+                    'quantity': item.quantity,
+                    'unit_price': item.unit_price,
+                    'total_price': item.total_price
+                })
+                for item in validated_items
+            ]
+            self.transaction_manager.execute_batch(thread_id, item_inserts)
             
-            # 8. INSERT: Record payment transaction
+            # 9. INSERT: Record payment transaction
             payment_data = {
                 'from_account_id': payment_account_id,
                 'to_account_id': None,
-                'amount': float(total_amount),
+                'amount': total_amount,
                 'transaction_type': 'payment',
                 'description': f'Payment for order {order_id}',
-                'timestamp': datetime.now(),
+                'timestamp': now,
                 'status': 'completed'
             }
             
-            self.transaction_manager.execute_operation(
+            exec_op(
                 thread_id, 'INSERT', 'financial', 'transactions', data=payment_data
             )
             
-            # 9. UPDATE: Confirm order
-            self.transaction_manager.execute_operation(
-                thread_id, 'UPDATE', 'inventory', 'orders',
-                record_id=order_id,
-                data={'status': 'confirmed', 'updated_at': datetime.now()}
-            )
+            if self.OBSERVABLE_PENDING:
+                # 10. UPDATE: Confirm order
+                exec_op(
+                    thread_id, 'UPDATE', 'inventory', 'orders',
+                    record_id=order_id,
+                    data={'status': 'confirmed', 'updated_at': now}
+                )
             
             return order_id
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to create order: {str(e)}")
 
@@ -464,6 +674,7 @@ class CategoryService:
     
     def __init__(self, transaction_manager: TransactionManager):
         self.transaction_manager = transaction_manager
+        self._categories_cache: Optional[Tuple[int, List[Dict[str, Any]]]] = None  # (table version, rows)
     
     def create_category(self, name: str, description: str, parent_id: Optional[int], thread_id: str) -> int:
         """Create a new category"""
@@ -471,10 +682,10 @@ class CategoryService:
             if parent_id is not None:
                 # Verify parent category exists
                 parent = self.transaction_manager.execute_operation(
-                    thread_id, 'SELECT', 'inventory', 'categories', record_id=parent_id
+                    thread_id, 'SELECT', 'inventory', 'categories', record_id=parent_id, readonly=True
                 )
                 if not parent:
-                    raise BusinessException("Parent category does not exist")
+                    raise NotFoundError("Parent category does not exist")
             
             category_data = {
                 'name': name,
@@ -488,34 +699,138 @@ class CategoryService:
             
             return category_id
             
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to create category: {str(e)}")
     
+    def create_categories_bulk(self, categories: List[Dict[str, Any]], thread_id: str) -> List[int]:
+        """Create several categories, verifying each parent category only once
+        
+        The rows are inserted with one execute_batch call.
+        """
+        try:
+            exec_op = self.transaction_manager.execute_operation
+            verified_parents = set()
+            category_inserts = []
+            
+            for category in categories:
+                parent_id = category.get('parent_id')
+                
+                if parent_id is not None and parent_id not in verified_parents:
+                    parent = exec_op(
+                        thread_id, 'SELECT', 'inventory', 'categories', record_id=parent_id, readonly=True
+                    )
+                    if not parent:
+                        raise NotFoundError("Parent category does not exist")
+                    verified_parents.add(parent_id)
+                
+                category_data = {
+                    'name': category['name'],
+                    'description': category['description'],
+                    'parent_id': parent_id
+                }
+                
+                category_inserts.append(('INSERT', 'inventory', 'categories', None, category_data))
+            
+            return self.transaction_manager.execute_batch(thread_id, category_inserts)
+            
+        except (BusinessException, TransactionException):
+            raise
+        except Exception as e:
+            raise BusinessException(f"Failed to create categories: {str(e)}")
+    
     def get_all_categories(self, thread_id: str) -> List[Dict[str, Any]]:
-        """Get all categories"""
+        """Get all categories, reusing the last result while the categories table is unchanged"""
         try:
-            return self.transaction_manager.execute_operation(
-                thread_id, 'SELECT', 'inventory', 'categories'
-            ) or []
+            version = self.transaction_manager.database_manager.get_table_version('inventory', 'categories')
+            cached = self._categories_cache
+            if cached is None or cached[0] != version:
+                rows = self.transaction_manager.execute_operation(
+                    thread_id, 'SELECT', 'inventory', 'categories'
+                ) or []
+                cached = self._categories_cache = (version, rows)
+            else:
+                # Served from the cache; the read still enters the transaction's read set
+                self.transaction_manager.record_reads(thread_id, 'inventory', 'categories')
+            return [dict(row) for row in cached[1]]
+        except (BusinessException, TransactionException):
+            raise
         except Exception as e:
             raise BusinessException(f"Failed to get categories: {str(e)}")
 
 class BusinessFacade:
     """Main business facade providing unified access to all services"""
     
-    def __init__(self, database_manager: DatabaseManager):
+    RETRY_BACKOFF_BASE = 0.05  # seconds; doubled on every retry
+    RETRY_BACKOFF_MAX = 0.5
+    
+    def __init__(self, database_manager: DatabaseManager, performance_monitor: Any = None):
+        """performance_monitor, if given, has record_restart() called on every retried restart"""
         self.transaction_manager = TransactionManager(database_manager)
+        self.performance_monitor = performance_monitor
         self.user_service = UserService(self.transaction_manager)
         self.account_service = AccountService(self.transaction_manager)
-        self.transaction_service = TransactionService(self.transaction_manager)
+        self.transaction_service = TransactionService(self.transaction_manager, self.account_service)
         self.product_service = ProductService(self.transaction_manager)
-        self.order_service = OrderService(self.transaction_manager)
+        self.order_service = OrderService(self.transaction_manager, self.product_service, self.transaction_service)
         self.category_service = CategoryService(self.transaction_manager)
     
+    def batch_create(self, operations: Sequence[Tuple[Callable, Sequence[Any]]], thread_id: str = None) -> List[Any]:
+        """Run a list of service calls inside a single transaction
+        
+        Each entry is a (service_method, args) pair; the thread_id is appended
+        to the arguments. BatchRef(i) arguments are replaced by the result of
+        the i-th operation. Returns the results in order.
+        """
+        def run_batch(batch_thread_id):
+            results = []
+            for method, args in operations:
+                resolved_args = [
+                    results[arg.index] if isinstance(arg, BatchRef) else arg
+                    for arg in args
+                ]
+                results.append(method(*resolved_args, batch_thread_id))
+            return results
+        
+        return self.execute_with_transaction(run_batch, thread_id)
+    
+    def execute_single(self, method: Callable, *args, thread_id: str = None) -> Any:
+        """Execute a single service call in its own transaction, passing thread_id as the last argument
+        
+        The first attempt is one begin, the call and a commit, with no closure
+        or retry loop. Only a restarted transaction falls back to
+        execute_with_transaction for the retries.
+        """
+        if thread_id is None:
+            thread_id = _get_tid()
+        
+        transaction_manager = self.transaction_manager
+        transaction_manager.begin_transaction(thread_id)
+        try:
+            result = method(*args, thread_id)
+            transaction_manager.commit_transaction(thread_id)
+            return result
+        except TransactionException as e:
+            transaction_manager.rollback_transaction(thread_id)
+            if "restarted" not in str(e):
+                raise BusinessException(f"Transaction failed: {str(e)}")
+            if self.performance_monitor is not None:
+                self.performance_monitor.record_restart()
+        except Exception as e:
+            transaction_manager.rollback_transaction(thread_id)
+            raise BusinessException(f"Operation failed: {str(e)}") from e
+        
+        return self.execute_with_transaction(partial(method, *args), thread_id)
+    
     def execute_with_transaction(self, operation: callable, thread_id: str = None, max_retries: int = 3) -> Any:
-        """Execute an operation within a transaction with automatic retry on restart"""
+        """Execute an operation within a transaction with automatic retry on restart
+        
+        Services let TransactionException through unwrapped, so a restart
+        raised anywhere in the operation is seen and retried here.
+        """
         if thread_id is None:
-            thread_id = str(threading.current_thread().ident)
+            thread_id = _get_tid()
         
         for attempt in range(max_retries):
             try:
@@ -532,7 +847,11 @@ class BusinessFacade:
                 
             except TransactionException as e:
                 if "restarted" in str(e) and attempt < max_retries - 1:
-                    # Transaction was restarted, retry
+                    # Transaction was restarted; back off exponentially with jitter before
+                    # retrying so conflicting transactions do not collide again immediately
+                    if self.performance_monitor is not None:
+                        self.performance_monitor.record_restart()
+                    time.sleep(min(self.RETRY_BACKOFF_BASE * (1 << attempt), self.RETRY_BACKOFF_MAX) * random.random())
                     continue
                 else:
                     # Final attempt or non-restart error
@@ -547,6 +866,6 @@ class BusinessFacade:
                     self.transaction_manager.rollback_transaction(thread_id)
                 except:
                     pass
-                raise BusinessException(f"Operation failed: {str(e)}")
+                raise BusinessException(f"Operation failed: {str(e)}") from e
         
         raise BusinessException(f"Transaction failed after {max_retries} attempts")
\ No newline at end of file
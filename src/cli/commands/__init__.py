@@ -0,0 +1 @@
+# Command modules loaded on demand by cli.interface.LazyGroup
@@ -0,0 +1,37 @@
+import click
+
+from cli.manager import get_cli_manager
+from cli.params import DECIMAL
+
+@click.command()
+@click.option('--user-id', type=int, help='User ID (default: current user)')
+@click.option('--account-type', type=click.Choice(['checking', 'savings']), prompt='Account type')
+@click.option('--initial-balance', type=DECIMAL, prompt='Initial balance')
+def create_account(user_id, account_type, initial_balance):
+    """Create a new account (Operation 2)"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    if user_id is None:
+        user_id = cli_mgr.current_user_id
+    
+    if user_id is None:
+        cli_mgr.print_error("No user specified and no current user set")
+        return
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.account_service.create_account(
+                user_id, account_type, initial_balance, thread_id
+            )
+        
+        account_id = cli_mgr.business_facade.execute_with_transaction(operation)
+        cli_mgr.print_success(f"Account created successfully with ID: {account_id}")
+        
+        # Ask if user wants to switch to this account
+        if click.confirm("Set this as current account?"):
+            cli_mgr.current_account_id = account_id
+            cli_mgr.print_info(f"Switched to account {account_id}")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to create account: {str(e)}")
@@ -0,0 +1,24 @@
+import click
+
+from cli.manager import get_cli_manager
+
+@click.command()
+@click.option('--name', prompt='Category name')
+@click.option('--description', prompt='Category description')
+@click.option('--parent-id', type=int, help='Parent category ID (optional)')
+def create_category(name, description, parent_id):
+    """Create a new product category (Operation 8)"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.category_service.create_category(
+                name, description, parent_id, thread_id
+            )
+        
+        category_id = cli_mgr.business_facade.execute_with_transaction(operation)
+        cli_mgr.print_success(f"Category created successfully with ID: {category_id}")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to create category: {str(e)}")
@@ -0,0 +1,55 @@
+import click
+
+from cli.manager import get_cli_manager
+from cli.params import ORDER_ITEMS
+
+@click.command()
+@click.option('--user-id', type=int, help='User ID (default: current user)')
+@click.option('--payment-account', type=int, help='Payment account ID (default: current account)')
+@click.option('--items', type=ORDER_ITEMS, help='Order lines as product_id:quantity,... (skips the item prompts)')
+def create_order(user_id, payment_account, items):
+    """Create an order with multiple items (Operation 7 - Most Complex Distributed Transaction)"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    if user_id is None:
+        user_id = cli_mgr.current_user_id
+    
+    if payment_account is None:
+        payment_account = cli_mgr.current_account_id
+    
+    if user_id is None or payment_account is None:
+        cli_mgr.print_error("User ID and payment account must be specified")
+        return
+    
+    # Collect order items interactively unless they were given with --items
+    if items is None:
+        items = []
+        while True:
+            click.echo(f"\nAdding item #{len(items) + 1}")
+            product_id = click.prompt("Product ID", type=int)
+            quantity = click.prompt("Quantity", type=int)
+            
+            items.append({
+                'product_id': product_id,
+                'quantity': quantity
+            })
+            
+            if not click.confirm("Add another item?"):
+                break
+    
+    if not items:
+        cli_mgr.print_warning("No items specified")
+        return
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.order_service.create_order(
+                user_id, items, payment_account, thread_id
+            )
+        
+        order_id = cli_mgr.business_facade.execute_with_transaction(operation)
+        cli_mgr.print_success(f"Order created successfully with ID: {order_id}")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to create order: {str(e)}")
@@ -0,0 +1,27 @@
+import click
+
+from cli.manager import get_cli_manager
+from cli.params import DECIMAL
+
+@click.command()
+@click.option('--name', prompt='Product name')
+@click.option('--description', prompt='Product description')
+@click.option('--price', type=DECIMAL, prompt='Product price')
+@click.option('--stock', type=int, prompt='Initial stock quantity')
+@click.option('--category-id', type=int, prompt='Category ID')
+def create_product(name, description, price, stock, category_id):
+    """Create a new product (Operation 6)"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.product_service.create_product(
+                name, description, price, stock, category_id, thread_id
+            )
+        
+        product_id = cli_mgr.business_facade.execute_with_transaction(operation)
+        cli_mgr.print_success(f"Product created successfully with ID: {product_id}")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to create product: {str(e)}")
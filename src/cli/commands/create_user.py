@@ -0,0 +1,30 @@
+import click
+
+from cli.manager import get_cli_manager
+
+@click.command()
+@click.option('--username', prompt='Username', help='Username for the new user')
+@click.option('--email', prompt='Email', help='Email address for the new user')
+@click.option('--password', prompt='Password', hide_input=True, help='Password for the new user')
+def create_user(username, email, password):
+    """Create a new user (Operation 1)"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.user_service.create_user(
+                username, email, f"hashed_{password}", thread_id
+            )
+        
+        user_id = cli_mgr.business_facade.execute_with_transaction(operation)
+        cli_mgr.print_success(f"User created successfully with ID: {user_id}")
+        
+        # Ask if user wants to switch to this user
+        if click.confirm("Switch to this user?"):
+            cli_mgr.current_user_id = user_id
+            cli_mgr.current_account_id = None
+            cli_mgr.print_info(f"Switched to user {user_id}")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to create user: {str(e)}")
@@ -0,0 +1,32 @@
+import click
+
+from cli.manager import get_cli_manager
+from cli.params import DECIMAL
+
+@click.command()
+@click.option('--account-id', type=int, help='Account ID (default: current account)')
+@click.option('--amount', type=DECIMAL, prompt='Deposit amount')
+@click.option('--description', prompt='Description', default='Deposit')
+def deposit_money(account_id, amount, description):
+    """Deposit money to an account (Operation 4)"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    if account_id is None:
+        account_id = cli_mgr.current_account_id
+    
+    if account_id is None:
+        cli_mgr.print_error("No account specified and no current account set")
+        return
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.transaction_service.deposit_money(
+                account_id, amount, description, thread_id
+            )
+        
+        transaction_id = cli_mgr.business_facade.execute_with_transaction(operation)
+        cli_mgr.print_success(f"Money deposited successfully. Transaction ID: {transaction_id}")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to deposit money: {str(e)}")
@@ -0,0 +1,45 @@
+import click
+
+from cli.manager import get_cli_manager
+
+@click.command()
+def status():
+    """Show system status and statistics"""
+    cli_mgr = get_cli_manager()
+    
+    try:
+        # Get transaction statistics
+        stats = cli_mgr.business_facade.transaction_manager.get_transaction_statistics()
+        
+        # Get database statistics
+        db_stats = cli_mgr.db_manager.get_all_statistics()
+        
+        # Assemble the whole report and write it with a single echo
+        lines = [
+            cli_mgr.format_info("=== SYSTEM STATUS ==="),
+            f"Current User ID: {cli_mgr.current_user_id}",
+            f"Current Account ID: {cli_mgr.current_account_id}",
+            "",
+            cli_mgr.format_info("=== TRANSACTION STATISTICS ==="),
+            f"Active Transactions: {stats['active_transactions']}",
+            f"Total Transactions: {stats['total_transactions']}",
+            f"Log Entries: {stats['log_entries']}",
+            f"Multiversion Resources: {stats['multiversion_resources']}",
+            f"Total Account Balance: ${cli_mgr.db_manager.sum_column('financial', 'accounts', 'balance'):.2f}",
+            "",
+            cli_mgr.format_info("=== DATABASE STATISTICS ===")
+        ]
+        for db_name, db_stat in db_stats.items():
+            lines.append(f"Database: {db_name}")
+            lines.append(f"  Total Operations: {db_stat['total_operations']}")
+            lines.append(f"  Tables: {len(db_stat['tables'])}")
+            lines.extend(
+                f"    {table_name}: {table_stat['record_count']} records"
+                for table_name, table_stat in db_stat['tables'].items()
+            )
+            lines.append("")
+        
+        click.echo("\n".join(lines))
+        
+    except Exception as e:
+        cli_mgr.print_error(f"Failed to get status: {str(e)}")
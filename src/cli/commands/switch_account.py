@@ -0,0 +1,11 @@
+import click
+
+from cli.manager import get_cli_manager
+
+@click.command()
+@click.option('--account-id', type=int, prompt='Account ID')
+def switch_account(account_id):
+    """Switch to a different account"""
+    cli_mgr = get_cli_manager()
+    cli_mgr.current_account_id = account_id
+    cli_mgr.print_success(f"Switched to account {account_id}")
@@ -0,0 +1,12 @@
+import click
+
+from cli.manager import get_cli_manager
+
+@click.command()
+@click.option('--user-id', type=int, prompt='User ID')
+def switch_user(user_id):
+    """Switch to a different user"""
+    cli_mgr = get_cli_manager()
+    cli_mgr.current_user_id = user_id
+    cli_mgr.current_account_id = None  # Reset account when switching users
+    cli_mgr.print_success(f"Switched to user {user_id}")
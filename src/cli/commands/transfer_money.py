@@ -0,0 +1,33 @@
+import click
+
+from cli.manager import get_cli_manager
+from cli.params import DECIMAL
+
+@click.command()
+@click.option('--from-account', type=int, help='Source account ID (default: current account)')
+@click.option('--to-account', type=int, prompt='Destination account ID')
+@click.option('--amount', type=DECIMAL, prompt='Transfer amount')
+@click.option('--description', prompt='Description', default='Transfer')
+def transfer_money(from_account, to_account, amount, description):
+    """Transfer money between accounts (Operation 3 - Complex Distributed Transaction)"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    if from_account is None:
+        from_account = cli_mgr.current_account_id
+    
+    if from_account is None:
+        cli_mgr.print_error("No source account specified and no current account set")
+        return
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.transaction_service.transfer_money(
+                from_account, to_account, amount, description, thread_id
+            )
+        
+        transaction_id = cli_mgr.business_facade.execute_with_transaction(operation)
+        cli_mgr.print_success(f"Money transferred successfully. Transaction ID: {transaction_id}")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to transfer money: {str(e)}")
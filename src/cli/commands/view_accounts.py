@@ -0,0 +1,34 @@
+import click
+
+from cli.manager import get_cli_manager
+
+ACCOUNT_COLUMNS = ('id', 'account_number', 'balance', 'account_type', 'is_active')
+
+@click.command()
+@click.option('--user-id', type=int, help='User ID (default: current user)')
+def view_accounts(user_id):
+    """View user accounts"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    if user_id is None:
+        user_id = cli_mgr.current_user_id
+    
+    if user_id is None:
+        cli_mgr.print_error("No user specified and no current user set")
+        return
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.account_service.get_user_accounts(user_id, thread_id)
+        
+        accounts = cli_mgr.business_facade.execute_with_transaction(operation)
+        
+        if accounts:
+            cli_mgr.print_info(f"Accounts for User {user_id}:")
+            cli_mgr.print_table(accounts, ACCOUNT_COLUMNS)
+        else:
+            cli_mgr.print_warning("No accounts found for this user")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to get accounts: {str(e)}")
@@ -0,0 +1,26 @@
+import click
+
+from cli.manager import get_cli_manager
+
+CATEGORY_COLUMNS = ('id', 'name', 'description', 'parent_id')
+
+@click.command()
+def view_categories():
+    """View all categories"""
+    from business.services import BusinessException
+    cli_mgr = get_cli_manager()
+    
+    try:
+        def operation(thread_id):
+            return cli_mgr.business_facade.category_service.get_all_categories(thread_id)
+        
+        categories = cli_mgr.business_facade.execute_with_transaction(operation)
+        
+        if categories:
+            cli_mgr.print_info("Product Categories:")
+            cli_mgr.print_table(categories, CATEGORY_COLUMNS)
+        else:
+            cli_mgr.print_warning("No categories found")
+        
+    except BusinessException as e:
+        cli_mgr.print_error(f"Failed to get categories: {str(e)}")
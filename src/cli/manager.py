@@ -0,0 +1,199 @@
+"""
+CLI manager shared by the command modules
+"""
+
+import click
+import sys
+import os
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Dict, Any, Sequence
+
+def _load_runtime():
+    """Import the transaction system and output helpers on first use
+    
+    --help and shell completion never reach a command body, so they skip
+    these imports along with database initialization and seeding.
+    """
+    from tabulate import tabulate
+    from business.services import BusinessFacade
+    from database.inmemory_db import DatabaseManager
+    from config import performance_monitor
+    
+    globals().update(
+        tabulate=tabulate,
+        BusinessFacade=BusinessFacade,
+        DatabaseManager=DatabaseManager,
+        performance_monitor=performance_monitor
+    )
+    _init_colors()
+
+# Message prefixes and the reset suffix, colored once stdout is known to be a terminal
+_PREFIXES = {'success': "SUCCESS: ", 'error': "ERROR: ", 'warning': "WARNING: ", 'info': "INFO: "}
+_RESET = ""
+
+def _init_colors():
+    """Precompute colored prefixes; colorama is skipped entirely for non-terminals"""
+    global _RESET
+    if not sys.stdout.isatty():
+        return
+    
+    from colorama import Fore, Style
+    
+    # Only Windows consoles need colorama's stream wrappers to understand ANSI codes
+    if sys.platform == 'win32':
+        from colorama import init
+        init()
+    
+    _PREFIXES.update(
+        success=f"{Fore.GREEN}SUCCESS: ",
+        error=f"{Fore.RED}ERROR: ",
+        warning=f"{Fore.YELLOW}WARNING: ",
+        info=f"{Fore.BLUE}INFO: "
+    )
+    _RESET = Style.RESET_ALL
+
+def _format_float(value: Any) -> Any:
+    """Render floats with two decimals in tables"""
+    return f"{value:.2f}" if isinstance(value, float) else value
+
+class CLIManager:
+    """CLI Manager to handle all command line operations
+    
+    Sample data is seeded unless MFPC_SEED is set to 0; the databases live in
+    memory, so commands that only create records can skip the seeding
+    transactions.
+    """
+    
+    def __init__(self, seed_sample_data: bool = None):
+        if seed_sample_data is None:
+            seed_sample_data = os.environ.get('MFPC_SEED', '1') != '0'
+        self.db_manager = DatabaseManager()
+        self.business_facade = None
+        self.current_user_id = None
+        self.current_account_id = None
+        self.seed_sample_data = seed_sample_data
+        self._initialize_system()
+    
+    def _initialize_system(self):
+        """Initialize the system databases and business layer"""
+        try:
+            # Initialize databases
+            self.db_manager.initialize_system_databases()
+            
+            # Initialize business layer
+            self.business_facade = BusinessFacade(self.db_manager, performance_monitor)
+            
+            # Create sample data
+            if self.seed_sample_data:
+                self._create_sample_data()
+            
+            self.print_success("System initialized successfully!")
+            
+        except Exception as e:
+            self.print_error(f"Failed to initialize system: {str(e)}")
+            sys.exit(1)
+    
+    def _create_sample_data(self):
+        """Create some sample data for testing, unless it is already there"""
+        if self.db_manager.get_table_version('inventory', 'categories'):
+            return
+        
+        try:
+            # Create categories, the demo user with accounts, and products in
+            # one distributed transaction
+            def seed(thread_id):
+                facade = self.business_facade
+                
+                cat1 = facade.category_service.create_category(
+                    "Electronics", "Electronic products", None, thread_id
+                )
+                cat2 = facade.category_service.create_category(
+                    "Books", "Books and literature", None, thread_id
+                )
+                cat3 = facade.category_service.create_category(
+                    "Smartphones", "Mobile phones and accessories", cat1, thread_id
+                )
+                
+                user_id = facade.user_service.create_user(
+                    "demo_user", "demo@example.com", "hashed_password", thread_id
+                )
+                
+                account1 = facade.account_service.create_account(
+                    user_id, "checking", Decimal("1000.00"), thread_id
+                )
+                
+                account2 = facade.account_service.create_account(
+                    user_id, "savings", Decimal("5000.00"), thread_id
+                )
+                
+                prod1 = facade.product_service.create_product(
+                    "iPhone 15", "Latest Apple smartphone", Decimal("999.99"), 50, cat3, thread_id
+                )
+                
+                prod2 = facade.product_service.create_product(
+                    "Python Programming Book", "Learn Python programming", Decimal("49.99"), 100, cat2, thread_id
+                )
+                
+                return [cat1, cat2, cat3], user_id, account1, account2, [prod1, prod2]
+            
+            categories, user_id, acc1, acc2, products = self.business_facade.execute_with_transaction(seed)
+            
+            # Set default user and account for demo
+            self.current_user_id = user_id
+            self.current_account_id = acc1
+            
+        except Exception as e:
+            self.print_warning(f"Failed to create sample data: {str(e)}")
+    
+    def print_success(self, message: str):
+        """Print success message in green"""
+        click.echo(f"{_PREFIXES['success']}{message}{_RESET}")
+    
+    def print_error(self, message: str):
+        """Print error message in red"""
+        click.echo(f"{_PREFIXES['error']}{message}{_RESET}")
+    
+    def print_warning(self, message: str):
+        """Print warning message in yellow"""
+        click.echo(f"{_PREFIXES['warning']}{message}{_RESET}")
+    
+    def format_info(self, message: str) -> str:
+        """Format an info message in blue"""
+        return f"{_PREFIXES['info']}{message}{_RESET}"
+    
+    def print_info(self, message: str):
+        """Print info message in blue"""
+        click.echo(self.format_info(message))
+    
+    def print_table(self, data: List[Dict[str, Any]], headers: Sequence[str] = None):
+        """Print data in table format; callers with fixed columns pass them as a tuple"""
+        if len(data) == 0:
+            self.print_warning("No data to display")
+            return
+        
+        if headers is None:
+            headers = tuple(data[0])
+        
+        # Rows of one table share their column types, so pick each column's
+        # formatter from the first row instead of type-checking every cell
+        first = data[0]
+        columns = [
+            (header, _format_float if isinstance(first.get(header), float) else None)
+            for header in headers
+        ]
+        table_data = [
+            [
+                item.get(header, "N/A") if fmt is None else fmt(item.get(header, "N/A"))
+                for header, fmt in columns
+            ]
+            for item in data
+        ]
+        
+        click.echo(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+@lru_cache(maxsize=None)
+def get_cli_manager() -> CLIManager:
+    """Create the CLI manager the first time a command needs it"""
+    _load_runtime()
+    return CLIManager()
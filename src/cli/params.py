@@ -0,0 +1,48 @@
+"""
+Click parameter types shared by the command modules
+"""
+
+import click
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+@lru_cache(maxsize=1024)
+def to_decimal(text: str) -> Decimal:
+    """Parse an amount straight into a Decimal, reusing repeated amounts"""
+    return Decimal(text.strip())
+
+class DecimalParamType(click.ParamType):
+    """Monetary amount parsed as a Decimal without going through float"""
+    
+    name = "decimal"
+    
+    def convert(self, value, param, ctx):
+        if isinstance(value, Decimal):
+            return value
+        try:
+            amount = to_decimal(str(value))
+        except InvalidOperation:
+            self.fail(f"{value!r} is not a valid amount", param, ctx)
+        if not amount.is_finite():
+            self.fail(f"{value!r} is not a valid amount", param, ctx)
+        return amount
+
+DECIMAL = DecimalParamType()
+
+class OrderItemsParamType(click.ParamType):
+    """Order lines given as "product_id:quantity,product_id:quantity,..." """
+    
+    name = "items"
+    
+    def convert(self, value, param, ctx):
+        if isinstance(value, list):
+            return value
+        try:
+            return [
+                {'product_id': int(product_id), 'quantity': int(quantity)}
+                for product_id, quantity in (token.split(':') for token in value.split(','))
+            ]
+        except ValueError:
+            self.fail(f"{value!r} is not a list of product_id:quantity pairs", param, ctx)
+
+ORDER_ITEMS = OrderItemsParamType()
@@ -2,30 +2,69 @@
 Configuration and utilities for the distributed transaction system
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Mapping, Sequence, Tuple
+from types import MappingProxyType
 import json
 import os
 from datetime import datetime
 from loguru import logger
 import sys
+import threading
+import weakref
 
-# Create logs directory if it doesn't exist
-os.makedirs("logs", exist_ok=True)
+_logging_configured = False
 
-# Configure loguru logger
-logger.remove()  # Remove default handler
-logger.add(
-    sys.stderr,
-    level="INFO",
-    format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-)
-logger.add(
-    "logs/transaction_system.log",
-    rotation="10 MB",
-    retention="7 days",
-    level="DEBUG",
-    format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
-)
+def setup_once(enqueue: bool = False):
+    """Configure the log sinks; calls after the first one are no-ops
+    
+    With enqueue=True records are handed to a background thread for
+    formatting and writing, and exception backtrace/diagnose output is
+    disabled, so logging calls return without blocking on I/O.
+    
+    The file sink, which takes every DEBUG record, logs the module name but
+    not the function and line, keeping per-record formatting short.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    
+    # Create logs directory if it doesn't exist
+    os.makedirs("logs", exist_ok=True)
+    
+    sink_options = {}
+    if enqueue:
+        sink_options = {'enqueue': True, 'backtrace': False, 'diagnose': False}
+    
+    # Configure loguru logger
+    logger.remove()  # Remove default handler
+    logger.add(
+        sys.stderr,
+        level="INFO",
+        format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        **sink_options
+    )
+    logger.add(
+        "logs/transaction_system.log",
+        rotation="10 MB",
+        retention="7 days",
+        level="DEBUG",
+        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name} - {message}",
+        **sink_options
+    )
+    
+    _logging_configured = True
+
+def _freeze_schemas(schemas: Mapping[str, Mapping[str, Sequence[str]]]) -> Mapping[str, Mapping[str, Tuple[str, ...]]]:
+    """Make table schemas read-only, with interned column names in tuples"""
+    return MappingProxyType({
+        db: MappingProxyType({table: tuple(sys.intern(column) for column in columns)
+                              for table, columns in tables.items()})
+        for db, tables in schemas.items()
+    })
+
+def _thaw_schemas(schemas: Mapping[str, Mapping[str, Sequence[str]]]) -> Dict[str, Dict[str, List[str]]]:
+    """Plain dict/list copy of the table schemas, for saving"""
+    return {db: {table: list(columns) for table, columns in tables.items()} for db, tables in schemas.items()}
 
 class SystemConfig:
     """System configuration settings"""
@@ -55,26 +94,31 @@ class SystemConfig:
             'order_items': ['id', 'order_id', 'product_id', 'quantity', 'unit_price', 'total_price']
         }
     }
+    TABLE_SCHEMAS = _freeze_schemas(TABLE_SCHEMAS)
     
     # CLI settings
     CLI_PROMPT_PREFIX = "DTS> "
     OUTPUT_FORMAT = "table"  # table, json, csv
     
+    # File key -> class attribute for the persisted settings
+    _FILE_FIELDS = {
+        'max_transaction_retries': 'MAX_TRANSACTION_RETRIES',
+        'transaction_timeout_seconds': 'TRANSACTION_TIMEOUT_SECONDS',
+        'deadlock_detection_interval': 'DEADLOCK_DETECTION_INTERVAL',
+        'timestamp_precision': 'TIMESTAMP_PRECISION',
+        'max_concurrent_transactions': 'MAX_CONCURRENT_TRANSACTIONS',
+        'multiversion_cleanup_threshold': 'MULTIVERSION_CLEANUP_THRESHOLD',
+        'default_databases': 'DEFAULT_DATABASES',
+        'table_schemas': 'TABLE_SCHEMAS',
+        'cli_prompt_prefix': 'CLI_PROMPT_PREFIX',
+        'output_format': 'OUTPUT_FORMAT'
+    }
+    
     @classmethod
     def save_to_file(cls, filename: str):
-        """Save configuration to file"""
-        config_data = {
-            'max_transaction_retries': cls.MAX_TRANSACTION_RETRIES,
-            'transaction_timeout_seconds': cls.TRANSACTION_TIMEOUT_SECONDS,
-            'deadlock_detection_interval': cls.DEADLOCK_DETECTION_INTERVAL,
-            'timestamp_precision': cls.TIMESTAMP_PRECISION,
-            'max_concurrent_transactions': cls.MAX_CONCURRENT_TRANSACTIONS,
-            'multiversion_cleanup_threshold': cls.MULTIVERSION_CLEANUP_THRESHOLD,
-            'default_databases': cls.DEFAULT_DATABASES,
-            'table_schemas': cls.TABLE_SCHEMAS,
-            'cli_prompt_prefix': cls.CLI_PROMPT_PREFIX,
-            'output_format': cls.OUTPUT_FORMAT
-        }
+        """Save configuration to file as JSON"""
+        config_data = {key: getattr(cls, attribute) for key, attribute in cls._FILE_FIELDS.items()}
+        config_data['table_schemas'] = _thaw_schemas(cls.TABLE_SCHEMAS)
         
         with open(filename, 'w') as f:
             json.dump(config_data, f, indent=2, default=str)
@@ -82,7 +126,7 @@ class SystemConfig:
     
     @classmethod
     def load_from_file(cls, filename: str):
-        """Load configuration from file"""
+        """Load configuration from a JSON file"""
         if not os.path.exists(filename):
             logger.warning(f"Configuration file {filename} not found, using defaults")
             return
@@ -90,92 +134,134 @@ class SystemConfig:
         with open(filename, 'r') as f:
             config_data = json.load(f)
         
-        cls.MAX_TRANSACTION_RETRIES = config_data.get('max_transaction_retries', cls.MAX_TRANSACTION_RETRIES)
-        cls.TRANSACTION_TIMEOUT_SECONDS = config_data.get('transaction_timeout_seconds', cls.TRANSACTION_TIMEOUT_SECONDS)
-        cls.DEADLOCK_DETECTION_INTERVAL = config_data.get('deadlock_detection_interval', cls.DEADLOCK_DETECTION_INTERVAL)
-        cls.TIMESTAMP_PRECISION = config_data.get('timestamp_precision', cls.TIMESTAMP_PRECISION)
-        cls.MAX_CONCURRENT_TRANSACTIONS = config_data.get('max_concurrent_transactions', cls.MAX_CONCURRENT_TRANSACTIONS)
-        cls.MULTIVERSION_CLEANUP_THRESHOLD = config_data.get('multiversion_cleanup_threshold', cls.MULTIVERSION_CLEANUP_THRESHOLD)
-        cls.DEFAULT_DATABASES = config_data.get('default_databases', cls.DEFAULT_DATABASES)
-        cls.TABLE_SCHEMAS = config_data.get('table_schemas', cls.TABLE_SCHEMAS)
-        cls.CLI_PROMPT_PREFIX = config_data.get('cli_prompt_prefix', cls.CLI_PROMPT_PREFIX)
-        cls.OUTPUT_FORMAT = config_data.get('output_format', cls.OUTPUT_FORMAT)
+        for key, attribute in cls._FILE_FIELDS.items():
+            if key in config_data:
+                setattr(cls, attribute, config_data[key])
+        cls.TABLE_SCHEMAS = _freeze_schemas(cls.TABLE_SCHEMAS)
         
         logger.info(f"Configuration loaded from {filename}")
 
+_COUNTERS = ('transaction_count', 'operation_count', 'rollback_count', 'restart_count',
+             'deadlock_count', 'successful_transactions', 'failed_transactions')
+
+class _CounterShard:
+    """One thread's share of the performance counters"""
+    
+    __slots__ = _COUNTERS + ('total_duration',)
+    
+    def __init__(self):
+        for counter in _COUNTERS:
+            setattr(self, counter, 0)
+        self.total_duration = 0.0
+
 class PerformanceMonitor:
-    """Performance monitoring utility"""
+    """Performance monitoring utility
+    
+    Log calls pass their values as arguments rather than pre-formatted
+    strings; loguru only formats a message once a sink accepts its level.
+    
+    Each thread increments its own counter shard, so recording never takes a
+    lock or races with other threads; get_metrics() adds the shards up. When a
+    thread goes away its counts are folded into a retired total and its shard
+    is dropped, so the shard list only holds live threads.
+    """
+    
+    __slots__ = ('_local', '_shards', '_shards_lock', '_retired')
+    
+    COUNTERS = _COUNTERS
     
     def __init__(self):
-        self.metrics = {
-            'transaction_count': 0,
-            'operation_count': 0,
-            'rollback_count': 0,
-            'restart_count': 0,
-            'deadlock_count': 0,
-            'avg_transaction_duration': 0.0,
-            'successful_transactions': 0,
-            'failed_transactions': 0
-        }
-        self.transaction_times = []
+        self._shards_lock = threading.Lock()
+        self._reset()
         logger.debug("Performance monitor initialized")
     
+    def _reset(self):
+        """Drop every shard; threads register fresh ones on their next record"""
+        with self._shards_lock:
+            self._local = threading.local()
+            self._shards: List[_CounterShard] = []
+            self._retired = _CounterShard()  # counts of threads that have exited
+    
+    def _shard(self) -> _CounterShard:
+        """Get the calling thread's shard, registering it on first use"""
+        local = self._local
+        try:
+            return local.shard
+        except AttributeError:
+            shard = local.shard = _CounterShard()
+            with self._shards_lock:
+                if local is self._local:
+                    self._shards.append(shard)
+            weakref.finalize(threading.current_thread(), self._retire, shard).atexit = False
+            return shard
+    
+    def _retire(self, shard: _CounterShard):
+        """Fold an exited thread's shard into the retired total and drop it"""
+        with self._shards_lock:
+            try:
+                self._shards.remove(shard)
+            except ValueError:
+                return  # registered before the last reset
+            retired = self._retired
+            for counter in _CounterShard.__slots__:
+                setattr(retired, counter, getattr(retired, counter) + getattr(shard, counter))
+    
+    def _total(self, counter: str) -> int:
+        """Sum one counter over all shards"""
+        with self._shards_lock:
+            return getattr(self._retired, counter) + sum(getattr(shard, counter) for shard in self._shards)
+    
     def record_transaction_start(self, transaction_id: str):
         """Record transaction start"""
-        self.metrics['transaction_count'] += 1
-        logger.debug(f"Transaction {transaction_id} started - total count: {self.metrics['transaction_count']}")
+        self._shard().transaction_count += 1
+        logger.opt(lazy=True).debug("Transaction {} started - total count: {}",
+                                    lambda: transaction_id, lambda: self._total('transaction_count'))
     
     def record_transaction_end(self, transaction_id: str, duration: float, success: bool):
         """Record transaction completion"""
-        self.transaction_times.append(duration)
+        shard = self._shard()
+        shard.total_duration += duration
         
         if success:
-            self.metrics['successful_transactions'] += 1
-            logger.debug(f"Transaction {transaction_id} completed successfully in {duration:.3f}s")
+            shard.successful_transactions += 1
+            logger.debug("Transaction {} completed successfully in {:.3f}s", transaction_id, duration)
         else:
-            self.metrics['failed_transactions'] += 1
-            logger.warning(f"Transaction {transaction_id} failed after {duration:.3f}s")
-        
-        # Update average duration
-        self.metrics['avg_transaction_duration'] = sum(self.transaction_times) / len(self.transaction_times)
+            shard.failed_transactions += 1
+            logger.warning("Transaction {} failed after {:.3f}s", transaction_id, duration)
     
     def record_operation(self):
-        """Record a database operation"""
-        self.metrics['operation_count'] += 1
+        """Record a database operation (called per operation, so never logged)"""
+        self._shard().operation_count += 1
     
     def record_rollback(self):
         """Record a transaction rollback"""
-        self.metrics['rollback_count'] += 1
-        logger.info(f"Rollback recorded - total count: {self.metrics['rollback_count']}")
+        self._shard().rollback_count += 1
+        logger.opt(lazy=True).info("Rollback recorded - total count: {}", lambda: self._total('rollback_count'))
     
     def record_restart(self):
         """Record a transaction restart"""
-        self.metrics['restart_count'] += 1
-        logger.info(f"Transaction restart recorded - total count: {self.metrics['restart_count']}")
+        self._shard().restart_count += 1
+        logger.opt(lazy=True).info("Transaction restart recorded - total count: {}", lambda: self._total('restart_count'))
     
     def record_deadlock(self):
         """Record a deadlock detection"""
-        self.metrics['deadlock_count'] += 1
-        logger.warning(f"Deadlock detected - total count: {self.metrics['deadlock_count']}")
+        self._shard().deadlock_count += 1
+        logger.opt(lazy=True).warning("Deadlock detected - total count: {}", lambda: self._total('deadlock_count'))
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current performance metrics"""
-        return self.metrics.copy()
+        with self._shards_lock:
+            shards = [self._retired, *self._shards]
+            metrics = {counter: sum(getattr(shard, counter) for shard in shards) for counter in self.COUNTERS}
+            total_duration = sum(shard.total_duration for shard in shards)
+        completed = metrics['successful_transactions'] + metrics['failed_transactions']
+        metrics['avg_transaction_duration'] = total_duration / completed if completed else 0.0
+        return metrics
     
     def reset_metrics(self):
         """Reset all metrics"""
         logger.info("Resetting performance metrics")
-        self.metrics = {
-            'transaction_count': 0,
-            'operation_count': 0,
-            'rollback_count': 0,
-            'restart_count': 0,
-            'deadlock_count': 0,
-            'avg_transaction_duration': 0.0,
-            'successful_transactions': 0,
-            'failed_transactions': 0
-        }
-        self.transaction_times = []
+        self._reset()
 
 # Global instances
 performance_monitor = PerformanceMonitor()
\ No newline at end of file
@@ -1,95 +1,353 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Tuple
-from threading import RLock
-import copy
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple, Mapping, Set, Deque
+from types import MappingProxyType
+from threading import Lock, RLock
+from collections import deque
+import operator
+import time
 from loguru import logger
 
 class DatabaseException(Exception):
     """Base exception for database operations"""
     pass
 
+class ConstraintViolation(DatabaseException):
+    """A write would break a constraint checked by the storage engine"""
+    pass
+
+def _clone_record(record: Optional[Mapping[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Copy a record for a caller
+    
+    Records are flat mappings of immutable values (numbers, strings, Decimal,
+    datetime), so a shallow dict copy is as safe as a deep copy.
+    """
+    return dict(record) if record is not None else None
+
+_COMPARISONS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
 class Table:
-    """In-memory table implementation"""
+    """In-memory table implementation
+    
+    Stored rows are replaced on update, never mutated in place, so point
+    reads can fetch them without taking the table lock. Full scans read a
+    copy-on-write snapshot of the row map that writers invalidate and the
+    next scan rebuilds.
+    """
     
     def __init__(self, name: str, primary_key: str = 'id'):
         self.name = name
         self.primary_key = primary_key
-        self.data: Dict[Any, Dict[str, Any]] = {}
+        self.data: Dict[int, Dict[str, Any]] = {}
         self.next_id = 1
-        self.lock = RLock()
-        self.indexes: Dict[str, Dict[Any, List[Any]]] = {}
+        self.lock = Lock()
+        self.indexes: Dict[str, Dict[Any, Dict[int, None]]] = {}  # field -> value -> ordered set of pks
+        self.indexed_fields: Set[str] = set()
+        self.version = 0  # bumped on every write so readers can detect changes cheaply
+        self._snapshot: Optional[Dict[int, Dict[str, Any]]] = None  # rebuilt lazily after writes
+        self._columns: Dict[str, Tuple[int, List[int], List[Any]]] = {}  # field -> (version, pks, values)
     
-    def insert(self, record: Dict[str, Any]) -> Any:
-        """Insert a record into the table"""
+    def create_index(self, field: str):
+        """Maintain a hash index on field, built from the existing rows"""
+        with self.lock:
+            if field in self.indexed_fields:
+                return
+            
+            self.indexed_fields.add(field)
+            field_index = self.indexes[field] = {}
+            for pk_value, record in self.data.items():
+                if field in record:
+                    field_index.setdefault(record[field], {})[pk_value] = None
+    
+    def insert(self, record: Dict[str, Any]) -> int:
+        """Insert a record into the table; primary keys are always ints"""
         with self.lock:
             if self.primary_key not in record:
                 record[self.primary_key] = self.next_id
                 self.next_id += 1
             
             pk_value = record[self.primary_key]
+            if type(pk_value) is not int:
+                raise DatabaseException(f"Primary key of table {self.name} must be an int, got {pk_value!r}")
             if pk_value in self.data:
                 raise DatabaseException(f"Primary key {pk_value} already exists in table {self.name}")
             
-            self.data[pk_value] = copy.deepcopy(record)
+            self.data[pk_value] = dict(record)
             self._update_indexes(record)
+            self._written()
             return pk_value
     
-    def select(self, primary_key: Any) -> Optional[Dict[str, Any]]:
-        """Select a record by primary key"""
-        with self.lock:
-            return copy.deepcopy(self.data.get(primary_key))
+    def select(self, primary_key: int, readonly: bool = False) -> Optional[Mapping[str, Any]]:
+        """Select a record by primary key
+        
+        With readonly=True the stored record is returned as a read-only view
+        instead of a copy; records are replaced, never mutated, on update.
+        """
+        record = self.data.get(primary_key)
+        if readonly:
+            return MappingProxyType(record) if record is not None else None
+        return _clone_record(record)
+    
+    def select_many(self, primary_keys: List[int], readonly: bool = False) -> List[Optional[Mapping[str, Any]]]:
+        """Select several records by primary key in one call (None for missing keys)"""
+        data = self.data
+        records = [data.get(pk) for pk in primary_keys]
+        if readonly:
+            return [MappingProxyType(r) if r is not None else None for r in records]
+        return [_clone_record(r) for r in records]
     
     def select_all(self, condition: Optional[callable] = None) -> List[Dict[str, Any]]:
         """Select all records, optionally filtered by condition"""
+        records = self._read_snapshot().values()
+        if condition:
+            return [dict(r) for r in records if condition(r)]
+        return [dict(r) for r in records]
+    
+    def select_all_where(self, column: str, op: str, value: Any, readonly: bool = False) -> List[Mapping[str, Any]]:
+        """Select records whose column compares to value with op ('==', '!=', '<', '<=', '>', '>=')
+        
+        Equality on an indexed column is answered from its hash index; other
+        comparisons scan the row snapshot with the C-level operator function
+        instead of a per-record Python condition. Rows missing the column
+        never match.
+        """
+        compare = _COMPARISONS.get(op)
+        if compare is None:
+            raise DatabaseException(f"Unsupported comparison: {op}")
+        
+        if op == '==' and column in self.indexed_fields:
+            return self.select_where({column: value}, readonly)
+        
+        records = self._read_snapshot().values()
+        matches = [r for r in records if column in r and compare(r[column], value)]
+        if readonly:
+            return [MappingProxyType(r) for r in matches]
+        return [dict(r) for r in matches]
+    
+    def column(self, field: str) -> Tuple[List[int], List[Any]]:
+        """Get parallel lists of primary keys and values for the rows that have field
+        
+        The projection is cached until the next write, so repeated scans and
+        aggregates over one column walk flat lists instead of row dicts.
+        """
+        version = self.version
+        cached = self._columns.get(field)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        
+        pks, values = [], []
+        for pk_value, record in self._read_snapshot().items():
+            if field in record:
+                pks.append(pk_value)
+                values.append(record[field])
+        self._columns[field] = (version, pks, values)
+        return pks, values
+    
+    def scan_sum(self, field: str, comparison: Optional[Tuple[str, str, Any]] = None) -> Any:
+        """Sum a numeric column, optionally over the rows matching (column, op, value)"""
+        pks, values = self.column(field)
+        if comparison is None:
+            return sum(values)
+        
+        column, op, value = comparison
+        compare = _COMPARISONS.get(op)
+        if compare is None:
+            raise DatabaseException(f"Unsupported comparison: {op}")
+        
+        if column == field:
+            return sum(v for v in values if compare(v, value))
+        mask_pks, mask_values = self.column(column)
+        selected = {pk for pk, v in zip(mask_pks, mask_values) if compare(v, value)}
+        return sum(v for pk, v in zip(pks, values) if pk in selected)
+    
+    def _read_snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """Get the current row map snapshot, rebuilding it if a write invalidated it"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self.lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = self.data.copy()
+        return snapshot
+    
+    def _written(self):
+        """Note a completed write (called with the lock held)
+        
+        The snapshot is dropped before the version moves, so a reader that
+        sees the new version never pairs it with the old snapshot.
+        """
+        self._snapshot = None
+        self.version += 1
+    
+    def select_where(self, where: Dict[str, Any], readonly: bool = False) -> List[Mapping[str, Any]]:
+        """Select records whose fields equal all the given values
+        
+        Indexed fields are resolved through their hash indexes; any other
+        fields are checked against the remaining candidate rows. A single
+        unindexed field is matched by a lock-free scan of the row snapshot.
+        """
+        if not where:
+            return self.select_all()
+        if len(where) == 1:
+            (field, value), = where.items()
+            if field not in self.indexed_fields:
+                return self.select_all_where(field, '==', value, readonly)
+        
         with self.lock:
-            records = list(self.data.values())
-            if condition:
-                records = [r for r in records if condition(r)]
-            return copy.deepcopy(records)
+            postings = []
+            unindexed = []
+            for field, value in where.items():
+                if field in self.indexed_fields:
+                    posting = self.indexes[field].get(value)
+                    if not posting:
+                        return []
+                    postings.append(posting)
+                else:
+                    unindexed.append((field, value))
+            
+            if postings:
+                # Walk the shortest posting list and probe the others
+                postings.sort(key=len)
+                shortest, others = postings[0], postings[1:]
+                matches = [pk for pk in shortest if all(pk in posting for posting in others)]
+            else:
+                matches = list(self.data)
+            
+            if unindexed:
+                data = self.data
+                matches = [
+                    pk for pk in matches
+                    if all(field in data[pk] and data[pk][field] == value for field, value in unindexed)
+                ]
+            
+            if readonly:
+                return [MappingProxyType(self.data[pk]) for pk in matches]
+            return [dict(self.data[pk]) for pk in matches]
     
-    def update(self, primary_key: Any, updates: Dict[str, Any]) -> bool:
+    def update(self, primary_key: int, updates: Dict[str, Any]) -> bool:
         """Update a record by primary key"""
         with self.lock:
             if primary_key not in self.data:
                 return False
             
-            old_record = self.data[primary_key]
-            updated_record = {**old_record, **updates}
+            self._apply_update(primary_key, updates)
+            return True
+    
+    def _apply_update(self, primary_key: int, updates: Dict[str, Any]):
+        """Replace an existing record with an updated copy (called with the lock held)
+        
+        The row is copied rather than updated in place because read-only views,
+        read caches and scan snapshots share the stored dict.
+        """
+        old_record = self.data[primary_key]
+        updated_record = old_record.copy()
+        updated_record.update(updates)
+        if self.primary_key in updates:
             updated_record[self.primary_key] = primary_key  # Ensure PK doesn't change
+        
+        self._reindex(primary_key, old_record, updated_record)
+        self.data[primary_key] = updated_record
+        self._written()
+    
+    def update_delta(self, primary_key: int, deltas: Dict[str, Any],
+                     minimums: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Add deltas to numeric fields of a record atomically
+        
+        Fields listed in minimums must not end up below the given value; the
+        record is left untouched and ConstraintViolation is raised otherwise.
+        Returns the new values of the changed fields, or None if the record
+        does not exist.
+        """
+        with self.lock:
+            if primary_key not in self.data:
+                return None
             
-            self.data[primary_key] = updated_record
-            self._update_indexes(updated_record)
-            return True
+            old_record = self.data[primary_key]
+            new_values = {field: old_record[field] + delta for field, delta in deltas.items()}
+            
+            for field, minimum in (minimums or {}).items():
+                if field in new_values and new_values[field] < minimum:
+                    raise ConstraintViolation(f"{self.name}.{field} would drop below {minimum}")
+            
+            self._apply_update(primary_key, new_values)
+            return new_values
+    
+    def current_version(self, primary_key: int) -> Optional[Dict[str, Any]]:
+        """Get the stored row itself (not a copy) to restore later with restore_version
+        
+        Rows are replaced rather than mutated on update, so the returned dict
+        stays a faithful pre-image; callers must not modify it.
+        """
+        return self.data.get(primary_key)
+    
+    def restore_version(self, primary_key: int, record: Dict[str, Any]):
+        """Put a row obtained from current_version back in place"""
+        with self.lock:
+            old_record = self.data.get(primary_key)
+            if old_record is None:
+                self._update_indexes(record)
+            else:
+                self._reindex(primary_key, old_record, record)
+            self.data[primary_key] = record
+            self._written()
     
-    def delete(self, primary_key: Any) -> bool:
+    def delete(self, primary_key: int) -> bool:
         """Delete a record by primary key"""
         with self.lock:
             if primary_key not in self.data:
                 return False
             
-            del self.data[primary_key]
-            self._remove_from_indexes(primary_key)
+            self._remove_from_indexes(self.data.pop(primary_key))
+            self._written()
             return True
     
     def _update_indexes(self, record: Dict[str, Any]):
-        """Update indexes for the record"""
-        for field, value in record.items():
-            if field not in self.indexes:
-                self.indexes[field] = {}
-            if value not in self.indexes[field]:
-                self.indexes[field][value] = []
-            
-            pk_value = record[self.primary_key]
-            if pk_value not in self.indexes[field][value]:
-                self.indexes[field][value].append(pk_value)
-    
-    def _remove_from_indexes(self, primary_key: Any):
-        """Remove record from all indexes"""
-        for field_indexes in self.indexes.values():
-            for value_list in field_indexes.values():
-                if primary_key in value_list:
-                    value_list.remove(primary_key)
+        """Add the record to the indexes of its indexed fields"""
+        pk_value = record[self.primary_key]
+        for field in self.indexed_fields:
+            if field not in record:
+                continue
+            field_index = self.indexes[field]
+            value = record[field]
+            posting = field_index.get(value)
+            if posting is None:
+                posting = field_index[value] = {}
+            posting[pk_value] = None
+    
+    def _remove_from_indexes(self, record: Dict[str, Any]):
+        """Remove record from the index entries of its current field values"""
+        pk_value = record[self.primary_key]
+        for field in self.indexed_fields:
+            if field in record:
+                self._unindex(field, record[field], pk_value)
+    
+    def _unindex(self, field: str, value: Any, pk_value: int):
+        """Remove one primary key from a posting list"""
+        field_index = self.indexes[field]
+        posting = field_index.get(value)
+        if posting is not None:
+            posting.pop(pk_value, None)
+            if not posting:
+                del field_index[value]
+    
+    def _reindex(self, pk_value: int, old_record: Dict[str, Any], new_record: Dict[str, Any]):
+        """Move a record between posting lists for the indexed fields whose value changed"""
+        for field in self.indexed_fields:
+            in_old, in_new = field in old_record, field in new_record
+            if in_old and in_new and old_record[field] == new_record[field]:
+                continue
+            if in_old:
+                self._unindex(field, old_record[field], pk_value)
+            if in_new:
+                self.indexes[field].setdefault(new_record[field], {})[pk_value] = None
+
+TRANSACTION_LOG_SIZE = 100_000  # most recent operations kept per database
 
 class InMemoryDatabase:
     """In-memory database implementation"""
@@ -97,16 +355,19 @@ class InMemoryDatabase:
     def __init__(self, name: str):
         self.name = name
         self.tables: Dict[str, Table] = {}
-        self.lock = RLock()
-        self.transaction_log: List[Dict[str, Any]] = []
+        self.lock = RLock()  # re-entrant: TransactionManager.execute_batch holds it across execute_sql calls
+        self.transaction_log: Deque[Dict[str, Any]] = deque(maxlen=TRANSACTION_LOG_SIZE)
+        self.operation_count = 0  # the log is bounded, so totals are counted separately
     
-    def create_table(self, table_name: str, primary_key: str = 'id') -> Table:
-        """Create a new table"""
+    def create_table(self, table_name: str, primary_key: str = 'id', indexes: Tuple[str, ...] = ()) -> Table:
+        """Create a new table with hash indexes on the given fields"""
         with self.lock:
             if table_name in self.tables:
                 raise DatabaseException(f"Table {table_name} already exists")
             
             table = Table(table_name, primary_key)
+            for field in indexes:
+                table.create_index(field)
             self.tables[table_name] = table
             return table
     
@@ -120,30 +381,60 @@ class InMemoryDatabase:
     def execute_sql(self, operation: str, table_name: str, **kwargs) -> Any:
         """Execute a SQL-like operation"""
         with self.lock:
-            table = self.get_table(table_name)
+            table = self.tables.get(table_name)
+            if table is None:
+                raise DatabaseException(f"Table {table_name} does not exist")
             
             # Log operation for transaction management
             log_entry = {
-                'timestamp': datetime.now(),
+                'timestamp': time.monotonic_ns(),
                 'operation': operation,
                 'table': table_name,
                 'params': kwargs
             }
             self.transaction_log.append(log_entry)
+            self.operation_count += 1
             
-            if operation.upper() == 'INSERT':
-                return table.insert(kwargs.get('record', {}))
-            elif operation.upper() == 'SELECT':
-                if 'primary_key' in kwargs:
-                    return table.select(kwargs['primary_key'])
-                else:
-                    return table.select_all(kwargs.get('condition'))
-            elif operation.upper() == 'UPDATE':
-                return table.update(kwargs['primary_key'], kwargs['updates'])
-            elif operation.upper() == 'DELETE':
-                return table.delete(kwargs['primary_key'])
-            else:
+            handler = self._DISPATCH.get(operation) or self._DISPATCH.get(operation.upper())
+            if handler is None:
                 raise DatabaseException(f"Unsupported operation: {operation}")
+            return handler(table, kwargs)
+    
+    @staticmethod
+    def _sql_insert(table: Table, kwargs: Dict[str, Any]) -> Any:
+        return table.insert(kwargs.get('record', {}))
+    
+    @staticmethod
+    def _sql_select(table: Table, kwargs: Dict[str, Any]) -> Any:
+        if 'primary_key' in kwargs:
+            return table.select(kwargs['primary_key'], kwargs.get('readonly', False))
+        elif 'primary_keys' in kwargs:
+            return table.select_many(kwargs['primary_keys'], kwargs.get('readonly', False))
+        elif 'comparison' in kwargs:
+            column, op, value = kwargs['comparison']
+            return table.select_all_where(column, op, value, kwargs.get('readonly', False))
+        elif kwargs.get('where'):
+            return table.select_where(kwargs['where'], kwargs.get('readonly', False))
+        else:
+            return table.select_all(kwargs.get('condition'))
+    
+    @staticmethod
+    def _sql_update(table: Table, kwargs: Dict[str, Any]) -> Any:
+        if 'delta' in kwargs:
+            return table.update_delta(kwargs['primary_key'], kwargs['delta'], kwargs.get('minimums'))
+        return table.update(kwargs['primary_key'], kwargs['updates'])
+    
+    @staticmethod
+    def _sql_delete(table: Table, kwargs: Dict[str, Any]) -> Any:
+        return table.delete(kwargs['primary_key'])
+    
+    # Operation name -> handler; upper-case names resolve without allocating a new string
+    _DISPATCH = {
+        'INSERT': _sql_insert.__func__,
+        'SELECT': _sql_select.__func__,
+        'UPDATE': _sql_update.__func__,
+        'DELETE': _sql_delete.__func__,
+    }
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
@@ -151,7 +442,7 @@ class InMemoryDatabase:
             stats = {
                 'name': self.name,
                 'tables': {},
-                'total_operations': len(self.transaction_log)
+                'total_operations': self.operation_count
             }
             
             for table_name, table in self.tables.items():
@@ -167,17 +458,21 @@ class DatabaseManager:
     
     def __init__(self):
         self.databases: Dict[str, InMemoryDatabase] = {}
-        self.lock = RLock()
+        self.lock = Lock()
     
     def create_database(self, db_name: str) -> InMemoryDatabase:
         """Create a new database"""
         with self.lock:
-            if db_name in self.databases:
-                raise DatabaseException(f"Database {db_name} already exists")
-            
-            db = InMemoryDatabase(db_name)
-            self.databases[db_name] = db
-            return db
+            return self._create_database(db_name)
+    
+    def _create_database(self, db_name: str) -> InMemoryDatabase:
+        """Create a new database (called with the lock held)"""
+        if db_name in self.databases:
+            raise DatabaseException(f"Database {db_name} already exists")
+        
+        db = InMemoryDatabase(db_name)
+        self.databases[db_name] = db
+        return db
     
     def get_database(self, db_name: str) -> InMemoryDatabase:
         """Get a database by name"""
@@ -186,20 +481,37 @@ class DatabaseManager:
                 raise DatabaseException(f"Database {db_name} does not exist")
             return self.databases[db_name]
     
+    def get_table_version(self, db_name: str, table_name: str) -> int:
+        """Get the write counter of a table"""
+        return self.get_database(db_name).get_table(table_name).version
+    
+    def sum_column(self, db_name: str, table_name: str, field: str,
+                   comparison: Optional[Tuple[str, str, Any]] = None) -> Any:
+        """Sum a table column outside any transaction (see Table.scan_sum)"""
+        return self.get_database(db_name).get_table(table_name).scan_sum(field, comparison)
+    
+    def get_all_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for every database as a single snapshot"""
+        with self.lock:
+            return {
+                db_name: db.get_statistics()
+                for db_name, db in self.databases.items()
+            }
+    
     def initialize_system_databases(self):
         """Initialize the two system databases with required tables"""
         with self.lock:
             logger.info("Initializing system databases")
             
             # Database 1: Financial System
-            financial_db = self.create_database('financial')
-            financial_db.create_table('users')
-            financial_db.create_table('accounts') 
+            financial_db = self._create_database('financial')
+            financial_db.create_table('users', indexes=('username', 'email'))
+            financial_db.create_table('accounts', indexes=('user_id',))
             financial_db.create_table('transactions')
             logger.debug("Financial database initialized with tables: users, accounts, transactions")
             
             # Database 2: Inventory/Order System
-            inventory_db = self.create_database('inventory')
+            inventory_db = self._create_database('inventory')
             inventory_db.create_table('categories')
             inventory_db.create_table('products')
             inventory_db.create_table('orders')
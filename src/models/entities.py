@@ -1,10 +1,21 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 from datetime import datetime
 from decimal import Decimal
 
-@dataclass
-class User:
+class _CachedDict:
+    """Entities are frozen, so their dict form is built once and copied out on each call"""
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        cached = self._dict_cache
+        if cached is None:
+            cached = self._build_dict()
+            object.__setattr__(self, '_dict_cache', cached)
+        return dict(cached)
+
+@dataclass(frozen=True, slots=True)
+class User(_CachedDict):
     """User entity for the system"""
     id: int
     username: str
@@ -12,8 +23,9 @@ class User:
     password_hash: str
     created_at: datetime
     is_active: bool = True
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'id': self.id,
             'username': self.username,
@@ -23,8 +35,8 @@ class User:
             'is_active': self.is_active
         }
 
-@dataclass 
-class Account:
+@dataclass(frozen=True, slots=True)
+class Account(_CachedDict):
     """Bank account entity"""
     id: int
     user_id: int
@@ -33,8 +45,9 @@ class Account:
     account_type: str  # 'checking', 'savings'
     created_at: datetime
     is_active: bool = True
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -45,8 +58,8 @@ class Account:
             'is_active': self.is_active
         }
 
-@dataclass
-class Transaction:
+@dataclass(frozen=True, slots=True)
+class Transaction(_CachedDict):
     """Transaction record entity"""
     id: int
     from_account_id: Optional[int]
@@ -56,8 +69,9 @@ class Transaction:
     description: str
     timestamp: datetime
     status: str = 'pending'  # 'pending', 'completed', 'failed'
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'id': self.id,
             'from_account_id': self.from_account_id,
@@ -69,8 +83,8 @@ class Transaction:
             'status': self.status
         }
 
-@dataclass
-class Product:
+@dataclass(frozen=True, slots=True)
+class Product(_CachedDict):
     """Product entity for inventory system"""
     id: int
     name: str
@@ -80,8 +94,9 @@ class Product:
     category_id: int
     created_at: datetime
     is_active: bool = True
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'id': self.id,
             'name': self.name,
@@ -93,15 +108,16 @@ class Product:
             'is_active': self.is_active
         }
 
-@dataclass
-class Category:
+@dataclass(frozen=True, slots=True)
+class Category(_CachedDict):
     """Product category entity"""
     id: int
     name: str
     description: str
     parent_id: Optional[int] = None
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'id': self.id,
             'name': self.name,
@@ -109,8 +125,8 @@ class Category:
             'parent_id': self.parent_id
         }
 
-@dataclass
-class Order:
+@dataclass(frozen=True, slots=True)
+class Order(_CachedDict):
     """Order entity"""
     id: int
     user_id: int
@@ -118,8 +134,9 @@ class Order:
     status: str  # 'pending', 'confirmed', 'shipped', 'delivered', 'cancelled'
     created_at: datetime
     updated_at: datetime
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -129,8 +146,8 @@ class Order:
             'updated_at': self.updated_at
         }
 
-@dataclass
-class OrderItem:
+@dataclass(frozen=True, slots=True)
+class OrderItem(_CachedDict):
     """Order item entity"""
     id: int
     order_id: int
@@ -138,8 +155,9 @@ class OrderItem:
     quantity: int
     unit_price: Decimal
     total_price: Decimal
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             'id': self.id,
             'order_id': self.order_id,
@@ -1,11 +1,18 @@
 from enum import Enum
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
-from threading import Lock, RLock
-import time
-import uuid
+from decimal import Decimal
 import copy
+import threading
+import contextlib
+import itertools
+import heapq
+from bisect import bisect_right
+
+# Resources are keyed by (database, table, record_id) tuples, which hash in C
+# without building a string per access
+ResourceId = Tuple[str, str, Any]
 
 class TransactionStatus(Enum):
     ACTIVE = "active"
@@ -17,30 +24,30 @@ class LockType(Enum):
     SHARED = "shared"
     EXCLUSIVE = "exclusive"
 
-@dataclass
+@dataclass(slots=True)
 class TimestampInfo:
     """Timestamp information for multiversion concurrency control"""
-    read_timestamp: float
-    write_timestamp: float
-    commit_timestamp: Optional[float] = None
+    read_timestamp: int
+    write_timestamp: int
+    commit_timestamp: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class DataVersion:
     """Data version for multiversion storage"""
     value: Any
-    timestamp: float
-    transaction_id: str
+    timestamp: int
+    transaction_id: int
     committed: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class Lock:
     """Lock information"""
-    transaction_id: str
+    transaction_id: int
     lock_type: LockType
-    resource_id: str
+    resource_id: ResourceId
     acquired_at: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Operation:
     """Database operation in a transaction"""
     operation_id: str
@@ -49,19 +56,22 @@ class Operation:
     table_name: str
     record_id: Any
     data: Dict[str, Any] = field(default_factory=dict)
-    timestamp: float = field(default_factory=time.time)
+    timestamp: int = 0  # owning transaction's start timestamp plus the operation's sequence number
+    resource_id: Optional[ResourceId] = None
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """Transaction object"""
-    transaction_id: str
-    start_timestamp: float
+    transaction_id: int
+    start_timestamp: int
     status: TransactionStatus = TransactionStatus.ACTIVE
     operations: List[Operation] = field(default_factory=list)
-    read_set: Set[Tuple[str, str, Any]] = field(default_factory=set)  # (db, table, record_id)
-    write_set: Set[Tuple[str, str, Any]] = field(default_factory=set)
-    locks_held: Set[str] = field(default_factory=set)  # resource_ids
-    commit_timestamp: Optional[float] = None
+    read_set: Set[ResourceId] = field(default_factory=set)
+    write_set: Set[ResourceId] = field(default_factory=set)
+    locks_held: Set[ResourceId] = field(default_factory=set)
+    commit_timestamp: Optional[int] = None
+    read_cache: Dict[ResourceId, Dict[str, Any]] = field(default_factory=dict)  # resource -> row
+    started_at: Optional[datetime] = None  # wall-clock time shared by every row the transaction writes, read on first use
     
 class TransactionException(Exception):
     """Transaction-related exceptions"""
@@ -71,53 +81,88 @@ class DeadlockException(TransactionException):
     """Deadlock detected exception"""
     pass
 
+# Values of these types can be stored and handed out without copying
+_IMMUTABLE = (int, float, str, bytes, bool, type(None), Decimal, datetime, tuple, frozenset)
+
+def _clone_value(value: Any) -> Any:
+    """Copy a stored version value
+    
+    Immutable values are shared as-is and row dicts hold only immutable values,
+    so a shallow copy suffices for them; anything else is deep-copied.
+    """
+    if isinstance(value, _IMMUTABLE):
+        return value
+    if isinstance(value, dict):
+        return dict(value)
+    return copy.deepcopy(value)
+
+_NO_LOCK = contextlib.nullcontext()
+
+LOCK_SHARDS = 64  # must be a power of two
+LOCK_SHARD_MASK = LOCK_SHARDS - 1
+
+def _lock_shards() -> List[threading.Lock]:
+    """Create a set of locks to be picked by resource id hash"""
+    return [threading.Lock() for _ in range(LOCK_SHARDS)]
+
 class MultiversionStorage:
-    """Multiversion storage for timestamps-based concurrency control"""
+    """Multiversion storage for timestamps-based concurrency control
+    
+    Each resource's versions are kept sorted by timestamp, with a parallel
+    list of the timestamps, so a read bisects to its position instead of
+    scanning the whole chain. Chains are guarded by lock shards picked by
+    resource id, so threads working on different resources do not contend.
+    """
     
     def __init__(self):
-        self.versions: Dict[str, List[DataVersion]] = {}  # resource_id -> versions
-        self.lock = RLock()
+        self.versions: Dict[ResourceId, List[DataVersion]] = {}  # resource_id -> versions, oldest first
+        self.timestamps: Dict[ResourceId, List[int]] = {}  # resource_id -> timestamps of those versions
+        self._locks = _lock_shards()
     
-    def read_value(self, resource_id: str, read_timestamp: float) -> Optional[Any]:
+    def _lock_for(self, resource_id: ResourceId) -> threading.Lock:
+        """Get the lock guarding a resource's version chain"""
+        return self._locks[hash(resource_id) & LOCK_SHARD_MASK]
+    
+    def read_value(self, resource_id: ResourceId, read_timestamp: int) -> Optional[Any]:
         """Read value for given timestamp (find appropriate version)"""
-        with self.lock:
+        with self._lock_for(resource_id):
             if resource_id not in self.versions:
                 return None
             
-            # Find the latest committed version with timestamp <= read_timestamp
-            valid_versions = [
-                v for v in self.versions[resource_id] 
-                if v.committed and v.timestamp <= read_timestamp
-            ]
+            # Walk back from the last version with timestamp <= read_timestamp
+            # to the latest committed one
+            versions = self.versions[resource_id]
+            for index in range(bisect_right(self.timestamps[resource_id], read_timestamp) - 1, -1, -1):
+                if versions[index].committed:
+                    return _clone_value(versions[index].value)
             
-            if not valid_versions:
-                return None
-            
-            # Return the latest valid version
-            latest_version = max(valid_versions, key=lambda v: v.timestamp)
-            return copy.deepcopy(latest_version.value)
+            return None
     
-    def write_value(self, resource_id: str, value: Any, write_timestamp: float, 
-                   transaction_id: str) -> bool:
+    def write_value(self, resource_id: ResourceId, value: Any, write_timestamp: int, 
+                   transaction_id: int) -> bool:
         """Write value with given timestamp"""
-        with self.lock:
+        with self._lock_for(resource_id):
             if resource_id not in self.versions:
                 self.versions[resource_id] = []
+                self.timestamps[resource_id] = []
             
             # Create new version
             new_version = DataVersion(
-                value=copy.deepcopy(value),
+                value=_clone_value(value),
                 timestamp=write_timestamp,
                 transaction_id=transaction_id,
                 committed=False
             )
             
-            self.versions[resource_id].append(new_version)
+            timestamps = self.timestamps[resource_id]
+            index = bisect_right(timestamps, write_timestamp)
+            timestamps.insert(index, write_timestamp)
+            self.versions[resource_id].insert(index, new_version)
             return True
     
-    def commit_version(self, resource_id: str, transaction_id: str) -> bool:
+    def commit_version(self, resource_id: ResourceId, transaction_id: int) -> bool:
         """Mark versions written by transaction as committed"""
-        with self.lock:
+        with self._lock_for(resource_id):
             if resource_id not in self.versions:
                 return False
             
@@ -127,36 +172,74 @@ class MultiversionStorage:
             
             return True
     
-    def abort_version(self, resource_id: str, transaction_id: str) -> bool:
+    def abort_version(self, resource_id: ResourceId, transaction_id: int) -> bool:
         """Remove uncommitted versions written by transaction"""
-        with self.lock:
+        with self._lock_for(resource_id):
             if resource_id not in self.versions:
                 return False
             
-            self.versions[resource_id] = [
+            self._set_chain(resource_id, [
                 v for v in self.versions[resource_id] 
                 if v.transaction_id != transaction_id
-            ]
+            ])
             
             return True
+    
+    def prune(self, resource_id: ResourceId, horizon: int):
+        """Drop versions no reader at or after horizon can see
+        
+        horizon is the start timestamp of the oldest active transaction; the
+        newest committed version at or before it, and everything after it,
+        are kept.
+        """
+        with self._lock_for(resource_id):
+            versions = self.versions.get(resource_id)
+            if not versions:
+                return
+            
+            for index in range(bisect_right(self.timestamps[resource_id], horizon) - 1, 0, -1):
+                if versions[index].committed:
+                    self._set_chain(resource_id, versions[index:])
+                    return
+    
+    def _set_chain(self, resource_id: ResourceId, versions: List[DataVersion]):
+        """Replace a resource's version chain (called with its shard lock held)"""
+        self.versions[resource_id] = versions
+        self.timestamps[resource_id] = [v.timestamp for v in versions]
 
 class ConcurrencyController:
-    """Timestamp-based concurrency controller with multiversion support"""
+    """Timestamp-based concurrency controller with multiversion support
+    
+    self.lock guards the transaction table, graph_lock the wait-for graph,
+    and each resource's reader/writer entries are guarded by a lock shard
+    picked by resource id, so validating different resources never
+    serializes on one lock. Callers that already serialize access (the
+    TransactionManager) pass locked=True to skip the shard locks.
+    """
     
     def __init__(self):
-        self.transactions: Dict[str, Transaction] = {}
+        self.transactions: Dict[int, Transaction] = {}  # running transactions and finished ones not yet pruned
+        self.transactions_started = 0
+        # (start_timestamp, transaction_id) of finished transactions still kept for validation
+        self._retained: List[Tuple[int, int]] = []
         self.multiversion_storage = MultiversionStorage()
-        self.lock_table: Dict[str, List[Lock]] = {}  # resource_id -> locks
-        self.timestamp_counter = 0
-        self.lock = RLock()
-        self.wait_for_graph: Dict[str, Set[str]] = {}  # transaction_id -> set of transactions waiting for
+        self.lock_table: Dict[ResourceId, List[Lock]] = {}  # resource_id -> locks
+        self._timestamps = itertools.count(1)  # logical clock: unique, strictly increasing
+        self._transaction_ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.graph_lock = threading.Lock()
+        self._resource_locks = _lock_shards()
+        self.wait_for_graph: Dict[int, Set[int]] = {}  # transaction_id -> set of transactions waiting for
+        # resource_id -> {transaction_id: start_timestamp} of the transactions that read/wrote it
+        self.readers_by_resource: Dict[ResourceId, Dict[int, int]] = {}
+        self.writers_by_resource: Dict[ResourceId, Dict[int, int]] = {}
+        self.deadlocked_transaction: Optional[int] = None  # victim chosen when a wait edge last closed a cycle
     
-    def begin_transaction(self) -> str:
+    def begin_transaction(self) -> int:
         """Begin a new transaction"""
         with self.lock:
-            transaction_id = str(uuid.uuid4())
-            start_timestamp = time.time() + self.timestamp_counter
-            self.timestamp_counter += 0.001  # Ensure unique timestamps
+            transaction_id = next(self._transaction_ids)
+            start_timestamp = next(self._timestamps)
             
             transaction = Transaction(
                 transaction_id=transaction_id,
@@ -165,95 +248,263 @@ class ConcurrencyController:
             )
             
             self.transactions[transaction_id] = transaction
+            self.transactions_started += 1
+        
+        with self.graph_lock:
             self.wait_for_graph[transaction_id] = set()
-            return transaction_id
+        return transaction_id
     
-    def validate_read(self, transaction_id: str, resource_id: str) -> bool:
-        """Validate read operation using timestamp ordering"""
+    def _resource_lock(self, resource_id: ResourceId) -> threading.Lock:
+        """Get the lock guarding a resource's reader/writer entries"""
+        return self._resource_locks[hash(resource_id) & LOCK_SHARD_MASK]
+    
+    def _guard(self, resource_id: ResourceId, locked: bool):
+        """The resource's shard lock, or a no-op when the caller already serializes access"""
+        return _NO_LOCK if locked else self._resource_locks[hash(resource_id) & LOCK_SHARD_MASK]
+    
+    def next_timestamp(self) -> int:
+        """Draw the next logical timestamp"""
+        return next(self._timestamps)
+    
+    def oldest_active_timestamp(self) -> Optional[int]:
+        """Start timestamp of the oldest transaction still running"""
         with self.lock:
-            transaction = self.transactions[transaction_id]
-            
-            # Check if any younger transaction has written to this resource
-            for other_txn in self.transactions.values():
-                if (other_txn.transaction_id != transaction_id and 
-                    other_txn.start_timestamp > transaction.start_timestamp):
-                    # Check write set
-                    for db, table, record_id in other_txn.write_set:
-                        if f"{db}.{table}.{record_id}" == resource_id:
-                            # Younger transaction wrote - must abort current transaction
-                            return False
-            
-            return True
+            return min(
+                (t.start_timestamp for t in self.transactions.values()
+                 if t.status in (TransactionStatus.ACTIVE, TransactionStatus.PREPARING)),
+                default=None
+            )
     
-    def validate_write(self, transaction_id: str, resource_id: str) -> bool:
+    def record_read(self, transaction: Transaction, resource_id: ResourceId, locked: bool = False):
+        """Add a resource to the transaction's read set and the resource's reader list"""
+        transaction.read_set.add(resource_id)
+        with self._guard(resource_id, locked):
+            readers = self.readers_by_resource.setdefault(resource_id, {})
+            readers[transaction.transaction_id] = transaction.start_timestamp
+    
+    def record_write(self, transaction: Transaction, resource_id: ResourceId, locked: bool = False):
+        """Add a resource to the transaction's write set and the resource's writer list"""
+        transaction.write_set.add(resource_id)
+        with self._guard(resource_id, locked):
+            writers = self.writers_by_resource.setdefault(resource_id, {})
+            writers[transaction.transaction_id] = transaction.start_timestamp
+    
+    def forget_accesses(self, transaction: Transaction, locked: bool = False):
+        """Drop a transaction from the reader/writer lists once it is aborted or pruned"""
+        transaction_id = transaction.transaction_id
+        for accessed, by_resource in ((transaction.read_set, self.readers_by_resource),
+                                      (transaction.write_set, self.writers_by_resource)):
+            for resource_id in accessed:
+                with self._guard(resource_id, locked):
+                    accessors = by_resource.get(resource_id)
+                    if accessors is not None:
+                        accessors.pop(transaction_id, None)
+                        if not accessors:
+                            del by_resource[resource_id]
+    
+    @staticmethod
+    def _accessed_after(by_resource: Dict[ResourceId, Dict[int, int]], resource_id: ResourceId, start_timestamp: int) -> bool:
+        """Whether a transaction younger than start_timestamp appears in a reader/writer map"""
+        accessors = by_resource.get(resource_id)
+        # max() runs the comparison loop in C rather than through a generator
+        return bool(accessors) and max(accessors.values()) > start_timestamp
+    
+    def validate_read(self, transaction_id: int, resource_id: ResourceId, locked: bool = False) -> bool:
+        """Validate read operation using timestamp ordering"""
+        start_timestamp = self.transactions[transaction_id].start_timestamp
+        with self._guard(resource_id, locked):
+            # Fail if any younger transaction has written to this resource
+            return not self._accessed_after(self.writers_by_resource, resource_id, start_timestamp)
+    
+    def validate_write(self, transaction_id: int, resource_id: ResourceId, locked: bool = False) -> bool:
         """Validate write operation using timestamp ordering"""
-        with self.lock:
-            transaction = self.transactions[transaction_id]
+        start_timestamp = self.transactions[transaction_id].start_timestamp
+        with self._guard(resource_id, locked):
+            # Fail if any younger transaction has read or written to this resource
+            return not (self._accessed_after(self.readers_by_resource, resource_id, start_timestamp) or
+                        self._accessed_after(self.writers_by_resource, resource_id, start_timestamp))
+    
+    def validate_reads_batch(self, transaction_id: int, resource_ids: Iterable[ResourceId],
+                             locked: bool = False) -> Optional[ResourceId]:
+        """Validate several reads at once; returns the first conflicting resource, or None"""
+        start_timestamp = self.transactions[transaction_id].start_timestamp
+        return self._first_conflict(start_timestamp, resource_ids, (self.writers_by_resource,), locked)
+    
+    def validate_writes_batch(self, transaction_id: int, resource_ids: Iterable[ResourceId],
+                              locked: bool = False) -> Optional[ResourceId]:
+        """Validate several writes at once; returns the first conflicting resource, or None"""
+        start_timestamp = self.transactions[transaction_id].start_timestamp
+        return self._first_conflict(start_timestamp, resource_ids,
+                                    (self.readers_by_resource, self.writers_by_resource), locked)
+    
+    def _first_conflict(self, start_timestamp: int, resource_ids: Iterable[ResourceId],
+                        maps: Tuple[Dict[ResourceId, Dict[int, int]], ...],
+                        locked: bool = False) -> Optional[ResourceId]:
+        """Find a resource a younger transaction accessed, taking each lock shard only once"""
+        if locked:
+            accessed_after = self._accessed_after
+            return next((resource_id for resource_id in resource_ids
+                         if any(accessed_after(by_resource, resource_id, start_timestamp) for by_resource in maps)),
+                        None)
+        
+        by_shard: Dict[int, List[ResourceId]] = {}
+        for resource_id in resource_ids:
+            by_shard.setdefault(hash(resource_id) & LOCK_SHARD_MASK, []).append(resource_id)
+        
+        for shard, shard_resources in by_shard.items():
+            with self._resource_locks[shard]:
+                for resource_id in shard_resources:
+                    for by_resource in maps:
+                        if self._accessed_after(by_resource, resource_id, start_timestamp):
+                            return resource_id
+        
+        return None
+    
+    def detect_deadlock(self) -> Optional[int]:
+        """Detect deadlock using wait-for graph
+        
+        Runs an iterative Tarjan pass over the transactions that are waiting
+        on someone and returns the youngest transaction in any cycle (the one
+        to abort), or None.
+        """
+        with self.graph_lock:
+            graph = self.wait_for_graph
+            index_of: Dict[int, int] = {}  # transaction_id -> DFS discovery index
+            lowlink: List[int] = []
+            on_stack: List[bool] = []
+            stack: List[int] = []
+            victim = None
             
-            # Check if any younger transaction has read or written to this resource
-            for other_txn in self.transactions.values():
-                if (other_txn.transaction_id != transaction_id and 
-                    other_txn.start_timestamp > transaction.start_timestamp):
+            for root in graph:
+                if not graph[root] or root in index_of:
+                    continue
+                
+                # Each work item is (transaction_id, iterator over its successors)
+                work = [(root, iter(graph[root]))]
+                index_of[root] = len(lowlink)
+                lowlink.append(index_of[root])
+                on_stack.append(True)
+                stack.append(root)
+                
+                while work:
+                    node, successors = work[-1]
+                    node_index = index_of[node]
+                    advanced = False
+                    
+                    for successor in successors:
+                        if successor not in index_of:
+                            index_of[successor] = len(lowlink)
+                            lowlink.append(index_of[successor])
+                            on_stack.append(True)
+                            stack.append(successor)
+                            work.append((successor, iter(graph.get(successor, ()))))
+                            advanced = True
+                            break
+                        successor_index = index_of[successor]
+                        if on_stack[successor_index]:
+                            lowlink[node_index] = min(lowlink[node_index], successor_index)
                     
-                    # Check read set
-                    for db, table, record_id in other_txn.read_set:
-                        if f"{db}.{table}.{record_id}" == resource_id:
-                            return False
+                    if advanced:
+                        continue
                     
-                    # Check write set
-                    for db, table, record_id in other_txn.write_set:
-                        if f"{db}.{table}.{record_id}" == resource_id:
-                            return False
+                    work.pop()
+                    if work:
+                        parent_index = index_of[work[-1][0]]
+                        lowlink[parent_index] = min(lowlink[parent_index], lowlink[node_index])
+                    
+                    if lowlink[node_index] == node_index:
+                        # node is the root of a strongly connected component
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[index_of[member]] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        
+                        if len(component) > 1 or node in graph.get(node, ()):
+                            youngest = max(component, key=lambda t: self.transactions[t].start_timestamp)
+                            if (victim is None or self.transactions[youngest].start_timestamp
+                                    > self.transactions[victim].start_timestamp):
+                                victim = youngest
             
-            return True
+            return victim
     
-    def detect_deadlock(self) -> Optional[str]:
-        """Detect deadlock using wait-for graph"""
-        with self.lock:
-            # Implement cycle detection in wait-for graph
-            visited = set()
-            rec_stack = set()
-            
-            def has_cycle(transaction_id: str) -> bool:
-                visited.add(transaction_id)
-                rec_stack.add(transaction_id)
-                
-                for neighbor in self.wait_for_graph.get(transaction_id, set()):
-                    if neighbor not in visited:
-                        if has_cycle(neighbor):
-                            return True
-                    elif neighbor in rec_stack:
-                        return True
-                
-                rec_stack.remove(transaction_id)
-                return False
+    def add_wait_edge(self, waiter: int, holder: int):
+        """Add edge to wait-for graph and look for a cycle, since only blocking can create one"""
+        with self.graph_lock:
+            if waiter not in self.wait_for_graph:
+                return
+            self.wait_for_graph[waiter].add(holder)
+        
+        self.deadlocked_transaction = self.detect_deadlock()
+    
+    def remove_wait_edge(self, waiter: int, holder: int):
+        """Drop one wait-for edge once the waiter stops waiting"""
+        with self.graph_lock:
+            waits_for = self.wait_for_graph.get(waiter)
+            if waits_for is not None:
+                waits_for.discard(holder)
+    
+    def active_writer(self, resource_id: ResourceId, transaction_id: int, locked: bool = False) -> Optional[int]:
+        """Another transaction that wrote the resource and has not finished yet, if any"""
+        with self._guard(resource_id, locked):
+            writers = list(self.writers_by_resource.get(resource_id, ()))
+        
+        for writer in writers:
+            transaction = self.transactions.get(writer)
+            if writer != transaction_id and transaction is not None and transaction.status in (
+                    TransactionStatus.ACTIVE, TransactionStatus.PREPARING):
+                return writer
+        return None
+    
+    def finalize_transaction(self, transaction_id: int, committed: bool, locked: bool = False):
+        """Mark a transaction committed or aborted and unlink it from the wait-for graph
+        
+        Done under a single hold of the graph lock. The transaction's node is
+        dropped rather than emptied, so the graph only holds live transactions.
+        Finished transactions that no running one can conflict with are then pruned.
+        """
+        transaction = self.transactions[transaction_id]
+        with self.graph_lock:
+            if committed:
+                transaction.commit_timestamp = next(self._timestamps)
+                transaction.status = TransactionStatus.COMMITTED
+            else:
+                transaction.status = TransactionStatus.ABORTED
             
-            for txn_id in self.transactions.keys():
-                if txn_id not in visited:
-                    if has_cycle(txn_id):
-                        # Return the youngest transaction in the cycle (to abort)
-                        cycle_transactions = [
-                            txn_id for txn_id in self.transactions.keys()
-                            if txn_id in rec_stack
-                        ]
-                        if cycle_transactions:
-                            youngest = max(
-                                cycle_transactions,
-                                key=lambda t: self.transactions[t].start_timestamp
-                            )
-                            return youngest
+            self.wait_for_graph.pop(transaction_id, None)
+            for waits_for in self.wait_for_graph.values():
+                waits_for.discard(transaction_id)
             
-            return None
+            if self.deadlocked_transaction == transaction_id:
+                self.deadlocked_transaction = None
+        
+        transaction.read_cache.clear()
+        heapq.heappush(self._retained, (transaction.start_timestamp, transaction_id))
+        self._prune_finished(locked)
     
-    def add_wait_edge(self, waiter: str, holder: str):
-        """Add edge to wait-for graph"""
-        with self.lock:
-            if waiter in self.wait_for_graph:
-                self.wait_for_graph[waiter].add(holder)
+    def _prune_finished(self, locked: bool = False):
+        """Drop finished transactions older than every running one
+        
+        Validation only fails on accesses by younger transactions, so once every
+        running transaction started after a finished one, its reader/writer
+        entries can no longer cause a conflict and it is forgotten entirely.
+        """
+        horizon = self.oldest_active_timestamp()
+        retained = self._retained
+        while retained and (horizon is None or retained[0][0] < horizon):
+            _, transaction_id = heapq.heappop(retained)
+            transaction = self.transactions[transaction_id]
+            if transaction.status is TransactionStatus.COMMITTED:
+                # Aborted transactions were already forgotten by the rollback
+                self.forget_accesses(transaction, locked)
+            with self.lock:
+                del self.transactions[transaction_id]
     
-    def remove_wait_edges(self, transaction_id: str):
+    def remove_wait_edges(self, transaction_id: int):
         """Remove all edges involving a transaction"""
-        with self.lock:
+        with self.graph_lock:
             # Remove outgoing edges
             if transaction_id in self.wait_for_graph:
                 self.wait_for_graph[transaction_id].clear()
@@ -1,14 +1,62 @@
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Deque, Iterable, Union
+from collections import deque
+from dataclasses import dataclass
+import atexit
+import functools
+import queue
+import sys
 import time
-import copy
+import threading
 from datetime import datetime
+from types import MappingProxyType
 from loguru import logger
 
 from .concurrency import (
     ConcurrencyController, Transaction, TransactionStatus, 
-    TransactionException, DeadlockException, Operation
+    TransactionException, DeadlockException, Operation, ResourceId
 )
-from database.inmemory_db import DatabaseManager, DatabaseException
+from database.inmemory_db import DatabaseManager, DatabaseException, Table
+
+# Operation names are interned so the hot path can compare them by identity
+_SELECT = sys.intern('SELECT')
+_INSERT = sys.intern('INSERT')
+_UPDATE = sys.intern('UPDATE')
+_DELETE = sys.intern('DELETE')
+_WRITE_OPS = frozenset((_INSERT, _UPDATE, _DELETE))
+
+# Log levels of transaction events; everything else is logged at DEBUG
+_WARNING_OPERATIONS = frozenset(('ROLLBACK_TRANSACTION', 'OPERATION_ERROR', 'ROLLBACK_ERROR'))
+_INFO_OPERATIONS = frozenset(('RESTART_TRANSACTION',))
+
+# Log details are a dict or a zero-argument callable that builds one when the entry is read or emitted
+LogDetails = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
+def _resolve_details(details: LogDetails) -> Dict[str, Any]:
+    """Build a log entry's details if they were passed lazily"""
+    return details() if callable(details) else details
+
+TRANSACTION_LOG_SIZE = 10_000  # most recent log entries kept in memory
+ROLLBACK_LIST_POOL_SIZE = 64  # emptied rollback lists kept for new transactions
+
+def _serialized(method):
+    """Run a TransactionManager method under the manager lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+@dataclass(slots=True)
+class RollbackInfo:
+    """Undo information recorded before a write"""
+    operation_type: str  # INSERT, UPDATE, DELETE
+    database_name: str
+    table_name: str
+    record_id: Any
+    timestamp: int
+    # Stored pre-image row for UPDATE/DELETE. Rows hold only immutable scalars and are
+    # replaced rather than mutated, so a reference is as good as a (deep) copy
+    original_version: Optional[Dict[str, Any]] = None
 
 class TransactionManager:
     """Main transaction manager implementing ACID properties"""
@@ -16,86 +64,175 @@ class TransactionManager:
     def __init__(self, database_manager: DatabaseManager):
         self.database_manager = database_manager
         self.concurrency_controller = ConcurrencyController()
-        self.active_transactions: Dict[str, str] = {}  # thread_id -> transaction_id
-        self.transaction_log: List[Dict[str, Any]] = []
-        self.rollback_log: Dict[str, List[Dict[str, Any]]] = {}  # transaction_id -> rollback operations
+        self.active_transactions: Dict[str, int] = {}  # thread_id -> transaction_id
+        # Transaction log kept as parallel columns: timestamp, operation type, transaction id, details
+        self._log_timestamps: Deque[int] = deque(maxlen=TRANSACTION_LOG_SIZE)
+        self._log_operation_types: Deque[str] = deque(maxlen=TRANSACTION_LOG_SIZE)
+        self._log_transaction_ids: Deque[int] = deque(maxlen=TRANSACTION_LOG_SIZE)
+        self._log_details: Deque[LogDetails] = deque(maxlen=TRANSACTION_LOG_SIZE)
+        self.rollback_log: Dict[int, List[RollbackInfo]] = {}  # transaction_id -> rollback operations
+        self._free_rollback_lists: List[List[RollbackInfo]] = []  # cleared lists kept for reuse
         self.max_retries = 3
+        # Serializes begins, operations, commits and rollbacks, so the controller's
+        # per-resource shard locks are skipped on those paths (locked=True)
+        self._lock = threading.RLock()
+        # Notified whenever a transaction commits or rolls back, waking writers blocked on it
+        self._finished = threading.Condition(self._lock)
+        self.lock_wait_timeout = 5.0  # seconds a writer waits on another's uncommitted write before restarting
+        # Upper-case operation type -> handler taking
+        # (transaction_id, database, database_name, table_name, record_id, data, where, readonly, delta, minimums)
+        self._dispatch: Dict[str, Callable[..., Any]] = {
+            _SELECT: self._do_select,
+            _INSERT: self._do_insert,
+            _UPDATE: self._do_update,
+            _DELETE: self._do_delete,
+        }
+        # loguru calls are made by a background writer so they stay off the transaction path
+        self._log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._log_writer = threading.Thread(target=self._write_logs, name="transaction-log-writer", daemon=True)
+        self._log_writer.start()
+        self._log_writer_stopped = False  # once set, log messages are emitted on the calling thread
+        atexit.register(self._flush_logs)
+    
+    def shutdown(self):
+        """Flush pending log messages; later ones are emitted synchronously"""
+        atexit.unregister(self._flush_logs)
+        self._flush_logs()
     
-    def begin_transaction(self, thread_id: str = None) -> str:
+    @_serialized
+    def begin_transaction(self, thread_id: str = None) -> int:
         """Begin a new transaction"""
         if thread_id is None:
             thread_id = str(time.time())
         
         transaction_id = self.concurrency_controller.begin_transaction()
         self.active_transactions[thread_id] = transaction_id
-        self.rollback_log[transaction_id] = []
+        free_lists = self._free_rollback_lists
+        self.rollback_log[transaction_id] = free_lists.pop() if free_lists else []
         
-        self.log_operation("BEGIN_TRANSACTION", transaction_id, {
+        timestamp = time.monotonic_ns()
+        self.log_operation("BEGIN_TRANSACTION", transaction_id, lambda: {
             'thread_id': thread_id,
-            'timestamp': datetime.now()
+            'timestamp': timestamp
         })
         
         return transaction_id
     
+    def tx_now(self, thread_id: str) -> datetime:
+        """Get the timestamp of the thread's active transaction (current time if none is active)
+        
+        The wall-clock time is read the first time a transaction asks for it, so
+        transactions that write no timestamped rows never pay for datetime.now().
+        """
+        transaction_id = self.active_transactions.get(thread_id)
+        if transaction_id is None:
+            return datetime.now()
+        
+        transaction = self.concurrency_controller.transactions[transaction_id]
+        if transaction.started_at is None:
+            transaction.started_at = datetime.now()
+        return transaction.started_at
+    
+    @_serialized
     def execute_operation(self, thread_id: str, operation_type: str, 
                          database_name: str, table_name: str, 
-                         record_id: Any = None, data: Dict[str, Any] = None) -> Any:
-        """Execute a database operation within a transaction"""
-        
-        if thread_id not in self.active_transactions:
+                         record_id: Any = None, data: Dict[str, Any] = None,
+                         where: Dict[str, Any] = None, readonly: bool = False,
+                         record_ids: List[Any] = None, delta: Dict[str, Any] = None,
+                         minimums: Dict[str, Any] = None) -> Any:
+        """Execute a database operation within a transaction
+        
+        SELECTs without a record_id may pass where={field: value, ...} to
+        fetch matching rows through the table's hash indexes, or
+        record_ids=[...] to fetch several rows by primary key in one call
+        (missing rows are left out). SELECTs may pass readonly=True to get
+        read-only views of the stored rows instead of copies.
+        
+        UPDATEs may pass delta={field: amount} instead of data to have the
+        storage engine add to the current values under its lock, optionally
+        refusing results below minimums={field: value}. They return the new
+        values, or None if the record does not exist.
+        """
+        
+        transaction_id = self.active_transactions.get(thread_id)
+        if transaction_id is None:
             raise TransactionException("No active transaction for this thread")
         
-        transaction_id = self.active_transactions[thread_id]
-        transaction = self.concurrency_controller.transactions[transaction_id]
+        controller = self.concurrency_controller
+        transaction = controller.transactions[transaction_id]
         
         if transaction.status != TransactionStatus.ACTIVE:
             raise TransactionException("Transaction is not active")
         
-        resource_id = f"{database_name}.{table_name}.{record_id}" if record_id else f"{database_name}.{table_name}"
+        op = sys.intern(operation_type.upper())
+        if record_ids is not None:
+            if op is not _SELECT:
+                raise TransactionException("record_ids is only supported for SELECT")
+            return self._select_many(transaction, thread_id, database_name, table_name, record_ids, readonly)
+        
+        # Repeated reads of a row within the transaction are served from its read cache;
+        # the read is still validated once more at commit through the read set
+        resource_id = (database_name, table_name, record_id)
+        if op is _SELECT and record_id is not None:
+            cached_row = transaction.read_cache.get(resource_id)
+            if cached_row is not None:
+                return MappingProxyType(cached_row) if readonly else dict(cached_row)
         
         # Validate operation based on timestamp ordering
-        if operation_type.upper() in ['SELECT']:
-            if not self.concurrency_controller.validate_read(transaction_id, resource_id):
+        if op is _SELECT:
+            if not controller.validate_read(transaction_id, resource_id, locked=True):
                 # Restart transaction
                 self._restart_transaction(transaction_id, thread_id)
                 raise TransactionException("Transaction restarted due to read validation failure")
         
-        elif operation_type.upper() in ['INSERT', 'UPDATE', 'DELETE']:
-            if not self.concurrency_controller.validate_write(transaction_id, resource_id):
+        elif op in _WRITE_OPS and op is not _INSERT:
+            # Inserts get a fresh primary key, so there is nothing to validate beforehand
+            self._wait_for_writers(transaction_id, thread_id, (resource_id,))
+            if not controller.validate_write(transaction_id, resource_id, locked=True):
                 # Restart transaction
                 self._restart_transaction(transaction_id, thread_id)
                 raise TransactionException("Transaction restarted due to write validation failure")
         
         # Check for deadlock before proceeding
-        deadlocked_transaction = self.concurrency_controller.detect_deadlock()
-        if deadlocked_transaction == transaction_id:
+        if controller.deadlocked_transaction == transaction_id:
             self._restart_transaction(transaction_id, thread_id)
             raise DeadlockException("Transaction restarted due to deadlock")
         
         # Execute the actual database operation
         try:
             result = self._execute_database_operation(
-                transaction_id, operation_type, database_name, 
-                table_name, record_id, data
+                transaction_id, op, database_name, 
+                table_name, record_id, data, where, readonly, delta, minimums
             )
             
             # Update transaction metadata
-            if operation_type.upper() == 'SELECT':
-                transaction.read_set.add((database_name, table_name, record_id))
+            if op is _SELECT:
+                controller.record_read(transaction, resource_id, locked=True)
+                if record_id is not None and result is not None:
+                    # Read-only views share the stored row, which is never mutated in place
+                    transaction.read_cache[resource_id] = result if readonly else dict(result)
             else:
-                transaction.write_set.add((database_name, table_name, record_id))
+                if op is _INSERT:
+                    # Record the insert on the key it was assigned, not on (db, table, None)
+                    record_id = result
+                    resource_id = (database_name, table_name, record_id)
+                controller.record_write(transaction, resource_id, locked=True)
+                transaction.read_cache.pop(resource_id, None)
             
             # Create operation record
+            operations = transaction.operations
             operation = Operation(
-                operation_id=f"{transaction_id}_{len(transaction.operations)}",
-                operation_type=operation_type.upper(),
+                operation_id=f"{transaction_id}_{len(operations)}",
+                timestamp=transaction.start_timestamp + len(operations),
+                operation_type=op,
                 database_name=database_name,
                 table_name=table_name,
                 record_id=record_id,
-                data=data or {}
+                data=data or delta or {},
+                resource_id=resource_id
             )
             
-            transaction.operations.append(operation)
+            operations.append(operation)
             
             return result
             
@@ -104,10 +241,175 @@ class TransactionManager:
             self.log_operation("OPERATION_ERROR", transaction_id, {
                 'error': str(e),
                 'operation': operation_type,
-                'resource': resource_id
+                'resource': f"{database_name}.{table_name}.{record_id}"
             })
-            raise TransactionException(f"Operation failed: {str(e)}")
+            raise TransactionException(f"Operation failed: {str(e)}") from e
     
+    def _select_many(self, transaction: Transaction, thread_id: str, database_name: str,
+                     table_name: str, record_ids: List[Any], readonly: bool) -> List[Any]:
+        """Read several rows by primary key with one validation pass and one table access"""
+        transaction_id = transaction.transaction_id
+        rows = {}
+        misses = []
+        for record_id in dict.fromkeys(record_ids):
+            cached_row = transaction.read_cache.get((database_name, table_name, record_id))
+            if cached_row is not None:
+                rows[record_id] = MappingProxyType(cached_row) if readonly else dict(cached_row)
+            else:
+                misses.append(record_id)
+        
+        if misses:
+            resource_ids = [(database_name, table_name, record_id) for record_id in misses]
+            if self.concurrency_controller.validate_reads_batch(transaction_id, resource_ids, locked=True) is not None:
+                self._restart_transaction(transaction_id, thread_id)
+                raise TransactionException("Transaction restarted due to read validation failure")
+            
+            if self.concurrency_controller.deadlocked_transaction == transaction_id:
+                self._restart_transaction(transaction_id, thread_id)
+                raise DeadlockException("Transaction restarted due to deadlock")
+            
+            try:
+                database = self.database_manager.get_database(database_name)
+                fetched = database.execute_sql('SELECT', table_name, primary_keys=misses, readonly=readonly)
+            except Exception as e:
+                self.log_operation("OPERATION_ERROR", transaction_id, {
+                    'error': str(e),
+                    'operation': 'SELECT',
+                    'resource': f"{database_name}.{table_name}"
+                })
+                raise TransactionException(f"Operation failed: {str(e)}") from e
+            
+            for record_id, resource_id, row in zip(misses, resource_ids, fetched):
+                self.concurrency_controller.record_read(transaction, resource_id, locked=True)
+                if row is not None:
+                    transaction.read_cache[resource_id] = row if readonly else dict(row)
+                    rows[record_id] = row
+            
+            transaction.operations.append(Operation(
+                operation_id=f"{transaction_id}_{len(transaction.operations)}",
+                timestamp=transaction.start_timestamp + len(transaction.operations),
+                operation_type='SELECT',
+                database_name=database_name,
+                table_name=table_name,
+                record_id=tuple(misses)
+            ))
+        
+        return [rows[record_id] for record_id in record_ids if record_id in rows]
+    
+    @_serialized
+    def record_reads(self, thread_id: str, database_name: str, table_name: str,
+                     record_ids: Iterable[Any] = (None,)):
+        """Validate and record reads served from a cache instead of a SELECT
+        
+        The reads enter the transaction's read set exactly as a SELECT of the
+        same record ids (None for the whole table) would, so commit-time
+        validation still covers them.
+        """
+        transaction_id = self.active_transactions.get(thread_id)
+        if transaction_id is None:
+            raise TransactionException("No active transaction for this thread")
+        
+        controller = self.concurrency_controller
+        transaction = controller.transactions[transaction_id]
+        if transaction.status != TransactionStatus.ACTIVE:
+            raise TransactionException("Transaction is not active")
+        
+        resource_ids = [(database_name, table_name, record_id) for record_id in record_ids]
+        if controller.validate_reads_batch(transaction_id, resource_ids, locked=True) is not None:
+            self._restart_transaction(transaction_id, thread_id)
+            raise TransactionException("Transaction restarted due to read validation failure")
+        
+        for resource_id in resource_ids:
+            controller.record_read(transaction, resource_id, locked=True)
+    
+    @_serialized
+    def execute_batch(self, thread_id: str, operations: List[tuple]) -> List[Any]:
+        """Execute several write operations within a transaction in one pass
+        
+        Each operation is an (operation_type, database_name, table_name, record_id, data)
+        tuple. All operations are validated up front, then applied grouped by
+        database and table under a single database lock per group. Results are
+        returned in the order the operations were given.
+        """
+        
+        if thread_id not in self.active_transactions:
+            raise TransactionException("No active transaction for this thread")
+        
+        transaction_id = self.active_transactions[thread_id]
+        transaction = self.concurrency_controller.transactions[transaction_id]
+        
+        if transaction.status != TransactionStatus.ACTIVE:
+            raise TransactionException("Transaction is not active")
+        
+        resource_ids = []
+        for operation_type, database_name, table_name, record_id, data in operations:
+            if operation_type.upper() not in _WRITE_OPS:
+                raise TransactionException(f"Unsupported batch operation: {operation_type}")
+            
+            resource_ids.append((database_name, table_name, record_id))
+        
+        # Inserts get a fresh primary key, so only updates and deletes are validated
+        existing = [resource_id for resource_id, operation in zip(resource_ids, operations)
+                    if operation[0].upper() != _INSERT]
+        self._wait_for_writers(transaction_id, thread_id, existing)
+        if self.concurrency_controller.validate_writes_batch(transaction_id, existing, locked=True) is not None:
+            self._restart_transaction(transaction_id, thread_id)
+            raise TransactionException("Transaction restarted due to write validation failure")
+        
+        if self.concurrency_controller.deadlocked_transaction == transaction_id:
+            self._restart_transaction(transaction_id, thread_id)
+            raise DeadlockException("Transaction restarted due to deadlock")
+        
+        results: List[Any] = [None] * len(operations)
+        ordered = sorted(range(len(operations)), key=lambda i: (operations[i][1], operations[i][2]))
+        
+        try:
+            current_group = None
+            for index in ordered:
+                operation_type, database_name, table_name, record_id, data = operations[index]
+                
+                if current_group != (database_name, table_name):
+                    if current_group is not None:
+                        group_lock.release()
+                    group_lock = self.database_manager.get_database(database_name).lock
+                    group_lock.acquire()
+                    current_group = (database_name, table_name)
+                
+                results[index] = self._execute_database_operation(
+                    transaction_id, operation_type, database_name,
+                    table_name, record_id, data
+                )
+                if operation_type.upper() == _INSERT:
+                    record_id = results[index]
+                    resource_ids[index] = (database_name, table_name, record_id)
+                
+                self.concurrency_controller.record_write(transaction, resource_ids[index], locked=True)
+                transaction.read_cache.pop(resource_ids[index], None)
+                transaction.operations.append(Operation(
+                    operation_id=f"{transaction_id}_{len(transaction.operations)}",
+                    timestamp=transaction.start_timestamp + len(transaction.operations),
+                    operation_type=operation_type.upper(),
+                    database_name=database_name,
+                    table_name=table_name,
+                    record_id=record_id,
+                    data=data or {},
+                    resource_id=resource_ids[index]
+                ))
+            
+            return results
+            
+        except Exception as e:
+            self.log_operation("OPERATION_ERROR", transaction_id, {
+                'error': str(e),
+                'operation': 'BATCH',
+                'operations_count': len(operations)
+            })
+            raise TransactionException(f"Operation failed: {str(e)}") from e
+        finally:
+            if current_group is not None:
+                group_lock.release()
+    
+    @_serialized
     def commit_transaction(self, thread_id: str) -> bool:
         """Commit a transaction"""
         if thread_id not in self.active_transactions:
@@ -120,34 +422,40 @@ class TransactionManager:
             # Set status to preparing
             transaction.status = TransactionStatus.PREPARING
             
-            # Final validation before commit
-            for db, table, record_id in transaction.read_set:
-                resource_id = f"{db}.{table}.{record_id}"
-                if not self.concurrency_controller.validate_read(transaction_id, resource_id):
-                    raise TransactionException("Read validation failed during commit")
-            
-            for db, table, record_id in transaction.write_set:
-                resource_id = f"{db}.{table}.{record_id}"
-                if not self.concurrency_controller.validate_write(transaction_id, resource_id):
-                    raise TransactionException("Write validation failed during commit")
+            # Final validation before commit; the per-operation checks only reject
+            # transactions that are already doomed. Read-only transactions skip it:
+            # each read was validated when it ran and committing them changes nothing
+            controller = self.concurrency_controller
+            if (transaction.write_set and
+                    controller.validate_reads_batch(transaction_id, transaction.read_set, locked=True) is not None):
+                raise TransactionException("Read validation failed during commit")
             
-            # Commit all multiversion data
-            for db, table, record_id in transaction.write_set:
-                resource_id = f"{db}.{table}.{record_id}"
-                self.concurrency_controller.multiversion_storage.commit_version(resource_id, transaction_id)
+            # Validate every write before committing any multiversion data, then drop
+            # versions older than any running reader needs
+            write_set = transaction.write_set
+            if any(not controller.validate_write(transaction_id, resource_id, locked=True)
+                   for resource_id in write_set):
+                raise TransactionException("Write validation failed during commit")
+            storage = controller.multiversion_storage
+            versioned = [resource_id for resource_id in write_set
+                         if storage.commit_version(resource_id, transaction_id)]
+            if versioned:
+                horizon = controller.oldest_active_timestamp()
+                if horizon is not None:
+                    for resource_id in versioned:
+                        storage.prune(resource_id, horizon)
             
-            # Update transaction status
-            transaction.status = TransactionStatus.COMMITTED
-            transaction.commit_timestamp = time.time()
-            
-            # Clean up
-            self.concurrency_controller.remove_wait_edges(transaction_id)
+            # Update transaction status and clean up
+            controller.finalize_transaction(transaction_id, committed=True, locked=True)
+            self._finished.notify_all()
             del self.active_transactions[thread_id]
-            del self.rollback_log[transaction_id]
+            self._release_rollback_list(self.rollback_log.pop(transaction_id))
             
-            self.log_operation("COMMIT_TRANSACTION", transaction_id, {
-                'timestamp': datetime.now(),
-                'operations_count': len(transaction.operations)
+            timestamp = time.monotonic_ns()
+            operations_count = len(transaction.operations)
+            self.log_operation("COMMIT_TRANSACTION", transaction_id, lambda: {
+                'timestamp': timestamp,
+                'operations_count': operations_count
             })
             
             return True
@@ -157,37 +465,37 @@ class TransactionManager:
             self.rollback_transaction(thread_id)
             raise TransactionException(f"Commit failed: {str(e)}")
     
+    @_serialized
     def rollback_transaction(self, thread_id: str) -> bool:
         """Rollback a transaction"""
-        if thread_id not in self.active_transactions:
+        transaction_id = self.active_transactions.pop(thread_id, None)
+        if transaction_id is None:
             return False
         
-        transaction_id = self.active_transactions[thread_id]
         transaction = self.concurrency_controller.transactions[transaction_id]
+        rollback_operations = self.rollback_log.pop(transaction_id, ())
         
         try:
             # Execute rollback operations in reverse order
-            rollback_operations = self.rollback_log.get(transaction_id, [])
             
             for rollback_op in reversed(rollback_operations):
                 self._execute_rollback_operation(rollback_op)
             
             # Abort all multiversion data
-            for db, table, record_id in transaction.write_set:
-                resource_id = f"{db}.{table}.{record_id}"
+            for resource_id in transaction.write_set:
                 self.concurrency_controller.multiversion_storage.abort_version(resource_id, transaction_id)
+            self.concurrency_controller.forget_accesses(transaction, locked=True)
             
-            # Update transaction status
-            transaction.status = TransactionStatus.ABORTED
-            
-            # Clean up
-            self.concurrency_controller.remove_wait_edges(transaction_id)
-            del self.active_transactions[thread_id]
-            del self.rollback_log[transaction_id]
+            # Update transaction status and clean up
+            self.concurrency_controller.finalize_transaction(transaction_id, committed=False, locked=True)
+            self._finished.notify_all()
+            rollback_operations_count = len(rollback_operations)
+            self._release_rollback_list(rollback_operations)
             
-            self.log_operation("ROLLBACK_TRANSACTION", transaction_id, {
-                'timestamp': datetime.now(),
-                'rollback_operations_count': len(rollback_operations)
+            timestamp = time.monotonic_ns()
+            self.log_operation("ROLLBACK_TRANSACTION", transaction_id, lambda: {
+                'timestamp': timestamp,
+                'rollback_operations_count': rollback_operations_count
             })
             
             return True
@@ -198,89 +506,136 @@ class TransactionManager:
             })
             return False
     
-    def _execute_database_operation(self, transaction_id: str, operation_type: str,
+    def _release_rollback_list(self, rollback_operations: List[RollbackInfo]):
+        """Keep a finished transaction's emptied rollback list for reuse"""
+        if isinstance(rollback_operations, list) and len(self._free_rollback_lists) < ROLLBACK_LIST_POOL_SIZE:
+            rollback_operations.clear()
+            self._free_rollback_lists.append(rollback_operations)
+    
+    def _execute_database_operation(self, transaction_id: int, operation_type: str,
                                   database_name: str, table_name: str,
-                                  record_id: Any, data: Dict[str, Any]) -> Any:
+                                  record_id: Any, data: Dict[str, Any],
+                                  where: Dict[str, Any] = None, readonly: bool = False,
+                                  delta: Dict[str, Any] = None, minimums: Dict[str, Any] = None) -> Any:
         """Execute the actual database operation"""
         
-        database = self.database_manager.get_database(database_name)
-        operation_type = operation_type.upper()
-        
-        # Store rollback information before executing
-        if operation_type in ['INSERT', 'UPDATE', 'DELETE']:
-            self._prepare_rollback_info(transaction_id, operation_type, 
-                                      database_name, table_name, record_id)
-        
-        if operation_type == 'SELECT':
-            if record_id is not None:
-                return database.execute_sql('SELECT', table_name, primary_key=record_id)
-            else:
-                condition = data.get('condition') if data else None
-                return database.execute_sql('SELECT', table_name, condition=condition)
-        
-        elif operation_type == 'INSERT':
-            return database.execute_sql('INSERT', table_name, record=data)
-        
-        elif operation_type == 'UPDATE':
-            return database.execute_sql('UPDATE', table_name, 
-                                      primary_key=record_id, updates=data)
-        
-        elif operation_type == 'DELETE':
-            return database.execute_sql('DELETE', table_name, primary_key=record_id)
+        handler = self._dispatch.get(operation_type) or self._dispatch.get(operation_type.upper())
+        if handler is None:
+            raise TransactionException(f"Unsupported operation: {operation_type}")
         
+        database = self.database_manager.get_database(database_name)
+        return handler(transaction_id, database, database_name, table_name, record_id,
+                       data, where, readonly, delta, minimums)
+    
+    def _do_select(self, transaction_id, database, database_name, table_name, record_id,
+                   data, where, readonly, delta, minimums) -> Any:
+        if record_id is not None:
+            return database.execute_sql('SELECT', table_name, primary_key=record_id, readonly=readonly)
+        elif where:
+            return database.execute_sql('SELECT', table_name, where=where, readonly=readonly)
         else:
-            raise TransactionException(f"Unsupported operation: {operation_type}")
+            condition = data.get('condition') if data else None
+            return database.execute_sql('SELECT', table_name, condition=condition)
     
-    def _prepare_rollback_info(self, transaction_id: str, operation_type: str,
-                              database_name: str, table_name: str, record_id: Any):
-        """Prepare rollback information for an operation"""
-        
-        rollback_info = {
-            'operation_type': operation_type,
-            'database_name': database_name,
-            'table_name': table_name,
-            'record_id': record_id,
-            'timestamp': datetime.now()
-        }
-        
-        # For UPDATE and DELETE, store the original data
-        if operation_type in ['UPDATE', 'DELETE']:
-            try:
-                database = self.database_manager.get_database(database_name)
-                original_data = database.execute_sql('SELECT', table_name, primary_key=record_id)
-                rollback_info['original_data'] = original_data
-            except:
-                rollback_info['original_data'] = None
+    def _do_insert(self, transaction_id, database, database_name, table_name, record_id,
+                   data, where, readonly, delta, minimums) -> Any:
+        # Reserve the rollback entry now; the new key is only known once the row exists
+        rollback_info = self._prepare_rollback_info(transaction_id, _INSERT, database_name, table_name, record_id)
+        primary_key = database.execute_sql('INSERT', table_name, record=data)
+        rollback_info.record_id = primary_key
+        return primary_key
+    
+    def _do_update(self, transaction_id, database, database_name, table_name, record_id,
+                   data, where, readonly, delta, minimums) -> Any:
+        self._prepare_rollback_info(transaction_id, _UPDATE, database_name, table_name, record_id,
+                                    database.get_table(table_name))
+        if delta is not None:
+            return database.execute_sql('UPDATE', table_name, primary_key=record_id,
+                                      delta=delta, minimums=minimums)
+        return database.execute_sql('UPDATE', table_name, 
+                                  primary_key=record_id, updates=data)
+    
+    def _do_delete(self, transaction_id, database, database_name, table_name, record_id,
+                   data, where, readonly, delta, minimums) -> Any:
+        self._prepare_rollback_info(transaction_id, _DELETE, database_name, table_name, record_id,
+                                    database.get_table(table_name))
+        return database.execute_sql('DELETE', table_name, primary_key=record_id)
+    
+    def _prepare_rollback_info(self, transaction_id: int, operation_type: str,
+                              database_name: str, table_name: str, record_id: Any,
+                              table: Optional[Table] = None) -> RollbackInfo:
+        """Reserve a rollback entry for an operation
+        
+        UPDATE and DELETE pass the table so the entry can hold a reference to
+        the stored pre-image row; rows are never modified in place, so no copy
+        or SELECT is needed.
+        """
+        
+        rollback_info = RollbackInfo(
+            operation_type=operation_type,
+            database_name=database_name,
+            table_name=table_name,
+            record_id=record_id,
+            timestamp=time.monotonic_ns()
+        )
+        if table is not None:
+            rollback_info.original_version = table.current_version(record_id)
         
         self.rollback_log[transaction_id].append(rollback_info)
+        return rollback_info
     
-    def _execute_rollback_operation(self, rollback_info: Dict[str, Any]):
+    def _execute_rollback_operation(self, rollback_info: RollbackInfo):
         """Execute a single rollback operation"""
         
-        operation_type = rollback_info['operation_type']
-        database_name = rollback_info['database_name']
-        table_name = rollback_info['table_name']
-        record_id = rollback_info['record_id']
-        original_data = rollback_info.get('original_data')
+        operation_type = rollback_info.operation_type
+        database_name = rollback_info.database_name
+        table_name = rollback_info.table_name
+        record_id = rollback_info.record_id
+        original_version = rollback_info.original_version
         
         database = self.database_manager.get_database(database_name)
         
-        if operation_type == 'INSERT':
-            # Rollback INSERT by deleting the record
-            database.execute_sql('DELETE', table_name, primary_key=record_id)
-        
-        elif operation_type == 'UPDATE':
-            # Rollback UPDATE by restoring original data
-            if original_data:
-                database.execute_sql('UPDATE', table_name, 
-                                   primary_key=record_id, updates=original_data)
+        if operation_type is _INSERT:
+            # Rollback INSERT by deleting the record (no key means the insert never happened)
+            if record_id is not None:
+                database.execute_sql('DELETE', table_name, primary_key=record_id)
         
-        elif operation_type == 'DELETE':
-            # Rollback DELETE by reinserting the original data
-            if original_data:
-                database.execute_sql('INSERT', table_name, record=original_data)
+        elif operation_type is _UPDATE or operation_type is _DELETE:
+            # Rollback UPDATE and DELETE by putting the pre-image row back
+            if original_version:
+                database.get_table(table_name).restore_version(record_id, original_version)
     
-    def _restart_transaction(self, old_transaction_id: str, thread_id: str):
+    def _wait_for_writers(self, transaction_id: int, thread_id: str, resource_ids: Iterable[ResourceId]):
+        """Block while another unfinished transaction has written any of the resources
+        
+        Called with the manager lock held; waiting releases it. Each wait adds a
+        wait-for edge, so a wait that closes a cycle picks a victim, which is
+        restarted. A waiter still blocked after lock_wait_timeout is restarted too.
+        """
+        controller = self.concurrency_controller
+        deadline = time.monotonic() + self.lock_wait_timeout
+        for resource_id in resource_ids:
+            while True:
+                holder = controller.active_writer(resource_id, transaction_id, locked=True)
+                if holder is None:
+                    break
+                if controller.deadlocked_transaction == transaction_id:
+                    self._restart_transaction(transaction_id, thread_id)
+                    raise DeadlockException("Transaction restarted due to deadlock")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._restart_transaction(transaction_id, thread_id)
+                    raise TransactionException("Transaction restarted due to lock wait timeout")
+                
+                controller.add_wait_edge(transaction_id, holder)
+                if controller.deadlocked_transaction is not None:
+                    # Wake the victim, which may be waiting on another transaction
+                    self._finished.notify_all()
+                if controller.deadlocked_transaction != transaction_id:
+                    self._finished.wait(remaining)
+                controller.remove_wait_edge(transaction_id, holder)
+    
+    def _restart_transaction(self, old_transaction_id: int, thread_id: str):
         """Restart a transaction (for timestamp-based concurrency control)"""
         
         # Rollback current transaction
@@ -289,37 +644,82 @@ class TransactionManager:
         # Start a new transaction
         new_transaction_id = self.begin_transaction(thread_id)
         
-        self.log_operation("RESTART_TRANSACTION", old_transaction_id, {
+        timestamp = time.monotonic_ns()
+        self.log_operation("RESTART_TRANSACTION", old_transaction_id, lambda: {
             'new_transaction_id': new_transaction_id,
-            'timestamp': datetime.now()
+            'timestamp': timestamp
         })
     
-    def log_operation(self, operation_type: str, transaction_id: str, details: Dict[str, Any]):
-        """Log transaction operations for debugging and auditing"""
-        log_entry = {
-            'timestamp': datetime.now(),
-            'operation_type': operation_type,
-            'transaction_id': transaction_id,
-            'details': details
-        }
-        self.transaction_log.append(log_entry)
-        
-        # Log with appropriate level based on operation type
-        if operation_type in ['ROLLBACK_TRANSACTION', 'OPERATION_ERROR', 'ROLLBACK_ERROR']:
-            logger.warning(f"{operation_type} - TX:{transaction_id[:8]} - {details}")
-        elif operation_type in ['RESTART_TRANSACTION']:
-            logger.info(f"Transaction restarted - TX:{transaction_id[:8]} - {details}")
+    def log_operation(self, operation_type: str, transaction_id: int, details: LogDetails):
+        """Log transaction operations for debugging and auditing
+        
+        Every event is kept in the transaction log. Details passed as a callable
+        are only built when the entry is read or a sink takes its level.
+        """
+        self._log_timestamps.append(time.time_ns())
+        self._log_operation_types.append(operation_type)
+        self._log_transaction_ids.append(transaction_id)
+        self._log_details.append(details)
+        if self._log_writer_stopped:
+            self._emit_log(operation_type, transaction_id, details)
         else:
-            logger.debug(f"{operation_type} - TX:{transaction_id[:8]} - {details}")
+            self._log_queue.put_nowait((operation_type, transaction_id, details))
+    
+    @property
+    def transaction_log(self) -> List[Dict[str, Any]]:
+        """The retained log entries as one dict per entry, oldest first"""
+        return [
+            {'timestamp': timestamp, 'operation_type': operation_type,
+             'transaction_id': transaction_id, 'details': _resolve_details(details)}
+            for timestamp, operation_type, transaction_id, details in zip(
+                self._log_timestamps, self._log_operation_types,
+                self._log_transaction_ids, self._log_details)
+        ]
+    
+    def _write_logs(self):
+        """Emit queued log messages until a None sentinel arrives"""
+        while True:
+            item = self._log_queue.get()
+            if item is None:
+                return
+            
+            self._emit_log(*item)
+    
+    def _emit_log(self, operation_type: str, transaction_id: int, details: LogDetails):
+        """Send one log message to loguru"""
+        resolve = functools.partial(_resolve_details, details)
+        # Log with appropriate level based on operation type; the details are
+        # only built if some sink takes that level
+        if operation_type in _WARNING_OPERATIONS:
+            logger.opt(lazy=True).warning(f"{operation_type} - TX:{transaction_id} - {{}}", resolve)
+        elif operation_type in _INFO_OPERATIONS:
+            logger.opt(lazy=True).info(f"Transaction restarted - TX:{transaction_id} - {{}}", resolve)
+        else:
+            logger.opt(lazy=True).debug(f"{operation_type} - TX:{transaction_id} - {{}}", resolve)
+    
+    def _flush_logs(self):
+        """Wait for the log writer to emit everything queued so far, then stop it"""
+        self._log_writer_stopped = True
+        if self._log_writer.is_alive():
+            self._log_queue.put_nowait(None)
+            self._log_writer.join(timeout=5)
+        # Messages queued by threads that had not yet seen the flag
+        while not self._log_writer.is_alive():
+            try:
+                item = self._log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self._emit_log(*item)
     
     def get_transaction_statistics(self) -> Dict[str, Any]:
         """Get transaction system statistics"""
         active_count = len(self.active_transactions)
-        total_transactions = len(self.concurrency_controller.transactions)
+        total_transactions = self.concurrency_controller.transactions_started
         
         return {
             'active_transactions': active_count,
             'total_transactions': total_transactions,
-            'log_entries': len(self.transaction_log),
+            'log_entries': len(self._log_timestamps),
             'multiversion_resources': len(self.concurrency_controller.multiversion_storage.versions)
-        }
\ No newline at end of file
+        }
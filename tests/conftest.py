@@ -0,0 +1,57 @@
+import os
+import sys
+from decimal import Decimal
+
+import pytest
+
+# The code base imports its packages (business, database, transaction, ...) from src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from business.services import BusinessFacade
+from database.inmemory_db import DatabaseManager
+from transaction.manager import TransactionManager
+
+@pytest.fixture
+def db_manager():
+    """Fresh system databases with their tables and indexes"""
+    manager = DatabaseManager()
+    manager.initialize_system_databases()
+    return manager
+
+@pytest.fixture
+def transaction_manager(db_manager):
+    """Transaction manager over the fresh databases; its log writer is stopped afterwards"""
+    manager = TransactionManager(db_manager)
+    yield manager
+    manager.shutdown()
+
+@pytest.fixture
+def facade(db_manager):
+    """Business facade over the fresh databases; its log writer is stopped afterwards"""
+    business_facade = BusinessFacade(db_manager)
+    yield business_facade
+    business_facade.transaction_manager.shutdown()
+
+@pytest.fixture
+def account(facade):
+    """Id of a checking account holding 100.00, owned by a fresh user"""
+    def create(thread_id):
+        user_id = facade.user_service.create_user("alice", "alice@example.com", "hashed", thread_id)
+        return facade.account_service.create_account(user_id, "checking", Decimal("100.00"), thread_id)
+    
+    return facade.execute_with_transaction(create)
+
+def balance_of(facade, account_id):
+    """Committed balance of an account, read in its own transaction"""
+    return facade.execute_with_transaction(
+        lambda thread_id: facade.account_service.get_account(account_id, thread_id)
+    )['balance']
+
+def insert_user(transaction_manager, name):
+    """Insert and commit a user row, returning its id"""
+    transaction_manager.begin_transaction('setup')
+    user_id = transaction_manager.execute_operation(
+        'setup', 'INSERT', 'financial', 'users', data={'username': name, 'email': f"{name}@example.com"}
+    )
+    transaction_manager.commit_transaction('setup')
+    return user_id
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+import pytest
+
+from business.services import BusinessException, InsufficientFundsError, NotFoundError
+from database.inmemory_db import ConstraintViolation, Table
+from conftest import balance_of
+
+def test_deposit_adds_to_balance(facade, account):
+    facade.execute_with_transaction(
+        lambda thread_id: facade.transaction_service.deposit_money(account, Decimal("25.50"), "pay", thread_id)
+    )
+    
+    assert balance_of(facade, account) == Decimal("125.50")
+
+def test_withdraw_down_to_zero_is_allowed(facade, account):
+    facade.execute_with_transaction(
+        lambda thread_id: facade.transaction_service.withdraw_money(account, Decimal("100.00"), "all", thread_id)
+    )
+    
+    assert balance_of(facade, account) == Decimal("0.00")
+
+def test_withdraw_below_zero_is_refused_and_balance_kept(facade, account):
+    with pytest.raises(BusinessException) as excinfo:
+        facade.execute_with_transaction(
+            lambda thread_id: facade.transaction_service.withdraw_money(account, Decimal("100.01"), "too much", thread_id)
+        )
+    
+    assert isinstance(excinfo.value.__cause__, InsufficientFundsError)
+    assert balance_of(facade, account) == Decimal("100.00")
+
+def test_deposit_to_missing_account_is_not_found(facade):
+    with pytest.raises(BusinessException) as excinfo:
+        facade.execute_with_transaction(
+            lambda thread_id: facade.transaction_service.deposit_money(999, Decimal("1.00"), "nobody", thread_id)
+        )
+    
+    assert isinstance(excinfo.value.__cause__, NotFoundError)
+
+def test_update_delta_leaves_row_untouched_when_minimum_violated():
+    table = Table("accounts")
+    pk = table.insert({'balance': Decimal("5"), 'owner': "bob"})
+    version = table.version
+    
+    with pytest.raises(ConstraintViolation):
+        table.update_delta(pk, {'balance': Decimal("-6")}, minimums={'balance': 0})
+    
+    assert table.select(pk)['balance'] == Decimal("5")
+    assert table.version == version
+    assert table.update_delta(pk, {'balance': Decimal("-5")}, minimums={'balance': 0}) == {'balance': Decimal("0")}
+
+def test_update_delta_on_missing_row_returns_none():
+    assert Table("accounts").update_delta(1, {'balance': 1}) is None
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+from transaction.concurrency import ConcurrencyController, DeadlockException, TransactionException
+from conftest import insert_user
+
+def test_write_after_younger_read_restarts(transaction_manager):
+    user_id = insert_user(transaction_manager, "ann")
+    transaction_manager.begin_transaction('old')
+    transaction_manager.begin_transaction('young')
+    transaction_manager.execute_operation('young', 'SELECT', 'financial', 'users', record_id=user_id)
+    
+    with pytest.raises(TransactionException, match="restarted"):
+        transaction_manager.execute_operation('old', 'UPDATE', 'financial', 'users', user_id, {'username': "old"})
+
+def test_read_after_younger_committed_write_restarts(transaction_manager):
+    user_id = insert_user(transaction_manager, "ann")
+    transaction_manager.begin_transaction('old')
+    transaction_manager.begin_transaction('young')
+    transaction_manager.execute_operation('young', 'UPDATE', 'financial', 'users', user_id, {'username': "young"})
+    transaction_manager.commit_transaction('young')
+    
+    with pytest.raises(TransactionException, match="restarted"):
+        transaction_manager.execute_operation('old', 'SELECT', 'financial', 'users', record_id=user_id)
+
+def test_writer_waits_for_uncommitted_writer(transaction_manager):
+    user_id = insert_user(transaction_manager, "ann")
+    transaction_manager.begin_transaction('first')
+    transaction_manager.execute_operation('first', 'UPDATE', 'financial', 'users', user_id, {'username': "first"})
+    
+    second_done = threading.Event()
+    def second():
+        transaction_manager.begin_transaction('second')
+        transaction_manager.execute_operation('second', 'UPDATE', 'financial', 'users', user_id, {'username': "second"})
+        transaction_manager.commit_transaction('second')
+        second_done.set()
+    
+    worker = threading.Thread(target=second, daemon=True)
+    worker.start()
+    assert not second_done.wait(0.2)
+    transaction_manager.commit_transaction('first')
+    assert second_done.wait(2)
+    worker.join()
+    
+    assert transaction_manager.database_manager.get_database('financial').get_table('users').select(user_id)['username'] == "second"
+
+def test_deadlock_restarts_the_youngest_transaction(transaction_manager):
+    first_id = insert_user(transaction_manager, "ann")
+    second_id = insert_user(transaction_manager, "bob")
+    transaction_manager.lock_wait_timeout = 5.0
+    both_hold_one = threading.Barrier(2)
+    outcomes = {}
+    
+    def worker(name, held, wanted):
+        transaction_manager.begin_transaction(name)
+        try:
+            transaction_manager.execute_operation(name, 'UPDATE', 'financial', 'users', held, {'username': name})
+            both_hold_one.wait()
+            time.sleep(0.05)
+            transaction_manager.execute_operation(name, 'UPDATE', 'financial', 'users', wanted, {'username': name})
+            transaction_manager.commit_transaction(name)
+            outcomes[name] = "committed"
+        except TransactionException as e:
+            outcomes[name] = e
+            transaction_manager.rollback_transaction(name)
+    
+    # 'old' begins first, so 'young' is the younger transaction in the cycle
+    threads = [threading.Thread(target=worker, args=("old", first_id, second_id), daemon=True)]
+    threads[0].start()
+    time.sleep(0.05)
+    threads.append(threading.Thread(target=worker, args=("young", second_id, first_id), daemon=True))
+    threads[1].start()
+    started = time.monotonic()
+    for thread in threads:
+        thread.join(10)
+    
+    assert outcomes["old"] == "committed"
+    assert isinstance(outcomes["young"], DeadlockException)
+    assert time.monotonic() - started < transaction_manager.lock_wait_timeout
+
+def test_finished_transactions_are_pruned(transaction_manager):
+    controller = transaction_manager.concurrency_controller
+    user_id = insert_user(transaction_manager, "ann")
+    transaction_manager.begin_transaction('old')
+    transaction_manager.begin_transaction('young')
+    transaction_manager.execute_operation('young', 'UPDATE', 'financial', 'users', user_id, {'username': "young"})
+    transaction_manager.commit_transaction('young')
+    
+    # Kept while an older transaction could still conflict with it
+    assert controller.writers_by_resource
+    
+    transaction_manager.rollback_transaction('old')
+    assert controller.transactions == {}
+    assert controller.writers_by_resource == {}
+    assert controller.readers_by_resource == {}
+    assert transaction_manager.get_transaction_statistics()['total_transactions'] == 3
+
+def test_sharded_access_maps_under_concurrent_writers():
+    controller = ConcurrencyController()
+    resources = [('financial', 'accounts', record_id) for record_id in range(500)]
+    transaction_ids = [controller.begin_transaction() for _ in range(8)]
+    
+    def record_all(transaction_id):
+        transaction = controller.transactions[transaction_id]
+        for resource_id in resources:
+            controller.record_write(transaction, resource_id)
+    
+    threads = [threading.Thread(target=record_all, args=(transaction_id,)) for transaction_id in transaction_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert all(set(controller.writers_by_resource[resource_id]) == set(transaction_ids)
+               for resource_id in resources)
+    assert not controller.validate_write(transaction_ids[0], resources[0])
+    assert controller.validate_write(transaction_ids[-1], resources[0])
@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+import pytest
+
+from database.inmemory_db import DatabaseException, Table
+
+def test_insert_assigns_sequential_int_keys():
+    table = Table("users")
+    
+    assert [table.insert({'name': name}) for name in ("a", "b", "c")] == [1, 2, 3]
+    assert table.select(2)['name'] == "b"
+
+@pytest.mark.parametrize("primary_key", ["1", 1.0, True, (1,)])
+def test_insert_rejects_non_int_keys(primary_key):
+    table = Table("users")
+    
+    with pytest.raises(DatabaseException, match="must be an int"):
+        table.insert({'id': primary_key, 'name': "a"})
+    assert table.data == {}
+
+def test_insert_rejects_duplicate_keys():
+    table = Table("users")
+    table.insert({'id': 7, 'name': "a"})
+    
+    with pytest.raises(DatabaseException, match="already exists"):
+        table.insert({'id': 7, 'name': "b"})
+    assert table.select(7)['name'] == "a"
+
+def test_index_follows_updates_and_restores():
+    table = Table("users")
+    table.create_index('name')
+    pk = table.insert({'name': "a"})
+    pre_image = table.current_version(pk)
+    
+    table.update(pk, {'name': "b"})
+    assert table.select_where({'name': "a"}) == []
+    assert [row['id'] for row in table.select_where({'name': "b"})] == [pk]
+    
+    table.restore_version(pk, pre_image)
+    assert [row['id'] for row in table.select_where({'name': "a"})] == [pk]
+    assert table.select_where({'name': "b"}) == []
+
+def test_scans_see_writes_after_the_snapshot_is_cached():
+    table = Table("accounts")
+    first = table.insert({'balance': Decimal("10"), 'type': "checking"})
+    table.insert({'balance': Decimal("5"), 'type': "savings"})
+    assert table.scan_sum('balance') == Decimal("15")
+    assert len(table.select_all()) == 2
+    
+    table.update(first, {'balance': Decimal("20")})
+    assert table.scan_sum('balance') == Decimal("25")
+    assert table.scan_sum('balance', ('type', '==', "savings")) == Decimal("5")
+    
+    table.delete(first)
+    assert table.scan_sum('balance') == Decimal("5")
+    assert [row['type'] for row in table.select_all()] == ["savings"]
+
+def test_sum_column_reads_the_named_table(db_manager):
+    accounts = db_manager.get_database('financial').get_table('accounts')
+    accounts.insert({'balance': Decimal("1.50")})
+    accounts.insert({'balance': Decimal("2.25")})
+    
+    assert db_manager.sum_column('financial', 'accounts', 'balance') == Decimal("3.75")
+    assert db_manager.sum_column('financial', 'accounts', 'balance', ('balance', '>', Decimal("2"))) == Decimal("2.25")
@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+import pytest
+
+from business.services import BusinessException
+from transaction.concurrency import TransactionException
+from conftest import balance_of, insert_user
+
+def users_table(transaction_manager):
+    """The financial users table behind a transaction manager"""
+    return transaction_manager.database_manager.get_database('financial').get_table('users')
+
+def test_rollback_undoes_insert(transaction_manager):
+    transaction_manager.begin_transaction('t')
+    user_id = transaction_manager.execute_operation('t', 'INSERT', 'financial', 'users', data={'username': "ann"})
+    
+    assert transaction_manager.rollback_transaction('t')
+    assert users_table(transaction_manager).select(user_id) is None
+    assert users_table(transaction_manager).select_where({'username': "ann"}) == []
+
+def test_rollback_restores_updated_row_and_index(transaction_manager):
+    user_id = insert_user(transaction_manager, "ann")
+    transaction_manager.begin_transaction('t')
+    transaction_manager.execute_operation('t', 'UPDATE', 'financial', 'users', user_id, {'username': "bob"})
+    
+    transaction_manager.rollback_transaction('t')
+    table = users_table(transaction_manager)
+    assert table.select(user_id)['username'] == "ann"
+    assert [row['id'] for row in table.select_where({'username': "ann"})] == [user_id]
+    assert table.select_where({'username': "bob"}) == []
+
+def test_rollback_restores_deleted_row(transaction_manager):
+    user_id = insert_user(transaction_manager, "ann")
+    transaction_manager.begin_transaction('t')
+    transaction_manager.execute_operation('t', 'DELETE', 'financial', 'users', user_id)
+    assert users_table(transaction_manager).select(user_id) is None
+    
+    transaction_manager.rollback_transaction('t')
+    assert users_table(transaction_manager).select(user_id)['username'] == "ann"
+
+def test_rollback_applies_in_reverse_order(transaction_manager):
+    user_id = insert_user(transaction_manager, "ann")
+    transaction_manager.begin_transaction('t')
+    for name in ("bob", "cid", "dan"):
+        transaction_manager.execute_operation('t', 'UPDATE', 'financial', 'users', user_id, {'username': name})
+    
+    transaction_manager.rollback_transaction('t')
+    assert users_table(transaction_manager).select(user_id)['username'] == "ann"
+
+def test_rollback_undoes_batch_writes(transaction_manager):
+    user_id = insert_user(transaction_manager, "ann")
+    transaction_manager.begin_transaction('t')
+    new_id, _ = transaction_manager.execute_batch('t', [
+        ('INSERT', 'financial', 'users', None, {'username': "bob"}),
+        ('UPDATE', 'financial', 'users', user_id, {'username': "cid"}),
+    ])
+    
+    transaction_manager.rollback_transaction('t')
+    assert users_table(transaction_manager).select(new_id) is None
+    assert users_table(transaction_manager).select(user_id)['username'] == "ann"
+
+def test_restart_rolls_back_earlier_writes(transaction_manager):
+    first_id = insert_user(transaction_manager, "ann")
+    second_id = insert_user(transaction_manager, "bob")
+    transaction_manager.begin_transaction('old')
+    transaction_manager.begin_transaction('young')
+    transaction_manager.execute_operation('old', 'UPDATE', 'financial', 'users', first_id, {'username': "old"})
+    transaction_manager.execute_operation('young', 'SELECT', 'financial', 'users', record_id=second_id)
+    
+    with pytest.raises(TransactionException, match="restarted"):
+        transaction_manager.execute_operation('old', 'UPDATE', 'financial', 'users', second_id, {'username': "old"})
+    assert users_table(transaction_manager).select(first_id)['username'] == "ann"
+
+def test_failed_transfer_leaves_both_balances(facade, account):
+    def create_target(thread_id):
+        user_id = facade.user_service.create_user("bob", "bob@example.com", "hashed", thread_id)
+        return facade.account_service.create_account(user_id, "savings", Decimal("0.00"), thread_id)
+    
+    target = facade.execute_with_transaction(create_target)
+    
+    with pytest.raises(BusinessException, match="Insufficient funds"):
+        facade.execute_with_transaction(
+            lambda thread_id: facade.transaction_service.transfer_money(account, target, Decimal("500.00"), "x", thread_id)
+        )
+    
+    assert balance_of(facade, account) == Decimal("100.00")
+    assert balance_of(facade, target) == Decimal("0.00")
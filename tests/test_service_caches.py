@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+import pytest
+
+from transaction.concurrency import TransactionException
+
+@pytest.fixture
+def product(facade):
+    """Id of a product with 10 in stock, in a fresh category"""
+    def create(thread_id):
+        category_id = facade.category_service.create_category("Books", "Paper", None, thread_id)
+        return facade.product_service.create_product("Novel", "A story", Decimal("9.99"), 10, category_id, thread_id)
+    
+    return facade.execute_with_transaction(create)
+
+def get_product(facade, product_id):
+    """Product row as served by ProductService.get_products in its own transaction"""
+    return facade.execute_with_transaction(
+        lambda thread_id: facade.product_service.get_products([product_id], thread_id)
+    )[0]
+
+def test_product_cache_is_invalidated_by_writes(facade, product):
+    assert get_product(facade, product)['stock_quantity'] == 10
+    
+    facade.execute_with_transaction(lambda thread_id: facade.product_service.update_stock(product, -3, thread_id))
+    
+    assert get_product(facade, product)['stock_quantity'] == 7
+
+def test_category_cache_is_invalidated_by_inserts(facade):
+    list_names = lambda: sorted(category['name'] for category in facade.execute_with_transaction(
+        facade.category_service.get_all_categories
+    ))
+    facade.execute_with_transaction(
+        lambda thread_id: facade.category_service.create_category("Books", "Paper", None, thread_id)
+    )
+    assert list_names() == ["Books"]
+    
+    facade.execute_with_transaction(
+        lambda thread_id: facade.category_service.create_category("Games", "Fun", None, thread_id)
+    )
+    
+    assert list_names() == ["Books", "Games"]
+
+def test_cached_product_read_is_validated_at_commit(facade, product):
+    transaction_manager = facade.transaction_manager
+    get_product(facade, product)  # warm the cache
+    
+    transaction_manager.begin_transaction('old')
+    facade.product_service.get_products([product], 'old')  # served from the cache
+    transaction_manager.begin_transaction('young')
+    transaction_manager.execute_operation('young', 'UPDATE', 'inventory', 'products', product, {'price': Decimal("1.00")})
+    transaction_manager.commit_transaction('young')
+    
+    # The younger write invalidates the old transaction's cached read once it writes
+    transaction_manager.execute_operation('old', 'INSERT', 'inventory', 'orders', data={'user_id': 1})
+    with pytest.raises(TransactionException, match="Read validation failed"):
+        transaction_manager.commit_transaction('old')
+
+def test_transaction_read_cache_sees_own_writes(transaction_manager):
+    transaction_manager.begin_transaction('t')
+    category_id = transaction_manager.execute_operation(
+        't', 'INSERT', 'inventory', 'categories', data={'name': "Books"}
+    )
+    assert transaction_manager.execute_operation('t', 'SELECT', 'inventory', 'categories', category_id)['name'] == "Books"
+    
+    transaction_manager.execute_operation('t', 'UPDATE', 'inventory', 'categories', category_id, {'name': "Games"})
+    
+    assert transaction_manager.execute_operation('t', 'SELECT', 'inventory', 'categories', category_id)['name'] == "Games"
+    transaction_manager.commit_transaction('t')